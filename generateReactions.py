@@ -77,6 +77,10 @@ def parseCommandLineArguments():
         metavar='DIR', help='use DIR as scratch directory')
     parser.add_argument('-l', '--library-directory', type=str, nargs=1, default='',
         metavar='DIR', help='use DIR as library directory')
+
+    # Add option for parallel execution
+    parser.add_argument('-n', '--processes', type=int, default=1,
+        metavar='N', help='use up to N processes for parallel tasks')
     
     args = parser.parse_args()
     args.walltime = '0'
@@ -74,6 +74,10 @@ def parseCommandLineArguments():
     parser.add_argument('-l', '--library-directory', type=str, nargs=1, default='',
         metavar='DIR', help='use DIR as library directory')
 
+    # Add option for parallel execution
+    parser.add_argument('-n', '--processes', type=int, default=1,
+        metavar='N', help='use up to N processes for parallel tasks')
+
     # Add restart option
     parser.add_argument('-r', '--restart', action='store_true', help='restart an incomplete job')
 
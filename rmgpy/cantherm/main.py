@@ -46,6 +46,7 @@ except ImportError:
     pass
 
 from rmgpy.cantherm.input import loadInputFile
+from rmgpy.cantherm.pdep import PressureDependenceJob
 
 ################################################################################
 
@@ -61,6 +62,7 @@ class CanTherm:
     `inputFile`         The path of the input file defining the jobs to execute
     `outputDirectory`   The directory in which to write the output files
     `verbose`           The level of detail in the generated logging messages
+    `processes`         The number of processes to use for parallel tasks
     =================== ========================================================
     
     The output directory defaults to the same directory as the input file if
@@ -73,11 +75,12 @@ class CanTherm:
     :meth:`parseCommandLineArguments()` method before running :meth:`execute()`.
     """
     
-    def __init__(self, inputFile=None, outputDirectory=None, verbose=logging.INFO):
+    def __init__(self, inputFile=None, outputDirectory=None, verbose=logging.INFO, processes=1):
         self.jobList = []
         self.inputFile = inputFile
         self.outputDirectory = outputDirectory
         self.verbose = verbose
+        self.processes = processes
     
     def parseCommandLineArguments(self):
         """
@@ -110,6 +113,10 @@ class CanTherm:
         # Add options for controlling generation of plots
         parser.add_argument('-p', '--plot', action='store_true', default=False, help='generate plots of results')
 
+        # Add option for parallel execution
+        parser.add_argument('-n', '--processes', type=int, default=1,
+            metavar='N', help='use up to N processes for parallel tasks')
+
         args = parser.parse_args()
         
         # Extract the input file
@@ -121,6 +128,9 @@ class CanTherm:
         # Extract the plot settings
         self.plot = args.plot
         
+        # Extract the number of processes to use
+        self.processes = args.processes
+        
         # Determine the output directory
         # By default the directory containing the input file is used, unless an
         # alternate directory is specified using the -o flag
@@ -232,6 +242,8 @@ class CanTherm:
         
         # Run the jobs
         for job in self.jobList:
+            if isinstance(job, PressureDependenceJob):
+                job.processes = self.processes
             job.execute(outputFile=outputFile, plot=self.plot)
         
         # Print some information to the end of the log
@@ -72,6 +72,7 @@ class PressureDependenceJob(object):
     `activeKRotor`          A flag indicating whether to treat the K-rotor as active or adiabatic
     `activeJRotor`          A flag indicating whether to treat the J-rotor as active or adiabatic
     `rmgmode`               A flag that toggles "RMG mode", described below
+    `processes`             The number of processes to use to compute :math:`k(T,P)` values in parallel
     ----------------------- ----------------------------------------------------
     `network`               The unimolecular reaction network
     `Tlist`                 An array of temperatures at which to compute :math:`k(T,P)` values
@@ -140,6 +141,7 @@ class PressureDependenceJob(object):
         self.activeKRotor = activeKRotor
         self.activeJRotor = activeJRotor
         self.rmgmode = rmgmode
+        self.processes = 1
         
     @property
     def Tmin(self):
@@ -228,7 +230,7 @@ class PressureDependenceJob(object):
         
         self.initialize()
         
-        self.K = self.network.calculateRateCoefficients(self.Tlist.value_si, self.Plist.value_si, self.method)
+        self.K = self.network.calculateRateCoefficients(self.Tlist.value_si, self.Plist.value_si, self.method, processes=self.processes)
 
         self.fitInterpolationModels()
 
@@ -1303,6 +1303,22 @@ def writeKineticsEntry(reaction, speciesList, verbose = True, javaLibrary = Fals
 
 ################################################################################
 
+def getDuplicateReactionKey(reaction):
+    """
+    Return a key that is the same for any two reactions that are duplicates
+    as understood by Chemkin: reactions of the same class and pressure
+    dependence with the same reactant and product species in any order, or,
+    if both are reversible, with the reactants and products exchanged.
+    """
+    # TemplateReaction, LibraryReaction, and PDepReaction cannot be
+    # duplicates of one another, and neither can a pressure-dependent
+    # and a pressure-independent reaction
+    reactants = tuple(sorted([id(spec) for spec in reaction.reactants]))
+    products = tuple(sorted([id(spec) for spec in reaction.products]))
+    if reaction.reversible and products < reactants:
+        reactants, products = products, reactants
+    return (reaction.__class__, reaction.reversible, reactants, products, reaction.kinetics.isPressureDependent())
+
 def markDuplicateReaction(test_reaction, reaction_list):
     """
     If the test_reaction is a duplicate (in Chemkin terms) of one in reaction_list, then set `duplicate=True` on both instances.
@@ -1310,36 +1326,37 @@ def markDuplicateReaction(test_reaction, reaction_list):
     It does not add the testReaction to the reactionList - you probably want to do this yourself afterwards.
     """
     reaction1 = test_reaction
+    key = getDuplicateReactionKey(reaction1)
     for reaction2 in reaction_list:
         if reaction1.__class__ != reaction2.__class__:
-            # TemplateReaction, LibraryReaction, and PDepReaction cannot be
-            # duplicates of one another.
             # RHW question: why can't TemplateReaction be duplicate of LibraryReaction, in Chemkin terms? I guess it shouldn't happen in RMG.
             continue
-        if reaction1.reactants == reaction2.reactants and reaction1.products == reaction2.products:
-            if reaction1.duplicate and reaction2.duplicate:
-                continue
-            else:
-                if reaction1.kinetics.isPressureDependent() == reaction2.kinetics.isPressureDependent():
-                    # Only mark as duplicate if both reactions are pressure dependent or both are
-                    # not pressure dependent.  Do not mark as duplicates otherwise.
-                    logging.warning('Marked reaction {0} as duplicate for saving to Chemkin file.'.format(reaction1))
-                    reaction1.duplicate = True
-                    reaction2.duplicate = True
+        if reaction1.duplicate and reaction2.duplicate:
+            continue
+        if getDuplicateReactionKey(reaction2) == key:
+            logging.warning('Marked reaction {0} as duplicate for saving to Chemkin file.'.format(reaction1))
+            reaction1.duplicate = True
+            reaction2.duplicate = True
 
 def markDuplicateReactions(reactions):
     """
     For a given list of `reactions`, mark all of the duplicate reactions as
     understood by Chemkin.
     
-    This is pretty slow (quadratic in size of reactions list) so only call it if you're really worried
-    you may have undetected duplicate reactions.
+    The reactions are grouped by :func:`getDuplicateReactionKey()`, so this
+    scales linearly with the size of the reactions list; every reaction in a
+    group of two or more is a duplicate.
     """
-    for index1 in range(len(reactions)):
-        reaction1 = reactions[index1]
-        remainingList = reactions[index1+1:]
-        markDuplicateReaction(reaction1, remainingList)
- 
+    reactionGroups = {}
+    for reaction in reactions:
+        reactionGroups.setdefault(getDuplicateReactionKey(reaction), []).append(reaction)
+    
+    for reactionList in reactionGroups.itervalues():
+        if len(reactionList) < 2: continue
+        for reaction in reactionList:
+            if not reaction.duplicate:
+                logging.warning('Marked reaction {0} as duplicate for saving to Chemkin file.'.format(reaction))
+                reaction.duplicate = True
 
 def saveSpeciesDictionary(path, species):
     """
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+"""
+This script contains unit tests of the :mod:`rmgpy.chemkin` module.
+"""
+
+import unittest
+
+from rmgpy.species import Species
+from rmgpy.reaction import Reaction
+from rmgpy.kinetics import Arrhenius, ThirdBody
+from rmgpy.data.kinetics import KineticsLibrary, LibraryReaction
+from rmgpy.chemkin import markDuplicateReaction, markDuplicateReactions
+
+################################################################################
+
+class TestMarkDuplicateReactions(unittest.TestCase):
+    """
+    Contains unit tests of the marking of Chemkin duplicate reactions.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.A = Species(label='A')
+        self.B = Species(label='B')
+        self.C = Species(label='C')
+        self.D = Species(label='D')
+
+    def makeReaction(self, reactants, products, pdep=False, reversible=True):
+        """
+        Return a new reaction between the given `reactants` and `products`,
+        with pressure-dependent kinetics if `pdep` is ``True``.
+        """
+        kinetics = Arrhenius(A=(1e6,"cm^3/(mol*s)"), n=0.0, Ea=(10.0,"kJ/mol"), T0=(1,"K"))
+        if pdep:
+            kinetics = ThirdBody(arrheniusLow=kinetics)
+        return Reaction(reactants=reactants, products=products, kinetics=kinetics, reversible=reversible)
+
+    def markDuplicates(self, reactions):
+        """
+        Mark the duplicates among the given `reactions` and return the list of
+        their `duplicate` flags. The result is also checked against marking
+        each reaction in turn against those before it.
+        """
+        markDuplicateReactions(reactions)
+        duplicates = [rxn.duplicate for rxn in reactions]
+        for rxn in reactions:
+            rxn.duplicate = False
+        for index, rxn in enumerate(reactions):
+            markDuplicateReaction(rxn, reactions[:index])
+        self.assertEqual([rxn.duplicate for rxn in reactions], duplicates)
+        return duplicates
+
+    def test_forward(self):
+        """
+        Test that reactions with the same reactants and products are marked.
+        """
+        reactions = [
+            self.makeReaction([self.A, self.B], [self.C, self.D]),
+            self.makeReaction([self.A, self.B], [self.C]),
+            self.makeReaction([self.A, self.B], [self.C, self.D]),
+        ]
+        self.assertEqual(self.markDuplicates(reactions), [True, False, True])
+
+    def test_reverse(self):
+        """
+        Test that reversible reactions with the reactants and products
+        exchanged are marked, but irreversible ones are not.
+        """
+        reactions = [
+            self.makeReaction([self.A, self.B], [self.C, self.D]),
+            self.makeReaction([self.C, self.D], [self.A, self.B]),
+        ]
+        self.assertEqual(self.markDuplicates(reactions), [True, True])
+        reactions = [
+            self.makeReaction([self.A, self.B], [self.C, self.D], reversible=False),
+            self.makeReaction([self.C, self.D], [self.A, self.B], reversible=False),
+        ]
+        self.assertEqual(self.markDuplicates(reactions), [False, False])
+
+    def test_reordered(self):
+        """
+        Test that reactions listing the same species in a different order are
+        marked.
+        """
+        reactions = [
+            self.makeReaction([self.A, self.B], [self.C, self.D]),
+            self.makeReaction([self.B, self.A], [self.D, self.C]),
+            self.makeReaction([self.A, self.A], [self.C]),
+            self.makeReaction([self.A], [self.C]),
+        ]
+        self.assertEqual(self.markDuplicates(reactions), [True, True, False, False])
+
+    def test_pressureDependence(self):
+        """
+        Test that a pressure-dependent and a pressure-independent reaction
+        are not marked, but two pressure-dependent reactions are.
+        """
+        reactions = [
+            self.makeReaction([self.A, self.B], [self.C]),
+            self.makeReaction([self.A, self.B], [self.C], pdep=True),
+        ]
+        self.assertEqual(self.markDuplicates(reactions), [False, False])
+        reactions.append(self.makeReaction([self.B, self.A], [self.C], pdep=True))
+        self.assertEqual(self.markDuplicates(reactions), [False, True, True])
+
+    def test_reactionClass(self):
+        """
+        Test that reactions of different classes are not marked.
+        """
+        library = KineticsLibrary(label='library')
+        reaction = self.makeReaction([self.A, self.B], [self.C])
+        reactions = [
+            reaction,
+            LibraryReaction(reactants=[self.A, self.B], products=[self.C], kinetics=reaction.kinetics, library=library),
+        ]
+        self.assertEqual(self.markDuplicates(reactions), [False, False])
+
+    def test_alreadyMarked(self):
+        """
+        Test that reactions already marked as duplicates remain marked.
+        """
+        reactions = [
+            self.makeReaction([self.A, self.B], [self.C]),
+            self.makeReaction([self.A, self.B], [self.C]),
+        ]
+        for rxn in reactions:
+            rxn.duplicate = True
+        markDuplicateReactions(reactions)
+        self.assertEqual([rxn.duplicate for rxn in reactions], [True, True])
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
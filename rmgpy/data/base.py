@@ -38,8 +38,9 @@ import os
 import logging
 import re
 import codecs
+import collections
 
-from rmgpy.molecule import Molecule, Group, InvalidAdjacencyListError
+from rmgpy.molecule import Molecule, Atom, Bond, Group, InvalidAdjacencyListError
 
 from reference import Reference, Article, Book, Thesis
 
@@ -164,6 +165,10 @@ class Database:
         self.shortDesc = shortDesc
         self.longDesc = longDesc
         self.recommended = recommended
+        self.moleculeIndex = None
+        self.moleculeIndexSize = 0
+        self.descendTreeCache = None
+        self.descendTreeCacheSize = 10000
 
     def load(self, path, local_context=None, global_context=None):
         """
@@ -186,6 +191,8 @@ class Database:
         # Clear any previously-loaded data
         self.entries = {}
         self.top = []
+        self.moleculeIndex = None
+        self.clearDescendTreeCache()
 
         # Set up global and local context
         if global_context is None: global_context = {}
@@ -289,6 +296,8 @@ class Database:
         be set to '' if not desired.
         """
 
+        self.clearDescendTreeCache()
+
         # Load dictionary, library, and (optionally) tree
         try:
             self.loadOldDictionary(dictstr, pattern)
@@ -462,6 +471,7 @@ class Database:
             ftree.close()
 
         self.__loadTree(tree)
+        self.clearDescendTreeCache()
 
     def loadOldLibrary(self, path, numParameters, numLabels=1):
         """
@@ -710,6 +720,37 @@ class Database:
         """
         return ';'.join(labels)
 
+    def generateMoleculeIndex(self):
+        """
+        Generate an index of the entries whose items are :class:`Molecule`
+        objects, keyed by the fingerprint of the molecule (which includes its
+        formula). Each list of entries is in the order of iteration over the
+        entries dictionary, together with their position in that order.
+        """
+        self.moleculeIndex = {}
+        for position, entry in enumerate(self.entries.itervalues()):
+            if isinstance(entry.item, Molecule):
+                self.moleculeIndex.setdefault(entry.item.getFingerprint(), []).append((position, entry))
+        self.moleculeIndexSize = len(self.entries)
+
+    def getEntriesMatchingMolecules(self, molecules):
+        """
+        Return a list of the entries whose items are isomorphic to any of the
+        :class:`Molecule` objects in `molecules` (e.g. the resonance isomers of
+        a species), in the order of iteration over the entries dictionary.
+        Only the entries with a matching fingerprint are checked for
+        isomorphism. The index is generated when first needed, and again if
+        entries have been added or removed since.
+        """
+        if getattr(self, 'moleculeIndex', None) is None or self.moleculeIndexSize != len(self.entries):
+            self.generateMoleculeIndex()
+        matches = {}
+        for molecule in molecules:
+            for position, entry in self.moleculeIndex.get(molecule.getFingerprint(), []):
+                if position not in matches and molecule.isIsomorphic(entry.item):
+                    matches[position] = entry
+        return [matches[position] for position in sorted(matches)]
+
     def ancestors(self, node):
         """
         Returns all the ancestors of a node, climbing up the tree to the top.
@@ -837,19 +878,32 @@ class Database:
                 # Passed semantic checks, so add to maps of already-matched atoms
                 initialMap[atom] = center
             # Labeled atoms in the structure that are not in the group should
-            # not be considered in the isomorphism check, so remove them temporarily
+            # not be considered in the isomorphism check, so leave them out
             # Without this we would hit a lot of nodes that are ambiguous
             removedAtoms = []
             for label, atom in structure.getLabeledAtoms().iteritems():
                 if label not in centers:
-                    removedAtoms.append(atom)
+                    if isinstance(atom, list):
+                        removedAtoms.extend(atom)
+                    else:
+                        removedAtoms.append(atom)
+            if not removedAtoms:
+                return structure.isSubgraphIsomorphic(group, initialMap)
+            elif isinstance(structure, Molecule):
+                # Match against a molecule sharing the remaining atoms, so
+                # that the structure itself is not modified
+                structure = Molecule(atoms=[atom for atom in structure.atoms if atom not in removedAtoms])
+                return structure.isSubgraphIsomorphic(group, initialMap)
+            else:
+                # Remove the atoms temporarily
+                for atom in removedAtoms:
                     structure.atoms.remove(atom)
-            # use mapped (labeled) atoms to try to match subgraph
-            result = structure.isSubgraphIsomorphic(group, initialMap)
-            # Restore atoms removed in previous step
-            for atom in removedAtoms:
-                structure.atoms.append(atom)
-            return result
+                # use mapped (labeled) atoms to try to match subgraph
+                result = structure.isSubgraphIsomorphic(group, initialMap)
+                # Restore atoms removed in previous step
+                for atom in removedAtoms:
+                    structure.atoms.append(atom)
+                return result
 
     def descendTree(self, structure, atoms, root=None):
         """
@@ -859,6 +913,49 @@ class Database:
         If root=None then uses the first matching top node.
 
         Returns None if there is no matching root.
+
+        The result is memoized using the local environment of `atoms`: the
+        atoms of `structure` close enough to the labeled atoms to be reached by
+        any functional group in the tree. A later descent from the same `root`
+        for a structure with an identical local environment reuses the result
+        without matching any nodes. Only the `descendTreeCacheSize` most
+        recently used environment keys are kept.
+        """
+        if self.descendTreeCache is None:
+            self.descendTreeCache = collections.OrderedDict()
+            self.descendTreeRadius = self.__getTreeRadius()
+            self.descendTreeLabels = {}
+
+        environment = self.__getLocalEnvironment(structure, atoms, root)
+        if environment is None:
+            return self.__descendTree(structure, atoms, root)
+
+        key, molecule, centers = environment
+        # Move the key to the end to mark it as the most recently used
+        results = self.descendTreeCache.pop(key, [])
+        self.descendTreeCache[key] = results
+        for molecule0, centers0, node in results:
+            if self.__isSameLocalEnvironment(molecule, centers, molecule0, centers0):
+                return node
+        node = self.__descendTree(structure, atoms, root)
+        results.append((molecule, centers, node))
+        if len(self.descendTreeCache) > self.descendTreeCacheSize:
+            self.descendTreeCache.popitem(last=False)
+        return node
+
+    def clearDescendTreeCache(self):
+        """
+        Discard the memoized results of :meth:`descendTree()`. This must be
+        called whenever the tree or its groups are modified; loading the
+        database does so automatically.
+        """
+        self.descendTreeCache = None
+
+    def __descendTree(self, structure, atoms, root=None):
+        """
+        Descend the tree in search of the functional group node that best
+        matches the local structure around `atoms` in `structure`, without
+        using the memoized results.
         """
 
         if root is None:
@@ -876,7 +973,7 @@ class Database:
                 next.append(child)
 
         if len(next) == 1:
-            return self.descendTree(structure, atoms, next[0])
+            return self.__descendTree(structure, atoms, next[0])
         elif len(next) == 0:
             if len(root.children) > 0 and root.children[-1].label.startswith('Others-'):
                 return root.children[-1]
@@ -884,7 +981,151 @@ class Database:
                 return root
         else:
             logging.warning('For {0}, a node {1} with overlapping children {2} was encountered in tree with top level nodes {3}. Assuming the first match is the better one.'.format(structure, root, next, self.top))
-            return self.descendTree(structure, atoms, next[0])
+            return self.__descendTree(structure, atoms, next[0])
+
+    def __getTreeRadius(self):
+        """
+        Return the largest distance between a labeled atom and any other atom
+        in the functional groups in this database, or ``None`` if a group has
+        no labeled atoms or has atoms that cannot be reached from one of them.
+        """
+        radius = 0
+        for entry in self.entries.itervalues():
+            if not isinstance(entry.item, Group):
+                continue
+            centers = entry.item.getLabeledAtoms().values()
+            if len(centers) == 0:
+                return None
+            for center in centers:
+                if isinstance(center, list):
+                    return None
+                distances = {center: 0}
+                queue = [center]
+                for atom1 in queue:
+                    for atom2 in atom1.edges:
+                        if atom2 not in distances:
+                            distances[atom2] = distances[atom1] + 1
+                            queue.append(atom2)
+                if len(distances) < len(entry.item.vertices):
+                    return None
+                radius = max(radius, max(distances.values()))
+        return radius
+
+    def __getItemLabels(self, item, labels):
+        """
+        Add the sets of atom labels of the functional groups that could be
+        matched when matching the node `item` (including the components of a
+        logic node) to the set `labels`.
+        """
+        if isinstance(item, LogicNode):
+            for component in item.components:
+                if isinstance(component, LogicNode):
+                    self.__getItemLabels(component, labels)
+                else:
+                    self.__getItemLabels(self.entries[component].item, labels)
+        elif isinstance(item, Group):
+            labels.add(frozenset(item.getLabeledAtoms()))
+        else:
+            labels.add(frozenset())
+
+    def __getTreeLabels(self, root):
+        """
+        Return the set of the sets of atom labels of the functional groups
+        that could be matched when descending the tree from `root`, or from
+        the top nodes if `root` is ``None``.
+        """
+        label = root.label if root is not None else None
+        if label not in self.descendTreeLabels:
+            labels = set()
+            for node in ([root] if root is not None else self.top):
+                for entry in [node] + self.descendants(node):
+                    self.__getItemLabels(entry.item, labels)
+            self.descendTreeLabels[label] = labels
+        return self.descendTreeLabels[label]
+
+    def __getLocalEnvironment(self, structure, atoms, root):
+        """
+        Return the key used to memoize the descent from `root` for the local
+        environment of the labeled `atoms` in `structure`, together with a
+        copy of the local environment and a dictionary of its labeled atoms.
+        The local environment contains the atoms close enough to a labeled atom
+        to be matched by a functional group, plus their neighbors (so that
+        their atom types and bonds are included). Returns ``None`` if the
+        result of the descent may depend on atoms outside of this environment,
+        in which case the result is not memoized.
+        """
+        if self.descendTreeRadius is None or not isinstance(structure, Molecule) or len(atoms) == 0:
+            return None
+        # Every group matched must share a labeled atom with the structure, so
+        # that it cannot be matched outside of the local environment
+        for labels in self.__getTreeLabels(root):
+            if not any([label in atoms for label in labels]):
+                return None
+        # The labeled atoms of the structure determine which atoms are left
+        # out when matching each group, so they must all be given
+        for atom in atoms.itervalues():
+            if not isinstance(atom, Atom) or atom not in structure.vertices:
+                return None
+        for label, atom in structure.getLabeledAtoms().iteritems():
+            if atoms.get(label) is not atom:
+                return None
+
+        distances = {}
+        queue = []
+        for atom in atoms.itervalues():
+            distances[atom] = 0
+            queue.append(atom)
+        for atom1 in queue:
+            if distances[atom1] > self.descendTreeRadius:
+                continue
+            for atom2 in atom1.edges:
+                if atom2 not in distances:
+                    distances[atom2] = distances[atom1] + 1
+                    queue.append(atom2)
+
+        copies = {}
+        molecule = Molecule()
+        for atom1 in structure.vertices:
+            if atom1 in distances:
+                copies[atom1] = atom1.copy()
+                molecule.addAtom(copies[atom1])
+                for atom2, bond in atom1.edges.iteritems():
+                    if atom2 in copies and atom2 is not atom1:
+                        molecule.addBond(Bond(copies[atom1], copies[atom2], bond.order))
+        centers = dict([(label, copies[atom]) for label, atom in atoms.iteritems()])
+
+        key = (
+            root.label if root is not None else None,
+            molecule.getCanonicalHash(),
+            tuple(sorted([(label, atom.label) for label, atom in atoms.iteritems()])),
+        )
+        return key, molecule, centers
+
+    def __isSameLocalEnvironment(self, molecule1, centers1, molecule2, centers2):
+        """
+        Return ``True`` if the local environments `molecule1` and `molecule2`
+        are identical, including the atom types and atom labels and with the
+        labeled atoms in `centers1` and `centers2` corresponding to one
+        another, or ``False`` if not.
+        """
+        initialMap = dict([(centers1[label], centers2[label]) for label in centers1])
+        for mapping in molecule1.findIsomorphism(molecule2, initialMap):
+            # The initial mapping is not checked by the isomorphism algorithm,
+            # so check every pair of atoms and their bonds explicitly
+            for atom1, atom2 in mapping.iteritems():
+                if not (atom1.equivalent(atom2) and atom1.atomType is atom2.atomType and
+                        atom1.label == atom2.label and len(atom1.edges) == len(atom2.edges)):
+                    break
+                for atom3, bond in atom1.edges.iteritems():
+                    atom4 = mapping[atom3]
+                    if atom4 not in atom2.edges or atom2.edges[atom4].order != bond.order:
+                        break
+                else:
+                    continue
+                break
+            else:
+                return True
+        return False
 
 ################################################################################
 
@@ -0,0 +1,108 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from rmgpy.data.base import Database, Entry
+from rmgpy.molecule.molecule import Molecule
+from rmgpy.molecule.group import Group
+
+################################################################################
+
+class TestDatabase(unittest.TestCase):
+    """
+    Contains unit tests of the Database class.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.database = Database()
+        for label, parent, adjlist in [
+            ('R', None, '1 * R 0'),
+            ('C', 'R', '1 * C 0'),
+            ('C-O', 'C', '1 * C 0 {2,S}\n2 O 0 {1,S}'),
+            ('C-CC', 'C', '1 * C 0 {2,S} {3,S}\n2 C 0 {1,S}\n3 C 0 {1,S}'),
+            ('C-CCd', 'C-CC', '1 * C 0 {2,S} {3,S}\n2 C 0 {1,S}\n3 Cd 0 {1,S}'),
+            ('O', 'R', '1 * O 0'),
+            ]:
+            entry = Entry(index=len(self.database.entries), label=label, item=Group().fromAdjacencyList(adjlist))
+            entry.children = []
+            if parent is None:
+                self.database.top.append(entry)
+            else:
+                entry.parent = self.database.entries[parent]
+                entry.parent.children.append(entry)
+            self.database.entries[label] = entry
+        self.molecules = [Molecule().fromAdjacencyList(adjlist) for adjlist in [
+            '1 C 0 {2,S}\n2 C 0 {1,S} {3,S}\n3 O 0 {2,S}',
+            '1 C 0 {2,S}\n2 C 0 {1,S} {3,S}\n3 C 0 {2,S} {4,D}\n4 C 0 {3,D}',
+            '1 C 0 {2,S}\n2 C 0 {1,S} {3,S}\n3 C 0 {2,S} {4,S}\n4 C 0 {3,S}',
+            '1 C 0 {2,S} {3,S}\n2 C 0 {1,S}\n3 C 0 {1,S} {4,S}\n4 O 0 {3,S}',
+            ]]
+        self.atoms = [molecule.atoms[:] for molecule in self.molecules]
+
+    def testDescendTree(self):
+        """
+        Test that the memoized descent of the tree finds the same nodes as the
+        descent without memoization.
+        """
+        for molecule, atoms in zip(self.molecules, self.atoms):
+            expected = []
+            for atom in atoms:
+                self.database.clearDescendTreeCache()
+                expected.append(self.database.descendTree(molecule, {'*': atom}))
+            self.database.clearDescendTreeCache()
+            for i in range(2):
+                self.assertEqual([self.database.descendTree(molecule, {'*': atom}) for atom in atoms], expected)
+        self.assertEqual(self.database.descendTree(self.molecules[0], {'*': self.atoms[0][1]}).label, 'C-O')
+        self.assertEqual(self.database.descendTree(self.molecules[1], {'*': self.atoms[1][1]}).label, 'C-CCd')
+        self.assertEqual(self.database.descendTree(self.molecules[2], {'*': self.atoms[2][1]}).label, 'C-CC')
+
+    def testDescendTreeCacheSize(self):
+        """
+        Test that the memoized results of the descent of the tree are limited
+        to the most recently used local environments.
+        """
+        self.database.descendTreeCacheSize = 2
+        for molecule, atoms in zip(self.molecules, self.atoms):
+            for atom in atoms:
+                self.database.descendTree(molecule, {'*': atom})
+                self.assertTrue(len(self.database.descendTreeCache) <= 2)
+        self.assertEqual(len(self.database.descendTreeCache), 2)
+        self.assertEqual(self.database.descendTree(self.molecules[0], {'*': self.atoms[0][1]}).label, 'C-O')
+        self.assertEqual(self.database.descendTree(self.molecules[1], {'*': self.atoms[1][1]}).label, 'C-CCd')
+
+    def testClearDescendTreeCache(self):
+        """
+        Test that the memoized results of the descent of the tree are
+        discarded when the tree is changed.
+        """
+        self.assertEqual(self.database.descendTree(self.molecules[1], {'*': self.atoms[1][1]}).label, 'C-CCd')
+        # Remove the C-CCd node from the tree
+        node = self.database.entries['C-CCd']
+        node.parent.children.remove(node)
+        del self.database.entries['C-CCd']
+        self.database.clearDescendTreeCache()
+        self.assertTrue(self.database.descendTreeCache is None)
+        self.assertEqual(self.database.descendTree(self.molecules[1], {'*': self.atoms[1][1]}).label, 'C-CC')
+
+    def testMatchNodeToStructure(self):
+        """
+        Test that labeled atoms that are not in the group are left out of the
+        match without modifying the structure.
+        """
+        molecule = Molecule().fromAdjacencyList("""
+            1 * C 0 {2,S}
+            2 *2 O 0 {1,S}
+            """)
+        atoms = molecule.atoms[:]
+        self.assertFalse(self.database.matchNodeToStructure('C-O', molecule, {'*': atoms[0]}))
+        self.assertTrue(self.database.matchNodeToStructure('C', molecule, {'*': atoms[0]}))
+        self.assertEqual(molecule.atoms, atoms)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
@@ -47,7 +47,7 @@ from .common import KineticsError, saveEntry
 from .depository import DepositoryReaction, KineticsDepository
 from .family import TemplateReaction, KineticsFamily, KineticsGroups, \
     ReactionRecipe, InvalidActionError, ReactionPairsError, \
-    UndeterminableKineticsError
+    UndeterminableKineticsError, getReactantFeatures
 from .library import LibraryReaction, KineticsLibrary
 from .rules import KineticsRules
 
@@ -145,6 +145,7 @@ class KineticsDatabase(object):
         Loads them all if `libraries` list is not specified or `None`.
         The `path` points to the folder of kinetics libraries in the database,
         and the libraries should be in files like :file:`<path>/<library>.py`.
+        Each library is only read from disk when it is first used.
         """
         self.libraries = {}; self.libraryOrder = []
         
@@ -152,9 +153,8 @@ class KineticsDatabase(object):
             for library_name in libraries:
                 library_file = os.path.join(path, library_name+'.py')
                 if os.path.exists(library_file):
-                    logging.info('Loading kinetics library {0} from {1}...'.format(library_name, library_file))
                     library = KineticsLibrary(label=library_name)
-                    library.load(library_file, self.local_context, self.global_context)
+                    library.deferLoad(library_file, self.local_context, self.global_context)
                     self.libraries[library.label] = library
                     self.libraryOrder.append(library.label)
                 else:
@@ -167,9 +167,8 @@ class KineticsDatabase(object):
                     if ext.lower() == '.py':
                         library_file = os.path.join(root, f)
                         label=library_file[len(path)+1:-3]
-                        logging.info('Loading kinetics library {0} from {1}...'.format(label, library_file))
                         library = KineticsLibrary(label=label)
-                        library.load(library_file, self.local_context, self.global_context)
+                        library.deferLoad(library_file, self.local_context, self.global_context)
                         self.libraries[library.label] = library
                         self.libraryOrder.append(library.label)
 
@@ -307,9 +306,15 @@ class KineticsDatabase(object):
         if len(reactants) == 2 and reactants[0] == reactants[1]:
             reactants[1] = reactants[1].copy(deep=True)
         
+        # Skip the families whose templates cannot match the reactants
+        # before doing any subgraph isomorphism comparisons
+        features = [getReactantFeatures(reactant) for reactant in reactants]
+
         reactionList = []
         for label, family in self.families.iteritems():
             if only_families is None or label in only_families:
+                if not family.isApplicable(features):
+                    continue
                 reactionList.extend(family.generateReactions(reactants, **options))
         if products:
             reactionList = filterReactions(reactants, products, reactionList)
@@ -44,6 +44,7 @@ from rmgpy.kinetics import Arrhenius, ArrheniusEP, ThirdBody, Lindemann, Troe, \
                            PDepArrhenius, MultiArrhenius, MultiPDepArrhenius, \
                            Chebyshev, KineticsData, PDepKineticsModel
 from rmgpy.molecule import Bond, GroupBond, Group, Molecule
+from rmgpy.molecule.atomtype import atomTypes
 from rmgpy.species import Species
 
 from .common import KineticsError, UndeterminableKineticsError, saveEntry, \
@@ -297,11 +298,16 @@ class KineticsFamily(Database):
     `groups`            :class:`KineticsGroups`         The set of kinetics group additivity values
     `rules`             :class:`KineticsRules`          The set of kinetics rate rules from RMG-Java
     `depositories`      ``dict``                        A set of additional depositories used to store kinetics data from various sources
+    `requiredFeatures`  ``list``                        The features a set of reactants needs for the templates to match, or ``None`` if not yet determined
+    `deferredLoad`      ``tuple``                       The arguments for loading the rules and depositories on first use, or ``None`` if already loaded
     =================== =============================== ========================
 
     There are a few reaction families that are their own reverse (hydrogen
     abstraction and intramolecular hydrogen migration); for these
     `reverseTemplate` and `reverseRecipe` will both be ``None``.
+
+    The rules and depositories are only needed to estimate kinetics, so
+    :meth:`load()` defers loading them until either is first accessed.
     """
 
     def __init__(self,
@@ -330,10 +336,30 @@ class KineticsFamily(Database):
         self.groups = None
         self.rules = None
         self.depositories = []
+        self.requiredFeatures = None
+        self.deferredLoad = None
 
     def __repr__(self):
         return '<ReactionFamily "{0}">'.format(self.label)
 
+    def __getattr__(self, name):
+        """
+        Load the deferred parts of the family when an attribute that is not
+        yet set (i.e. `rules` or `depositories`) is first accessed.
+        """
+        if name.startswith('__') or self.__dict__.get('deferredLoad') is None:
+            raise AttributeError(name)
+        self.loadDeferred()
+        return getattr(self, name)
+
+    def __getstate__(self):
+        """
+        A helper function used when pickling a KineticsFamily object. Any
+        deferred parts of the family are loaded first.
+        """
+        self.loadDeferred()
+        return self.__dict__
+
     def loadOld(self, path):
         """
         Load an old-style RMG kinetics group additivity database from the
@@ -527,12 +553,28 @@ class KineticsFamily(Database):
             self.reverseRecipe = self.forwardRecipe.getReverse()
         
         self.groups.numReactants = len(self.forwardTemplate.reactants)
-            
-        self.rules = KineticsRules(label='{0}/rules'.format(self.label))
+        
+        # Defer loading the rules and depositories until they are first used
+        self.__dict__.pop('rules', None)
+        self.__dict__.pop('depositories', None)
+        self.deferredLoad = (path, dict(local_context), dict(global_context or {}), depositoryLabels)
+
+    def loadDeferred(self):
+        """
+        Load the rules and depositories of the family, if their loading was
+        deferred by :meth:`load()`. They are only set once all of them are
+        loaded, so that if loading fails it is attempted again (raising the
+        same error) when they are next used.
+        """
+        if self.deferredLoad is None:
+            return
+        path, local_context, global_context, depositoryLabels = self.deferredLoad
+        
+        rules = KineticsRules(label='{0}/rules'.format(self.label))
         logging.debug("Loading kinetics family rules from {0}".format(os.path.join(path, 'rules.py')))
-        self.rules.load(os.path.join(path, 'rules.py'), local_context, global_context)
+        rules.load(os.path.join(path, 'rules.py'), local_context, global_context)
         
-        self.depositories = []
+        depositories = []
         # If depositoryLabels is None then load 'training' first then everything else.
         # If depositoryLabels is not None then load in the order specified in depositoryLabels.
         for name in (['training'] if depositoryLabels is None else depositoryLabels) :
@@ -545,7 +587,7 @@ class KineticsFamily(Database):
             depository = KineticsDepository(label=label)
             logging.debug("Loading kinetics family depository from {0}".format(fpath))
             depository.load(fpath, local_context, global_context)
-            self.depositories.append(depository)
+            depositories.append(depository)
         
         if depositoryLabels is None:
             # load all the remaining depositories, in order returned by os.walk
@@ -560,7 +602,11 @@ class KineticsFamily(Database):
                         depository = KineticsDepository(label=label)
                         logging.debug("Loading kinetics family depository from {0}".format(fpath))
                         depository.load(fpath, local_context, global_context)
-                        self.depositories.append(depository)
+                        depositories.append(depository)
+        
+        self.rules = rules
+        self.depositories = depositories
+        self.deferredLoad = None
             
     def loadTemplate(self, reactants, products, ownReverse=False):
         """
@@ -1158,18 +1204,28 @@ class KineticsFamily(Database):
         Return ``True`` if the provided reactant matches the provided
         template reactant and ``False`` if not, along with a complete list of the
         mappings.
+
+        The mappings are stored in the `templateMappings` attribute of the
+        reactant, so that they are only found once for each reactant molecule
+        (e.g. each resonance isomer of a core species) and template reactant,
+        no matter how many other reactants it is paired with.
         """
 
         if isinstance(templateReactant, list): templateReactant = templateReactant[0]
+        if templateReactant in reactant.templateMappings:
+            return reactant.templateMappings[templateReactant]
         struct = templateReactant.item
         
         if isinstance(struct, LogicNode):
             mappings = []
             for child_structure in struct.getPossibleStructures(self.groups.entries):
                 mappings.extend(reactant.findSubgraphIsomorphisms(child_structure))
-            return mappings
         elif isinstance(struct, Group):
-            return reactant.findSubgraphIsomorphisms(struct)
+            mappings = reactant.findSubgraphIsomorphisms(struct)
+        else:
+            return None
+        reactant.templateMappings[templateReactant] = mappings
+        return mappings
 
     def generateReactions(self, reactants, **options):
         """
@@ -1210,6 +1266,59 @@ class KineticsFamily(Database):
 
         return reactionList
     
+    def getRequiredFeatures(self):
+        """
+        Return the features that a set of reactants must have for the
+        templates of this family to match. For each template that
+        :meth:`generateReactions()` tries (the forward template, plus the
+        reverse template if the family is not its own reverse), a list is
+        returned containing, for each template reactant, a list of the feature
+        vectors of the groups it could be (more than one for a logical OR top
+        node), or ``None`` if the requirements cannot be determined. The result
+        is computed once and stored in the `requiredFeatures` attribute.
+        """
+        if self.requiredFeatures is None:
+            templates = [self.forwardTemplate]
+            if not self.ownReverse and self.reverseTemplate is not None:
+                templates.append(self.reverseTemplate)
+            self.requiredFeatures = []
+            for template in templates:
+                requirements = []
+                for templateReactant in template.reactants:
+                    if isinstance(templateReactant, list): templateReactant = templateReactant[0]
+                    struct = templateReactant.item
+                    if isinstance(struct, Group):
+                        requirements.append([getGroupFeatures(struct)])
+                    elif isinstance(struct, LogicOr) and not struct.invert:
+                        requirements.append([getGroupFeatures(group) for group in struct.getPossibleStructures(self.groups.entries)])
+                    else:
+                        requirements.append(None)
+                self.requiredFeatures.append(requirements)
+        return self.requiredFeatures
+
+    def isApplicable(self, features):
+        """
+        Return ``False`` if this family cannot generate any reactions of the
+        reactants with the given `features`, or ``True`` if it may. The
+        `features` parameter is a list containing, for each reactant, the
+        list of the feature vectors of its resonance isomers as returned by
+        :func:`getReactantFeatures()` (or ``None`` if unknown). This is a
+        quick check that avoids the subgraph isomorphism comparisons for most
+        of the families that do not apply to a set of reactants.
+        """
+        for requirements in self.getRequiredFeatures():
+            if len(requirements) != len(features):
+                continue
+            elif len(features) == 1:
+                if hasRequiredFeatures(features[0], requirements[0]):
+                    return True
+            elif len(features) == 2:
+                if hasRequiredFeatures(features[0], requirements[0]) and hasRequiredFeatures(features[1], requirements[1]):
+                    return True
+                if hasRequiredFeatures(features[0], requirements[1]) and hasRequiredFeatures(features[1], requirements[0]):
+                    return True
+        return False
+
     def calculateDegeneracy(self, reaction):
         """
         For a `reaction` given in the direction in which the kinetics are
@@ -1697,3 +1806,74 @@ class KineticsFamily(Database):
             return 's^-1'
         else:
             raise ValueError('Unable to determine units of rate coefficient for reaction family "{0}".'.format(self.label))
+
+################################################################################
+
+# The elements and bond orders counted in the feature vectors used to check
+# quickly whether a reaction family can apply to a set of reactants
+FEATURE_ELEMENTS = ['C', 'H', 'O', 'S', 'Si']
+FEATURE_BOND_ORDERS = ['S', 'D', 'T', 'B']
+
+def getReactantFeatures(reactant):
+    """
+    Return a list of the feature vectors of the given `reactant`, which may be
+    a :class:`Molecule` object or a list of resonance isomers. Each feature
+    vector is a tuple of the number of atoms of each of `FEATURE_ELEMENTS`,
+    the total number of radical electrons, and the number of bonds of each of
+    `FEATURE_BOND_ORDERS`. Returns ``None`` if the features cannot be
+    determined, e.g. if the hydrogen atoms are implicit.
+    """
+    features = []
+    for molecule in (reactant if isinstance(reactant, list) else [reactant]):
+        if not isinstance(molecule, Molecule) or molecule.implicitHydrogens:
+            return None
+        vector = [0] * (len(FEATURE_ELEMENTS) + 1 + len(FEATURE_BOND_ORDERS))
+        bonds = set()
+        for atom in molecule.atoms:
+            if atom.element.symbol in FEATURE_ELEMENTS:
+                vector[FEATURE_ELEMENTS.index(atom.element.symbol)] += 1
+            vector[len(FEATURE_ELEMENTS)] += atom.radicalElectrons
+            bonds.update(atom.edges.values())
+        for bond in bonds:
+            if bond.order in FEATURE_BOND_ORDERS:
+                vector[len(FEATURE_ELEMENTS) + 1 + FEATURE_BOND_ORDERS.index(bond.order)] += 1
+        features.append(tuple(vector))
+    return features
+
+def getGroupFeatures(group):
+    """
+    Return the feature vector that every molecule matching the given `group`
+    must meet or exceed, in the same form as :func:`getReactantFeatures()`:
+    the atoms whose atom types all belong to one element, the smallest
+    allowed number of radical electrons on each atom, and the bonds that allow
+    only one bond order.
+    """
+    vector = [0] * (len(FEATURE_ELEMENTS) + 1 + len(FEATURE_BOND_ORDERS))
+    bonds = set()
+    for atom in group.atoms:
+        for index, element in enumerate(FEATURE_ELEMENTS):
+            if atom.atomType and all([atomType.isSpecificCaseOf(atomTypes[element]) for atomType in atom.atomType]):
+                vector[index] += 1
+                break
+        if atom.radicalElectrons:
+            vector[len(FEATURE_ELEMENTS)] += min(atom.radicalElectrons)
+        bonds.update(atom.edges.values())
+    for bond in bonds:
+        orders = set(bond.order)
+        if len(orders) == 1 and bond.order[0] in FEATURE_BOND_ORDERS:
+            vector[len(FEATURE_ELEMENTS) + 1 + FEATURE_BOND_ORDERS.index(bond.order[0])] += 1
+    return tuple(vector)
+
+def hasRequiredFeatures(features, requirement):
+    """
+    Return ``True`` if any of the feature vectors in `features` meets or
+    exceeds any of the feature vectors in `requirement`, or if either is
+    ``None`` (i.e. unknown), or ``False`` otherwise.
+    """
+    if features is None or requirement is None:
+        return True
+    for vector in features:
+        for required in requirement:
+            if all([count >= minimum for count, minimum in zip(vector, required)]):
+                return True
+    return False
@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+"""
+This script contains unit tests of the :mod:`rmgpy.data.kinetics.family`
+module.
+"""
+
+import os
+import unittest
+import cPickle
+
+from rmgpy import settings
+from rmgpy.molecule import Molecule
+from rmgpy.species import Species
+from rmgpy.data.base import LogicOr
+from rmgpy.data.kinetics import KineticsDatabase
+from rmgpy.data.kinetics.family import getReactantFeatures, hasRequiredFeatures
+
+################################################################################
+
+class TestTemplateMappings(unittest.TestCase):
+    """
+    Contains unit tests of the template mappings stored on the reactant
+    molecules by the :class:`KineticsFamily` class.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        A function run once before the unit tests in this class.
+        """
+        cls.database = KineticsDatabase()
+        cls.database.load(os.path.join(settings['database.directory'], 'kinetics'), families=['R_Recombination'], libraries=[])
+        cls.family = cls.database.families['R_Recombination']
+
+    def generateReactions(self, molecule):
+        """
+        Return the reactions of the family between two copies of `molecule`.
+        """
+        reactionList = self.family.generateReactions([molecule, molecule])
+        molecule.clearLabeledAtoms()
+        return reactionList
+
+    def test_mappingsStored(self):
+        """
+        Test that the template mappings are found once and then reused.
+        """
+        molecule = Molecule().fromSMILES('[CH3]')
+        self.assertEqual(molecule.templateMappings, {})
+        reactionList = self.generateReactions(molecule)
+        self.assertEqual(len(reactionList), 1)
+        self.assertTrue(len(molecule.templateMappings) > 0)
+        
+        mappings = dict(molecule.templateMappings)
+        self.assertEqual(len(self.generateReactions(molecule)), 1)
+        for entry, entryMappings in molecule.templateMappings.iteritems():
+            self.assertTrue(entryMappings is mappings[entry])
+
+    def test_mappingsUsed(self):
+        """
+        Test that the stored template mappings are used to generate reactions.
+        """
+        molecule = Molecule().fromSMILES('[CH3]')
+        self.generateReactions(molecule)
+        for entry in molecule.templateMappings:
+            molecule.templateMappings[entry] = []
+        self.assertEqual(self.generateReactions(molecule), [])
+
+    def test_mappingsInvalidated(self):
+        """
+        Test that the stored template mappings are found again after the
+        molecule is modified.
+        """
+        molecule = Molecule().fromSMILES('[CH3]')
+        self.generateReactions(molecule)
+        for entry in molecule.templateMappings:
+            molecule.templateMappings[entry] = []
+        molecule.updateConnectivityValues()
+        self.assertEqual(molecule.templateMappings, {})
+        self.assertEqual(len(self.generateReactions(molecule)), 1)
+
+################################################################################
+
+class TestRequiredFeatures(unittest.TestCase):
+    """
+    Contains unit tests of the check of the features of a set of reactants
+    used to skip the reaction families that cannot apply to them.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        A function run once before the unit tests in this class.
+        """
+        cls.database = KineticsDatabase()
+        cls.database.load(os.path.join(settings['database.directory'], 'kinetics'), families=['H_Abstraction', 'intra_H_migration', 'Disproportionation', 'R_Recombination'], libraries=[])
+
+    def getReactants(self, smilesList):
+        """
+        Return a list of the resonance isomers of each of the reactants
+        given as SMILES strings in `smilesList`.
+        """
+        reactants = []
+        for smiles in smilesList:
+            spec = Species(molecule=[Molecule().fromSMILES(smiles)])
+            spec.generateResonanceIsomers()
+            reactants.append(spec.molecule)
+        return reactants
+
+    def generateReactions(self, smilesList, filtered):
+        """
+        Return the reactions of all of the loaded families between the
+        reactants given as SMILES strings in `smilesList`, either using the
+        check of their features to skip families or not.
+        """
+        reactants = self.getReactants(smilesList)
+        if filtered:
+            return self.database.generateReactionsFromFamilies(reactants, None)
+        reactionList = []
+        for family in self.database.families.values():
+            reactionList.extend(family.generateReactions(reactants))
+        return reactionList
+
+    def assertSameReactions(self, smilesList):
+        """
+        Check that the same reactions are generated between the reactants
+        given as SMILES strings in `smilesList` with and without the check of
+        their features, and return the reactions.
+        """
+        reactionList1 = self.generateReactions(smilesList, filtered=True)
+        reactionList2 = self.generateReactions(smilesList, filtered=False)
+        self.assertEqual(len(reactionList1), len(reactionList2))
+        for rxn2 in reactionList2:
+            for rxn1 in reactionList1:
+                if rxn1.family is rxn2.family and rxn1.isIsomorphic(rxn2, eitherDirection=False):
+                    break
+            else:
+                self.fail('Reaction {0!s} from {1} was not generated using the check of the reactant features.'.format(rxn2, rxn2.family.label))
+        return reactionList1
+
+    def test_getReactantFeatures(self):
+        """
+        Test the getReactantFeatures() function.
+        """
+        features = getReactantFeatures(Molecule().fromSMILES('C=C[CH2]'))
+        self.assertEqual(features, [(3, 5, 0, 0, 0, 1, 6, 1, 0, 0)])
+        self.assertEqual(getReactantFeatures([Molecule().fromSMILES('C'), Molecule().fromSMILES('[O]')]), [(1, 4, 0, 0, 0, 0, 4, 0, 0, 0), (0, 0, 1, 0, 0, 2, 0, 0, 0, 0)])
+
+    def test_hasRequiredFeatures(self):
+        """
+        Test the hasRequiredFeatures() function.
+        """
+        features = [(2, 5, 0, 0, 0, 1, 6, 0, 0, 0)]
+        self.assertTrue(hasRequiredFeatures(features, [(1, 1, 0, 0, 0, 1, 1, 0, 0, 0)]))
+        self.assertFalse(hasRequiredFeatures(features, [(0, 0, 1, 0, 0, 0, 0, 0, 0, 0)]))
+        self.assertTrue(hasRequiredFeatures(features, [(0, 0, 1, 0, 0, 0, 0, 0, 0, 0), (0, 1, 0, 0, 0, 0, 0, 0, 0, 0)]))
+        self.assertTrue(hasRequiredFeatures(None, [(0, 0, 1, 0, 0, 0, 0, 0, 0, 0)]))
+        self.assertTrue(hasRequiredFeatures(features, None))
+
+    def test_logicOrTops(self):
+        """
+        Test that some of the loaded families have logical OR top nodes, so
+        that the other tests check the requirements expanded from them.
+        """
+        families = []
+        for family in self.database.families.values():
+            for templateReactant in family.forwardTemplate.reactants:
+                if isinstance(templateReactant, list): templateReactant = templateReactant[0]
+                if isinstance(templateReactant.item, LogicOr):
+                    families.append(family.label)
+                    break
+        self.assertTrue(len(families) > 0)
+
+    def test_bimolecular(self):
+        """
+        Test that the same bimolecular reactions are generated with and without
+        the check of the reactant features.
+        """
+        for smilesList in [['CC', '[OH]'], ['C=C[CH2]', '[H]'], ['C[CH2]', '[O]O'], ['C', 'CC']]:
+            self.assertSameReactions(smilesList)
+        families = set([rxn.family.label for rxn in self.assertSameReactions(['CC', '[OH]'])])
+        self.assertTrue('H_Abstraction' in families)
+
+    def test_unimolecular(self):
+        """
+        Test that the same unimolecular reactions are generated with and
+        without the check of the reactant features.
+        """
+        for smilesList in [['CCC[CH2]'], ['CCCC[CH2]'], ['C=C[CH2]'], ['CC']]:
+            self.assertSameReactions(smilesList)
+        families = set([rxn.family.label for rxn in self.assertSameReactions(['CCC[CH2]'])])
+        self.assertTrue('intra_H_migration' in families)
+
+    def test_selfReaction(self):
+        """
+        Test that the same reactions of a species with itself are generated
+        with and without the check of the reactant features.
+        """
+        families = set([rxn.family.label for rxn in self.assertSameReactions(['C[CH2]', 'C[CH2]'])])
+        self.assertTrue('R_Recombination' in families)
+        self.assertTrue('Disproportionation' in families)
+        self.assertSameReactions(['[CH3]', '[CH3]'])
+
+    def test_skipsFamilies(self):
+        """
+        Test that families that cannot apply to a set of reactants are
+        skipped.
+        """
+        features = [getReactantFeatures(reactant) for reactant in self.getReactants(['CC', 'CC'])]
+        self.assertFalse(self.database.families['R_Recombination'].isApplicable(features))
+        self.assertFalse(self.database.families['intra_H_migration'].isApplicable(features))
+        features = [getReactantFeatures(reactant) for reactant in self.getReactants(['CCC[CH2]'])]
+        self.assertTrue(self.database.families['intra_H_migration'].isApplicable(features))
+        self.assertFalse(self.database.families['Disproportionation'].isApplicable(features))
+
+class TestDeferredLoad(unittest.TestCase):
+    """
+    Contains unit tests of the deferred loading of the rules and depositories
+    of the :class:`KineticsFamily` class.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.database = KineticsDatabase()
+        self.database.load(os.path.join(settings['database.directory'], 'kinetics'), families=['R_Recombination'], libraries=[])
+        self.family = self.database.families['R_Recombination']
+
+    def test_deferred(self):
+        """
+        Test that loading the rules and depositories is deferred until they
+        are used.
+        """
+        self.assertTrue(self.family.deferredLoad is not None)
+        self.assertFalse('rules' in self.family.__dict__)
+        self.assertFalse('depositories' in self.family.__dict__)
+        self.assertTrue(self.family.groups is not None)
+
+    def test_loadOnAccess(self):
+        """
+        Test that the rules and depositories are loaded when either is first
+        accessed.
+        """
+        self.assertTrue(len(self.family.rules.entries) > 0)
+        self.assertTrue(self.family.deferredLoad is None)
+        self.assertTrue(len(self.family.depositories) > 0)
+
+    def test_pickle(self):
+        """
+        Test that pickling a family with deferred parts loads them first.
+        """
+        family = cPickle.loads(cPickle.dumps(self.family, -1))
+        self.assertTrue(family.deferredLoad is None)
+        self.assertEqual(len(family.rules.entries), len(self.family.rules.entries))
+        self.assertEqual(len(family.depositories), len(self.family.depositories))
+
+    def test_failedLoad(self):
+        """
+        Test that a family whose rules fail to load raises the same error each
+        time they are accessed, and loads them once the problem is fixed.
+        """
+        deferredLoad = self.family.deferredLoad
+        self.family.deferredLoad = (os.path.join(deferredLoad[0], 'missing'),) + deferredLoad[1:]
+        for i in range(2):
+            self.assertRaises(IOError, getattr, self.family, 'rules')
+            self.assertRaises(IOError, getattr, self.family, 'depositories')
+        self.assertFalse('rules' in self.family.__dict__)
+        self.family.deferredLoad = deferredLoad
+        self.assertTrue(len(self.family.rules.entries) > 0)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
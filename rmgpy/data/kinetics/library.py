@@ -111,15 +111,72 @@ class LibraryReaction(Reaction):
 
 class KineticsLibrary(Database):
     """
-    A class for working with an RMG kinetics library.
+    A class for working with an RMG kinetics library. A library can be set up
+    using :meth:`deferLoad()` so that it is only loaded from disk when its
+    contents are first accessed; in that case the `deferredLoad` attribute
+    stores the arguments for loading it.
     """
 
     def __init__(self, label='', name='', shortDesc='', longDesc=''):
         Database.__init__(self, label=label, name=name, shortDesc=shortDesc, longDesc=longDesc)
+        self.deferredLoad = None
 
     def __repr__(self):
         return '<KineticsLibrary "{0}">'.format(self.label)
 
+    def __getattr__(self, name):
+        """
+        Load the library if its loading was deferred when an attribute that is
+        not yet set (e.g. `entries`) is first accessed.
+        """
+        if name.startswith('__') or self.__dict__.get('deferredLoad') is None:
+            raise AttributeError(name)
+        self.loadDeferred()
+        return getattr(self, name)
+
+    def __getstate__(self):
+        """
+        A helper function used when pickling a KineticsLibrary object. The
+        library is loaded first if its loading was deferred.
+        """
+        self.loadDeferred()
+        return self.__dict__
+
+    def deferLoad(self, path, local_context=None, global_context=None):
+        """
+        Arrange for the kinetics library to be loaded from the file at `path`
+        on disk the first time its contents are accessed, rather than now.
+        """
+        self.__removeContents()
+        self.deferredLoad = (path, dict(local_context or {}), dict(global_context or {}))
+
+    def loadDeferred(self):
+        """
+        Load the kinetics library, if its loading was deferred by
+        :meth:`deferLoad()`. If loading fails, the library is left deferred,
+        so that loading is attempted again (raising the same error) when its
+        contents are next accessed.
+        """
+        if self.deferredLoad is None:
+            return
+        path, local_context, global_context = self.deferredLoad
+        Database.__init__(self, label=self.label)
+        logging.info('Loading kinetics library {0} from {1}...'.format(self.label, path))
+        try:
+            self.load(path, local_context, global_context)
+        except:
+            self.__removeContents()
+            raise
+        self.deferredLoad = None
+
+    def __removeContents(self):
+        """
+        Remove the attributes holding the contents of the library, so that
+        accessing them loads the library.
+        """
+        for attr in ['entries', 'top', 'name', 'shortDesc', 'longDesc', 'recommended']:
+            self.__dict__.pop(attr, None)
+
     def getSpecies(self):
         """
         Return a dictionary containing all of the species in this kinetics
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+"""
+This script contains unit tests of the :mod:`rmgpy.data.kinetics.library`
+module.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import cPickle
+
+from rmgpy.data.kinetics import KineticsDatabase, KineticsLibrary
+
+################################################################################
+
+LIBRARY = '''
+name = "test"
+shortDesc = u""
+longDesc = u"""
+A kinetics library for testing.
+"""
+entry(
+    index = 1,
+    reactant1 =
+"""
+CH3
+1 C 1 {2,S} {3,S} {4,S}
+2 H 0 {1,S}
+3 H 0 {1,S}
+4 H 0 {1,S}
+""",
+    reactant2 =
+"""
+H
+1 H 1
+""",
+    product1 =
+"""
+CH4
+1 C 0 {2,S} {3,S} {4,S} {5,S}
+2 H 0 {1,S}
+3 H 0 {1,S}
+4 H 0 {1,S}
+5 H 0 {1,S}
+""",
+    kinetics = Arrhenius(A=(1.0e14,'cm^3/(mol*s)'), n=0, Ea=(0,'kcal/mol'), T0=(1,'K')),
+)
+'''
+
+class TestDeferredLoad(unittest.TestCase):
+    """
+    Contains unit tests of the deferred loading of the :class:`KineticsLibrary`
+    class.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'test.py')
+        with open(self.path, 'w') as f:
+            f.write(LIBRARY)
+        self.database = KineticsDatabase()
+        self.database.loadLibraries(self.directory, ['test'])
+        self.library = self.database.libraries['test']
+
+    def tearDown(self):
+        """
+        A function run after each unit test in this class.
+        """
+        shutil.rmtree(self.directory)
+
+    def test_deferred(self):
+        """
+        Test that loading the library is deferred until it is used.
+        """
+        self.assertTrue(self.library.deferredLoad is not None)
+        self.assertFalse('entries' in self.library.__dict__)
+
+    def test_loadOnAccess(self):
+        """
+        Test that the library is loaded when its contents are first accessed.
+        """
+        self.assertEqual(len(self.library.entries), 1)
+        self.assertTrue(self.library.deferredLoad is None)
+        self.assertEqual(self.library.name, 'test')
+        entry = self.library.entries.values()[0]
+        self.assertEqual([spec.label for spec in entry.item.reactants], ['CH3', 'H'])
+
+    def test_pickle(self):
+        """
+        Test that pickling a deferred library loads it first.
+        """
+        library = cPickle.loads(cPickle.dumps(self.library, -1))
+        self.assertTrue(library.deferredLoad is None)
+        self.assertEqual(len(library.entries), 1)
+        self.assertTrue(self.library.deferredLoad is None)
+
+    def test_failedLoad(self):
+        """
+        Test that a library whose loading fails raises the same error each
+        time it is accessed, and is loaded once the problem is fixed.
+        """
+        os.rename(self.path, self.path + '.bak')
+        for i in range(2):
+            self.assertRaises(IOError, getattr, self.library, 'entries')
+            self.assertTrue(self.library.deferredLoad is not None)
+        os.rename(self.path + '.bak', self.path)
+        self.assertEqual(len(self.library.entries), 1)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
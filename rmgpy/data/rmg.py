@@ -33,7 +33,11 @@ This module contains the :class:`RMGDatabase` class, which is the primary class
 for working with the RMG database.
 """
 
+import os
 import os.path
+import cPickle
+import hashlib
+import logging
 
 from base import ForbiddenStructures
 from thermo import ThermoDatabase
@@ -43,6 +47,10 @@ from statmech import StatmechDatabase
 # Module-level variable to store the (only) instance of RMGDatabase in use.
 database = None
 
+# The version of the database snapshot format; snapshots of any other version
+# are ignored
+SNAPSHOT_VERSION = 2
+
 ################################################################################
 
 class RMGDatabase:
@@ -174,3 +182,76 @@ class RMGDatabase:
         self.forbiddenStructures.saveOld(os.path.join(path, 'ForbiddenStructures.txt'))
         self.kinetics.saveOld(path)
         self.statmech.saveOld(path)
+
+################################################################################
+
+def getDatabaseSourceHash(path, arguments=None):
+    """
+    Return a hexadecimal digest of the contents of every source file in the
+    RMG database found at `path` on disk, together with the representation
+    of the `arguments` used to load it. Any change to a file or to the parts
+    of the database requested results in a different digest.
+    """
+    digest = hashlib.md5()
+    digest.update('{0!r}\n{1!r}\n'.format(SNAPSHOT_VERSION, arguments))
+    for root, dirs, files in os.walk(path):
+        # Walk the directories and files in a reproducible order, skipping
+        # hidden ones (e.g. version control metadata)
+        dirs[:] = sorted([d for d in dirs if not d.startswith('.')])
+        for filename in sorted(files):
+            if filename.startswith('.') or filename.endswith('.pyc'):
+                continue
+            filepath = os.path.join(root, filename)
+            digest.update('{0}\n'.format(os.path.relpath(filepath, path)))
+            f = open(filepath, 'rb')
+            digest.update(f.read())
+            f.close()
+    return digest.hexdigest()
+
+def loadDatabaseSnapshot(path, sourceHash):
+    """
+    Load and return the :class:`RMGDatabase` stored in the snapshot file at
+    `path` on disk if it was saved from database sources with the digest
+    `sourceHash`, or ``None`` if there is no such snapshot. The loaded
+    database becomes the module-level instance in use.
+    """
+    global database
+    if not os.path.exists(path):
+        return None
+    f = open(path, 'rb')
+    try:
+        try:
+            version, snapshotHash = cPickle.load(f)
+            if version != SNAPSHOT_VERSION or snapshotHash != sourceHash:
+                logging.info('Database snapshot at {0} is out of date; ignoring.'.format(path))
+                return None
+            snapshot = cPickle.load(f)
+        except Exception, e:
+            logging.warning('Unable to load database snapshot at {0}: {1}'.format(path, e))
+            return None
+    finally:
+        f.close()
+    assert database is None, "Should only make one instance of RMGDatabase because it's stored as a module-level variable."
+    database = snapshot
+    return database
+
+def saveDatabaseSnapshot(path, sourceHash):
+    """
+    Save the module-level :class:`RMGDatabase` instance in use to a snapshot
+    file at `path` on disk, labeled with the digest `sourceHash` of the
+    database sources it was loaded from. The snapshot is written to a
+    temporary file first so that an interrupted save never leaves a
+    truncated snapshot behind.
+    """
+    tempPath = path + '.tmp'
+    f = open(tempPath, 'wb')
+    try:
+        cPickle.dump((SNAPSHOT_VERSION, sourceHash), f, cPickle.HIGHEST_PROTOCOL)
+        cPickle.dump(database, f, cPickle.HIGHEST_PROTOCOL)
+    except Exception, e:
+        f.close()
+        os.remove(tempPath)
+        logging.warning('Unable to save database snapshot to {0}: {1}'.format(path, e))
+        return
+    f.close()
+    os.rename(tempPath, path)
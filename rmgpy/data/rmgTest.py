@@ -0,0 +1,153 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import rmgpy.data.rmg
+from rmgpy.data.rmg import RMGDatabase, getDatabaseSourceHash, loadDatabaseSnapshot, saveDatabaseSnapshot
+from rmgpy.data.kinetics import KineticsDatabase
+
+################################################################################
+
+class TestDatabaseSnapshot(unittest.TestCase):
+    """
+    Contains unit tests of the snapshots of the loaded RMG database.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.sourceDirectory = os.path.join(self.directory, 'database')
+        os.makedirs(os.path.join(self.sourceDirectory, 'kinetics'))
+        self.writeSource('forbiddenStructures.py', 'name = "forbidden"\n')
+        self.writeSource(os.path.join('kinetics', 'library.py'), 'name = "library"\n')
+        self.path = os.path.join(self.directory, 'database.pkl')
+
+        rmgpy.data.rmg.database = None
+        self.database = RMGDatabase()
+        self.database.kinetics = KineticsDatabase()
+        self.database.kinetics.libraryOrder = ['library']
+
+    def tearDown(self):
+        """
+        A function run after each unit test in this class.
+        """
+        rmgpy.data.rmg.database = None
+        shutil.rmtree(self.directory)
+
+    def writeSource(self, filename, contents):
+        """
+        Write a source file of the database with the given `contents`.
+        """
+        with open(os.path.join(self.sourceDirectory, filename), 'w') as f:
+            f.write(contents)
+
+    def load(self, sourceHash):
+        """
+        Return the database loaded from the snapshot file if it was saved
+        from database sources with the digest `sourceHash`, or ``None`` if
+        not. The module-level database is cleared first.
+        """
+        rmgpy.data.rmg.database = None
+        return loadDatabaseSnapshot(self.path, sourceHash)
+
+    def test_sourceHash(self):
+        """
+        Test that the digest of the database sources changes when a source
+        file or the loading arguments change, but not otherwise.
+        """
+        sourceHash = getDatabaseSourceHash(self.sourceDirectory, [('kineticsFamilies', 'default')])
+        self.assertEqual(getDatabaseSourceHash(self.sourceDirectory, [('kineticsFamilies', 'default')]), sourceHash)
+        # Hidden and compiled files are ignored
+        self.writeSource('.hidden', 'ignored')
+        self.writeSource(os.path.join('kinetics', 'library.pyc'), 'ignored')
+        self.assertEqual(getDatabaseSourceHash(self.sourceDirectory, [('kineticsFamilies', 'default')]), sourceHash)
+
+        self.assertNotEqual(getDatabaseSourceHash(self.sourceDirectory, [('kineticsFamilies', 'none')]), sourceHash)
+        self.assertNotEqual(getDatabaseSourceHash(self.sourceDirectory), sourceHash)
+        self.writeSource(os.path.join('kinetics', 'library.py'), 'name = "changed"\n')
+        changedHash = getDatabaseSourceHash(self.sourceDirectory, [('kineticsFamilies', 'default')])
+        self.assertNotEqual(changedHash, sourceHash)
+        self.writeSource(os.path.join('kinetics', 'other.py'), 'name = "other"\n')
+        self.assertNotEqual(getDatabaseSourceHash(self.sourceDirectory, [('kineticsFamilies', 'default')]), changedHash)
+
+    def test_saveAndLoad(self):
+        """
+        Test that a saved snapshot is loaded back and becomes the
+        module-level database.
+        """
+        sourceHash = getDatabaseSourceHash(self.sourceDirectory)
+        saveDatabaseSnapshot(self.path, sourceHash)
+        self.assertTrue(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+        database = self.load(sourceHash)
+        self.assertTrue(isinstance(database, RMGDatabase))
+        self.assertTrue(database is not self.database)
+        self.assertTrue(rmgpy.data.rmg.database is database)
+        self.assertEqual(database.kinetics.libraryOrder, ['library'])
+
+    def test_outOfDate(self):
+        """
+        Test that a snapshot is not loaded if the database sources or the
+        loading arguments have changed since it was saved.
+        """
+        saveDatabaseSnapshot(self.path, getDatabaseSourceHash(self.sourceDirectory, [('kineticsFamilies', 'default')]))
+        self.assertTrue(self.load(getDatabaseSourceHash(self.sourceDirectory, [('kineticsFamilies', 'none')])) is None)
+        self.writeSource('forbiddenStructures.py', 'name = "changed"\n')
+        self.assertTrue(self.load(getDatabaseSourceHash(self.sourceDirectory, [('kineticsFamilies', 'default')])) is None)
+        self.assertTrue(rmgpy.data.rmg.database is None)
+
+    def test_missing(self):
+        """
+        Test that nothing is loaded if there is no snapshot.
+        """
+        self.assertTrue(self.load(getDatabaseSourceHash(self.sourceDirectory)) is None)
+
+    def test_failedSave(self):
+        """
+        Test that a save that fails partway through leaves the previous
+        snapshot in place and no temporary file behind.
+        """
+        sourceHash = getDatabaseSourceHash(self.sourceDirectory)
+        saveDatabaseSnapshot(self.path, sourceHash)
+        size = os.path.getsize(self.path)
+
+        # Functions cannot be pickled
+        self.database.statmech = lambda: None
+        saveDatabaseSnapshot(self.path, 'changed')
+        self.assertEqual(os.path.getsize(self.path), size)
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+        self.assertTrue(self.load('changed') is None)
+        self.assertTrue(self.load(sourceHash) is not None)
+
+    def test_interruptedSave(self):
+        """
+        Test that a snapshot truncated by an interrupted save is never loaded,
+        whether it is the temporary file or the snapshot itself.
+        """
+        sourceHash = getDatabaseSourceHash(self.sourceDirectory)
+        saveDatabaseSnapshot(self.path, sourceHash)
+        with open(self.path, 'rb') as f:
+            data = f.read()
+
+        # A save interrupted before the temporary file is renamed
+        with open(self.path + '.tmp', 'wb') as f:
+            f.write(data[:len(data) / 2])
+        self.assertTrue(self.load(sourceHash) is not None)
+
+        # A snapshot truncated by other means
+        with open(self.path, 'wb') as f:
+            f.write(data[:len(data) / 2])
+        self.assertTrue(self.load(sourceHash) is None)
+        self.assertTrue(rmgpy.data.rmg.database is None)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
@@ -650,9 +650,8 @@ class StatmechDatabase(object):
         by searching the entries in the depository.
         """
         items = []
-        for label, entry in self.depository.entries.iteritems():
-            if molecule.isIsomorphic(entry.item):
-                items.append((entry.data, self.depository['stable'], entry))
+        for entry in self.depository.getEntriesMatchingMolecules([molecule]):
+            items.append((entry.data, self.depository, entry))
         return items
 
     def getStatmechDataFromLibrary(self, molecule, library):
@@ -661,9 +660,8 @@ class StatmechDatabase(object):
         by searching the entries in the specified :class:`StatmechLibrary` object
         `library`. Returns ``None`` if no data was found.
         """
-        for label, entry in library.entries.iteritems():
-            if molecule.isIsomorphic(entry.item):
-                return (entry.data, library, entry)
+        for entry in library.getEntriesMatchingMolecules([molecule]):
+            return (entry.data, library, entry)
         return None
 
     def getStatmechDataFromGroups(self, molecule, thermoModel):
@@ -652,16 +652,10 @@ class ThermoDatabase(object):
         depository is loaded, a :class:`DatabaseError` is raised.
         """
         items = []
-        for label, entry in self.depository['stable'].entries.iteritems():
-            for molecule in species.molecule:
-                if molecule.isIsomorphic(entry.item):
-                    items.append((deepcopy(entry.data), self.depository['stable'], entry))
-                    break
-        for label, entry in self.depository['radical'].entries.iteritems():
-            for molecule in species.molecule:
-                if molecule.isIsomorphic(entry.item):
-                    items.append((deepcopy(entry.data), self.depository['radical'], entry))
-                    break
+        for entry in self.depository['stable'].getEntriesMatchingMolecules(species.molecule):
+            items.append((deepcopy(entry.data), self.depository['stable'], entry))
+        for entry in self.depository['radical'].getEntriesMatchingMolecules(species.molecule):
+            items.append((deepcopy(entry.data), self.depository['radical'], entry))
         return items
 
     def getThermoDataFromLibrary(self, species, library):
@@ -673,10 +667,9 @@ class ThermoDatabase(object):
         ``None`` is returned. If no corresponding library is found, a
         :class:`DatabaseError` is raised.
         """
-        for label, entry in library.entries.iteritems():
-            for molecule in species.molecule:
-                if molecule.isIsomorphic(entry.item) and entry.data is not None:
-                    return (deepcopy(entry.data), library, entry)
+        for entry in library.getEntriesMatchingMolecules(species.molecule):
+            if entry.data is not None:
+                return (deepcopy(entry.data), library, entry)
         return None
 
     def getThermoDataFromGroups(self, species):
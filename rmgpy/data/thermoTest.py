@@ -6,7 +6,8 @@ import unittest
 
 from rmgpy import settings
 from rmgpy.species import Species
-from rmgpy.data.thermo import ThermoDatabase
+from rmgpy.data.thermo import ThermoDatabase, ThermoLibrary
+from rmgpy.thermo import ThermoData
 from rmgpy.molecule.molecule import Molecule
 
 ################################################################################
@@ -110,5 +111,55 @@ class TestThermoDatabase(unittest.TestCase):
 
 ################################################################################
 
+class TestThermoLibrary(unittest.TestCase):
+    """
+    Contains unit tests of the ThermoLibrary class.
+    """
+    
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.database = ThermoDatabase()
+        self.library = ThermoLibrary(label='test')
+        for index, (label, adjlist) in enumerate([
+            ('propanol', """
+                1 C 0 {2,S}
+                2 C 0 {1,S} {3,S}
+                3 C 0 {2,S} {4,S}
+                4 O 0 {3,S}
+                """),
+            ('methoxyethane', """
+                1 C 0 {2,S}
+                2 C 0 {1,S} {3,S}
+                3 O 0 {2,S} {4,S}
+                4 C 0 {3,S}
+                """),
+            ]):
+            self.library.loadEntry(index=index, label=label, molecule=adjlist, thermo=ThermoData(H298=(float(index),'kJ/mol')))
+    
+    def testGetThermoDataFromLibrary(self):
+        """
+        Test that the library lookup finds the entry isomorphic to the species.
+        """
+        species = Species(molecule=[Molecule().fromAdjacencyList("""
+            1 C 0 {2,S}
+            2 O 0 {1,S} {3,S}
+            3 C 0 {2,S} {4,S}
+            4 C 0 {3,S}
+            """)])
+        thermoData, library, entry = self.database.getThermoDataFromLibrary(species, self.library)
+        self.assertTrue(library is self.library)
+        self.assertEqual(entry.label, 'methoxyethane')
+        
+        species = Species(molecule=[Molecule().fromAdjacencyList("""
+            1 C 0 {2,S}
+            2 C 0 {1,S} {3,S}
+            3 C 0 {2,S}
+            """)])
+        self.assertTrue(self.database.getThermoDataFromLibrary(species, self.library) is None)
+
+################################################################################
+
 if __name__ == '__main__':
     unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
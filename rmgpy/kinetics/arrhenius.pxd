@@ -41,6 +41,8 @@ cdef class Arrhenius(KineticsModel):
     
     cpdef double getRateCoefficient(self, double T, double P=?) except -1
 
+    cpdef numpy.ndarray getRateCoefficients(self, numpy.ndarray Tlist, numpy.ndarray Plist=?)
+
     cpdef changeT0(self, double T0)
 
     cpdef fitToData(self, numpy.ndarray Tlist, numpy.ndarray klist, str kunits, double T0=?, numpy.ndarray weights=?, bint threeParams=?)
@@ -87,6 +89,8 @@ cdef class MultiArrhenius(KineticsModel):
     
     cpdef double getRateCoefficient(self, double T, double P=?) except -1
 
+    cpdef numpy.ndarray getRateCoefficients(self, numpy.ndarray Tlist, numpy.ndarray Plist=?)
+
     cpdef bint isIdenticalTo(self, KineticsModel otherKinetics) except -2
     
     cpdef Arrhenius toArrhenius(self, double Tmin=?, double Tmax=?)
@@ -123,6 +123,18 @@ cdef class Arrhenius(KineticsModel):
         T0 = self._T0.value_si
         return A * (T / T0)**n * exp(-Ea / (constants.R * T))
 
+    cpdef numpy.ndarray getRateCoefficients(self, numpy.ndarray Tlist, numpy.ndarray Plist=None):
+        """
+        Return an array of the rate coefficients in the appropriate combination
+        of m^3, mol, and s at each of the temperatures `Tlist` in K. 
+        """
+        cdef double A, n, Ea, T0
+        A = self._A.value_si
+        n = self._n.value_si
+        Ea = self._Ea.value_si
+        T0 = self._T0.value_si
+        return A * (Tlist / T0)**n * numpy.exp(-Ea / (constants.R * Tlist))
+
     cpdef changeT0(self, double T0):
         """
         Changes the reference temperature used in the exponent to `T0` in K, 
@@ -525,6 +537,18 @@ cdef class MultiArrhenius(KineticsModel):
             k += arrh.getRateCoefficient(T)
         return k
 
+    cpdef numpy.ndarray getRateCoefficients(self, numpy.ndarray Tlist, numpy.ndarray Plist=None):
+        """
+        Return an array of the rate coefficients in the appropriate combination
+        of m^3, mol, and s at each of the temperatures `Tlist` in K. 
+        """
+        cdef numpy.ndarray klist
+        cdef Arrhenius arrh
+        klist = numpy.zeros(Tlist.shape[0], numpy.float64)
+        for arrh in self.arrhenius:
+            klist += arrh.getRateCoefficients(Tlist)
+        return klist
+
     cpdef bint isIdenticalTo(self, KineticsModel otherKinetics) except -2:
         """
         Returns ``True`` if kinetics matches that of another kinetics model.  Each duplicate
@@ -129,6 +129,16 @@ class TestArrhenius(unittest.TestCase):
             kact = self.arrhenius.getRateCoefficient(T)
             self.assertAlmostEqual(kexp, kact, delta=1e-4*kexp)
 
+    def test_getRateCoefficients(self):
+        """
+        Test the Arrhenius.getRateCoefficients() method.
+        """
+        Tlist = numpy.array([200,400,600,800,1000,1200,1400,1600,1800,2000], numpy.float64)
+        klist = self.arrhenius.getRateCoefficients(Tlist)
+        for T, kact in zip(Tlist, klist):
+            kexp = self.arrhenius.getRateCoefficient(T)
+            self.assertAlmostEqual(kexp, kact, delta=1e-6*kexp)
+
     def test_changeT0(self):
         """
         Test the Arrhenius.changeT0() method.
@@ -620,7 +630,17 @@ class TestMultiArrhenius(unittest.TestCase):
         for T, kexp in zip(Tlist, kexplist):
             kact = self.kinetics.getRateCoefficient(T)
             self.assertAlmostEqual(kexp, kact, delta=1e-4*kexp)
-        
+
+    def test_getRateCoefficients(self):
+        """
+        Test the MultiArrhenius.getRateCoefficients() method.
+        """
+        Tlist = numpy.array([200,400,600,800,1000,1200,1400,1600,1800,2000], numpy.float64)
+        klist = self.kinetics.getRateCoefficients(Tlist)
+        for T, kact in zip(Tlist, klist):
+            kexp = self.kinetics.getRateCoefficient(T)
+            self.assertAlmostEqual(kexp, kact, delta=1e-6*kexp)
+
     def test_pickle(self):
         """
         Test that a MultiArrhenius object can be pickled and unpickled with no loss
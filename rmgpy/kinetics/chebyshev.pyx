@@ -166,6 +166,43 @@ cdef class Chebyshev(PDepKineticsModel):
                 k += coeffs[t,p] * self.chebyshev(t, Tred) * self.chebyshev(p, Pred)
         return 10.0**k
 
+    cpdef numpy.ndarray getRateCoefficients(self, numpy.ndarray Tlist, numpy.ndarray Plist=None):
+        """
+        Return an array of the rate coefficients in the appropriate combination
+        of m^3, mol, and s at each of the temperatures `Tlist` in K and the
+        corresponding pressures `Plist` in Pa by evaluating the Chebyshev
+        expression.
+        """
+        cdef numpy.ndarray coeffs, Tred, Pred, klist
+        cdef list chebT, chebP
+        cdef double Tmin, Tmax, Pmin, Pmax
+        cdef int t, p
+        
+        if Plist is None or numpy.any(Plist == 0):
+            raise ValueError('No pressure specified to pressure-dependent Chebyshev.getRateCoefficients().')
+
+        coeffs = self._coeffs.value_si
+        Tmin = self._Tmin.value_si
+        Tmax = self._Tmax.value_si
+        Pmin = self._Pmin.value_si
+        Pmax = self._Pmax.value_si
+        Tred = (2.0/Tlist - 1.0/Tmin - 1.0/Tmax) / (1.0/Tmax - 1.0/Tmin)
+        Pred = (2.0*numpy.log10(Plist) - log10(Pmin) - log10(Pmax)) / (log10(Pmax) - log10(Pmin))
+        
+        # Evaluate the Chebyshev polynomials of each order using the recurrence relation
+        chebT = [numpy.ones_like(Tred), Tred]
+        for t in range(2, self.degreeT):
+            chebT.append(2 * Tred * chebT[t-1] - chebT[t-2])
+        chebP = [numpy.ones_like(Pred), Pred]
+        for p in range(2, self.degreeP):
+            chebP.append(2 * Pred * chebP[p-1] - chebP[p-2])
+        
+        klist = numpy.zeros(Tlist.shape[0], numpy.float64)
+        for t in range(self.degreeT):
+            for p in range(self.degreeP):
+                klist += coeffs[t,p] * chebT[t] * chebP[p]
+        return 10.0**klist
+
     cpdef fitToData(self, numpy.ndarray Tlist, numpy.ndarray Plist, numpy.ndarray K,
         str kunits, int degreeT, int degreeP, double Tmin, double Tmax, double Pmin, double Pmax):
         """
@@ -136,7 +136,18 @@ class TestChebyshev(unittest.TestCase):
             for p in range(Plist.shape[0]):
                 Kact = self.chebyshev.getRateCoefficient(Tlist[t], Plist[p])
                 self.assertAlmostEqual(Kact / Kexp[t,p], 1.0, 4, '{0} != {1} within 4 places'.format(Kexp[t,p], Kact))
-        
+
+    def test_getRateCoefficients(self):
+        """
+        Test the Chebyshev.getRateCoefficients() method.
+        """
+        Tlist = numpy.array([300,500,1000,1500,300,500,1000,1500], numpy.float64)
+        Plist = numpy.array([1e4,1e4,1e5,1e5,1e6,1e6,1e6,1e4], numpy.float64)
+        klist = self.chebyshev.getRateCoefficients(Tlist, Plist)
+        for T, P, kact in zip(Tlist, Plist, klist):
+            kexp = self.chebyshev.getRateCoefficient(T, P)
+            self.assertAlmostEqual(kact / kexp, 1.0, 6)
+
     def test_fitToData(self):
         """
         Test the Chebyshev.fitToData() method.
@@ -39,6 +39,8 @@ cdef class ThirdBody(PDepKineticsModel):
     
     cpdef double getRateCoefficient(self, double T, double P=?) except -1
 
+    cpdef numpy.ndarray getRateCoefficients(self, numpy.ndarray Tlist, numpy.ndarray Plist=?)
+
     cpdef bint isIdenticalTo(self, KineticsModel otherKinetics) except -2
 
 ################################################################################
@@ -50,6 +52,8 @@ cdef class Lindemann(PDepKineticsModel):
     
     cpdef double getRateCoefficient(self, double T, double P=?) except -1
 
+    cpdef numpy.ndarray getRateCoefficients(self, numpy.ndarray Tlist, numpy.ndarray Plist=?)
+
     cpdef bint isIdenticalTo(self, KineticsModel otherKinetics) except -2
 
 ################################################################################
@@ -63,4 +67,6 @@ cdef class Troe(PDepKineticsModel):
     
     cpdef double getRateCoefficient(self, double T, double P=?) except -1
 
+    cpdef numpy.ndarray getRateCoefficients(self, numpy.ndarray Tlist, numpy.ndarray Plist=?)
+
     cpdef bint isIdenticalTo(self, KineticsModel otherKinetics) except -2
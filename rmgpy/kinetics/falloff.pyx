@@ -99,6 +99,21 @@ cdef class ThirdBody(PDepKineticsModel):
         
         return k0 * C
 
+    cpdef numpy.ndarray getRateCoefficients(self, numpy.ndarray Tlist, numpy.ndarray Plist=None):
+        """
+        Return an array of the values of the rate coefficient :math:`k(T)` in
+        units of m^3, mol, and s at each of the temperatures `Tlist` in K and
+        the corresponding (effective) pressures `Plist` in Pa.
+        """
+        cdef numpy.ndarray C, k0
+        
+        if Plist is None:
+            Plist = numpy.zeros_like(Tlist)
+        C = Plist / constants.R / Tlist     # bath gas concentration in mol/m^3
+        k0 = self.arrheniusLow.getRateCoefficients(Tlist)
+        
+        return k0 * C
+
     cpdef bint isIdenticalTo(self, KineticsModel otherKinetics) except -2:
         """
         Checks to see if kinetics matches that of other kinetics and returns ``True``
@@ -178,6 +193,23 @@ cdef class Lindemann(PDepKineticsModel):
         
         return kinf * (Pr / (1 + Pr))
 
+    cpdef numpy.ndarray getRateCoefficients(self, numpy.ndarray Tlist, numpy.ndarray Plist=None):
+        """
+        Return an array of the values of the rate coefficient :math:`k(T)` in
+        units of m^3, mol, and s at each of the temperatures `Tlist` in K and
+        the corresponding (effective) pressures `Plist` in Pa.
+        """
+        cdef numpy.ndarray C, k0, kinf, Pr
+        
+        if Plist is None:
+            Plist = numpy.zeros_like(Tlist)
+        C = Plist / constants.R / Tlist     # bath gas concentration in mol/m^3
+        k0 = self.arrheniusLow.getRateCoefficients(Tlist)
+        kinf = self.arrheniusHigh.getRateCoefficients(Tlist)
+        Pr = k0 * C / kinf
+        
+        return kinf * (Pr / (1 + Pr))
+
     cpdef bint isIdenticalTo(self, KineticsModel otherKinetics) except -2:
         """
         Checks to see if kinetics matches that of other kinetics and returns ``True``
@@ -309,6 +341,40 @@ cdef class Troe(PDepKineticsModel):
 
         return kinf * (Pr / (1 + Pr)) * F
 
+    cpdef numpy.ndarray getRateCoefficients(self, numpy.ndarray Tlist, numpy.ndarray Plist=None):
+        """
+        Return an array of the values of the rate coefficient :math:`k(T)` in
+        units of m^3, mol, and s at each of the temperatures `Tlist` in K and
+        the corresponding (effective) pressures `Plist` in Pa.
+        """
+        cdef numpy.ndarray C, k0, kinf, Pr
+        cdef numpy.ndarray n, c, Fcent, F
+        cdef double d, alpha, T1, T2, T3
+        
+        if Plist is None:
+            Plist = numpy.zeros_like(Tlist)
+        C = Plist / constants.R / Tlist     # bath gas concentration in mol/m^3
+        k0 = self.arrheniusLow.getRateCoefficients(Tlist)
+        kinf = self.arrheniusHigh.getRateCoefficients(Tlist)
+        Pr = k0 * C / kinf
+        
+        alpha = self.alpha
+        T1 = self._T1.value_si if self._T1 is not None else 0.0
+        T2 = self._T2.value_si if self._T2 is not None else 0.0
+        T3 = self._T3.value_si if self._T3 is not None else 0.0
+        
+        if T1 == 0 and T3 == 0:
+            F = numpy.ones_like(Tlist)
+        else:
+            Fcent = (1 - alpha) * numpy.exp(-Tlist / T3) + alpha * numpy.exp(-Tlist / T1)
+            if T2 != 0.0: Fcent += numpy.exp(-T2 / Tlist)
+            d = 0.14
+            n = 0.75 - 1.27 * numpy.log10(Fcent)
+            c = -0.4 - 0.67 * numpy.log10(Fcent)
+            F = 10.0**(numpy.log10(Fcent)/(1 + ((numpy.log10(Pr) + c)/(n - d * (numpy.log10(Pr))))**2))
+
+        return kinf * (Pr / (1 + Pr)) * F
+
     cpdef bint isIdenticalTo(self, KineticsModel otherKinetics) except -2:
         """
         Checks to see if kinetics matches that of other kinetics and returns ``True``
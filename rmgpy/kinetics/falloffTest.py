@@ -513,6 +513,17 @@ class TestTroe(unittest.TestCase):
                 Kact = self.troe.getRateCoefficient(Tlist[t], Plist[p])
                 self.assertAlmostEqual(Kact, Kexp[t,p], delta=1e-4*Kexp[t,p])
 
+    def test_getRateCoefficients(self):
+        """
+        Test the Troe.getRateCoefficients() method.
+        """
+        Tlist = numpy.array([300,500,1000,1500,300,500,1000,1500], numpy.float64)
+        Plist = numpy.array([1e4,1e4,1e5,1e5,1e6,1e6,1e6,1e4], numpy.float64)
+        klist = self.troe.getRateCoefficients(Tlist, Plist)
+        for T, P, kact in zip(Tlist, Plist, klist):
+            kexp = self.troe.getRateCoefficient(T, P)
+            self.assertAlmostEqual(kexp, kact, delta=1e-6*kexp)
+
     def test_pickle(self):
         """
         Test that a Troe object can be pickled and unpickled with no loss of
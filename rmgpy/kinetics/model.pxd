@@ -49,6 +49,8 @@ cdef class KineticsModel:
 
     cpdef double getRateCoefficient(self, double T, double P=?) except -1
     
+    cpdef numpy.ndarray getRateCoefficients(self, numpy.ndarray Tlist, numpy.ndarray Plist=?)
+    
     cpdef toHTML(self)
 
     cpdef bint isSimilarTo(self, KineticsModel otherKinetics) except -2
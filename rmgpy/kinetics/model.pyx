@@ -180,6 +180,25 @@ cdef class KineticsModel:
         """
         raise NotImplementedError('Unexpected call to KineticsModel.getRateCoefficient(); you should be using a class derived from KineticsModel.')
 
+    cpdef numpy.ndarray getRateCoefficients(self, numpy.ndarray Tlist, numpy.ndarray Plist=None):
+        """
+        Return an array of the values of the rate coefficient :math:`k(T,P)`
+        at each of the temperatures `Tlist` in K and the corresponding
+        pressures `Plist` in Pa (or zero if not given). This implementation
+        calls :meth:`getRateCoefficient()` for each pair of conditions, and is
+        overloaded in derived classes that can evaluate the whole array at
+        once.
+        """
+        cdef numpy.ndarray[numpy.float64_t,ndim=1] klist
+        cdef int i
+        
+        if Plist is None:
+            Plist = numpy.zeros_like(Tlist)
+        klist = numpy.zeros(Tlist.shape[0], numpy.float64)
+        for i in range(Tlist.shape[0]):
+            klist[i] = self.getRateCoefficient(Tlist[i], Plist[i])
+        return klist
+
     cpdef toHTML(self):
         """
         Return an HTML rendering.
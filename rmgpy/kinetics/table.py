@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+################################################################################
+#
+#   RMG - Reaction Mechanism Generator
+#
+#   Copyright (c) 2002-2009 Prof. William H. Green (whgreen@mit.edu) and the
+#   RMG Team (rmg_dev@mit.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the "Software"),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+#   THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+This module contains a table of the kinetics of many reactions, which packs
+the parameters of the Arrhenius expressions into arrays so that the rate
+coefficients of all of the reactions can be evaluated at once.
+"""
+
+import numpy
+
+import rmgpy.constants as constants
+from rmgpy.kinetics.arrhenius import Arrhenius, MultiArrhenius
+
+################################################################################
+
+class KineticsTable(object):
+    """
+    A table of the kinetics models of a list of reactions. The attributes are:
+
+    =============== ============================================================
+    Attribute       Description
+    =============== ============================================================
+    `kinetics`      The list of kinetics models in the table
+    `A`             An array of the preexponential factors of the packed Arrhenius expressions in SI units
+    `n`             An array of the temperature exponents of the packed Arrhenius expressions
+    `Ea`            An array of the activation energies of the packed Arrhenius expressions in J/mol
+    `T0`            An array of the reference temperatures of the packed Arrhenius expressions in K
+    `indices`       An array of the index in `kinetics` of each packed Arrhenius expression
+    `otherIndices`  A list of the indices in `kinetics` of the models that are not packed
+    =============== ============================================================
+
+    :class:`Arrhenius` models are packed as a single expression, and
+    :class:`MultiArrhenius` models as one expression per term. All other
+    models are evaluated individually using their own
+    :meth:`getRateCoefficient()` method.
+    """
+
+    def __init__(self, kinetics):
+        self.kinetics = kinetics
+        self.otherIndices = []
+        terms = []
+        indices = []
+        for index, model in enumerate(kinetics):
+            if isinstance(model, Arrhenius):
+                terms.append(model)
+                indices.append(index)
+            elif isinstance(model, MultiArrhenius) and all([isinstance(arrh, Arrhenius) for arrh in model.arrhenius]):
+                terms.extend(model.arrhenius)
+                indices.extend([index] * len(model.arrhenius))
+            else:
+                self.otherIndices.append(index)
+        self.A = numpy.array([arrh.A.value_si for arrh in terms], numpy.float64)
+        self.n = numpy.array([arrh.n.value_si for arrh in terms], numpy.float64)
+        self.Ea = numpy.array([arrh.Ea.value_si for arrh in terms], numpy.float64)
+        self.T0 = numpy.array([arrh.T0.value_si for arrh in terms], numpy.float64)
+        self.indices = numpy.array(indices, numpy.int)
+
+    def getRateCoefficients(self, T, P=0.0):
+        """
+        Return an array of the rate coefficients in SI units of each of the
+        kinetics models in the table at temperature `T` in K and pressure `P`
+        in Pa.
+        """
+        klist = numpy.zeros(len(self.kinetics), numpy.float64)
+        if self.indices.shape[0] > 0:
+            # Sum the packed expressions belonging to each model
+            kterms = self.A * (T / self.T0)**self.n * numpy.exp(-self.Ea / (constants.R * T))
+            klist += numpy.bincount(self.indices, weights=kterms, minlength=len(self.kinetics))
+        for index in self.otherIndices:
+            klist[index] = self.kinetics[index].getRateCoefficient(T, P)
+        return klist
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+################################################################################
+#
+#   RMG - Reaction Mechanism Generator
+#
+#   Copyright (c) 2002-2009 Prof. William H. Green (whgreen@mit.edu) and the
+#   RMG Team (rmg_dev@mit.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the "Software"),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+#   THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+This script contains unit tests of the :mod:`rmgpy.kinetics.table` module.
+"""
+
+import unittest
+import numpy
+
+from rmgpy.kinetics.arrhenius import Arrhenius, MultiArrhenius
+from rmgpy.kinetics.falloff import Lindemann
+from rmgpy.kinetics.table import KineticsTable
+
+################################################################################
+
+class TestKineticsTable(unittest.TestCase):
+    """
+    Contains unit tests of the :class:`KineticsTable` class.
+    """
+    
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        arrhenius0 = Arrhenius(
+            A = (1.0e12,"cm^3/(mol*s)"),
+            n = 0.5,
+            Ea = (41.84,"kJ/mol"),
+            T0 = (1.,"K"),
+        )
+        arrhenius1 = Arrhenius(
+            A = (1.0e6,"cm^3/(mol*s)"),
+            n = 1.5,
+            Ea = (10.0,"kJ/mol"),
+            T0 = (300.,"K"),
+        )
+        self.kinetics = [
+            arrhenius0,
+            MultiArrhenius(arrhenius=[arrhenius0, arrhenius1]),
+            Lindemann(arrheniusHigh=arrhenius0, arrheniusLow=Arrhenius(
+                A = (1.0e18,"cm^6/(mol^2*s)"),
+                n = -1.0,
+                Ea = (20.0,"kJ/mol"),
+                T0 = (1.,"K"),
+            )),
+            arrhenius1,
+        ]
+        self.table = KineticsTable(self.kinetics)
+    
+    def test_packing(self):
+        """
+        Test that the Arrhenius expressions were packed into the table.
+        """
+        self.assertEqual(list(self.table.indices), [0, 1, 1, 3])
+        self.assertEqual(self.table.otherIndices, [2])
+        
+    def test_getRateCoefficients(self):
+        """
+        Test the KineticsTable.getRateCoefficients() method.
+        """
+        P = 1e5
+        for T in [300, 500, 1000, 1500, 2000]:
+            klist = self.table.getRateCoefficients(T, P)
+            for kinetics, kact in zip(self.kinetics, klist):
+                kexp = kinetics.getRateCoefficient(T, P)
+                self.assertAlmostEqual(kexp, kact, delta=1e-6*kexp)
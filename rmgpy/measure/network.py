@@ -37,6 +37,7 @@ import math
 import numpy
 import cython
 import logging
+import os
 import os.path
 
 import rmgpy.constants as constants
@@ -814,15 +815,19 @@ class Network:
         self.K, self.p0 = cse.applyChemicallySignificantEigenvaluesMethod(self.T, self.P, self.Elist, self.densStates, self.Mcoll, self.Kij, self.Fim, self.Gnj, self.eqRatios, Nisom, Nreac, Nprod)
         return self.K, self.p0
     
-    def calculateRateCoefficients(self, Tlist, Plist, method, grainSize=None, grainCount=None, errorCheck=True):
+    def calculateRateCoefficients(self, Tlist, Plist, method, grainSize=None, grainCount=None, errorCheck=True, processes=1):
         """
         Calculate the phenomenological rate coefficients :math:`k(T,P)` for the
         network at the given temperatures `Tlist` in K and pressures `Plist` in
         Pa using the energy grains ``Elist`` in J/mol. The `method` string is
         used to indicate the method to use, and should be one of ``"modified
         strong collision"``, ``"reservoir state"``, or
-        ``"chemically-significant eigenvalues"``.
+        ``"chemically-significant eigenvalues"``. If `processes` is greater
+        than one, the temperatures are divided among a pool of worker processes
+        forked from this process, which share the precomputed densities of
+        states.
         """
+        global parallelJob
 
         Nisom = len(self.isomers)
         Nreac = len(self.reactants)
@@ -847,72 +852,25 @@ class Network:
         logging.info('Calculating phenomenological rate coefficients for {0}...'.format(self))
         K = numpy.zeros((len(Tlist),len(Plist),Nisom+Nreac+Nprod,Nisom+Nreac+Nprod), numpy.float64)
         
-        for t, T in enumerate(Tlist):
-            for p, P in enumerate(Plist):
-                self.setConditions(T, P)
-                
-                # Apply method
-                if method.lower() == 'modified strong collision':
-                    self.applyModifiedStrongCollisionMethod()
-                elif method.lower() == 'reservoir state':
-                    self.applyReservoirStateMethod()
-                elif method.lower() == 'chemically-significant eigenvalues':
-                    self.applyChemicallySignificantEigenvaluesMethod()
-                else:
-                    raise NetworkError('Unknown method "{0}".'.format(method))
-
-                K[t,p,:,:] = self.K
-
-                # Check that the k(T,P) values satisfy macroscopic equilibrium
-                eqRatios = self.eqRatios
-                for i in range(Nisom+Nreac):
-                    for j in range(i):
-                        Keq0 = K[t,p,i,j] / K[t,p,j,i]
-                        Keq = eqRatios[i] / eqRatios[j]
-                        if Keq0 / Keq < 0.5 or Keq0 / Keq > 2.0:
-                            if i < Nisom:
-                                reactants = [self.isomers[i]]
-                            elif i < Nisom+Nreac:
-                                reactants = self.reactants[i-Nisom]
-                            else:
-                                reactants = self.products[i-Nisom-Nreac]
-                            if j < Nisom:
-                                products = [self.isomers[j]]
-                            elif j < Nisom+Nreac:
-                                products = self.reactants[j-Nisom]
-                            else:
-                                products = self.products[j-Nisom-Nreac]
-                            reaction = Reaction(reactants=reactants, products=products)
-                            logging.error('For net reaction {0!s}:'.format(reaction))
-                            logging.error('Expected Keq({1:g} K, {2:g} bar) = {0:11.3e}'.format(Keq, T, P/1e5))
-                            logging.error('  Actual Keq({1:g} K, {2:g} bar) = {0:11.3e}'.format(Keq0, T, P/1e5))
-                            raise NetworkError('MEASURE computed k(T,P) values for reaction {0!s} do not satisfy macroscopic equilibrium.'.format(reaction))
-                            
-                # Compute k(T,P) values from the return p0
-                # This should be identical to the k(T,P) values returned by each method
-                #if method.lower() != 'modified strong collision':
-                #    import me
-                #    K[t,p,:,:] = me.computeRateCoefficients(Mcoll, Kij, Fim, Gnj, p0[t,p,:,:,:], Nisom, Nreac, Nprod)
-
-                # Reject if any rate coefficients are negative
-                if errorCheck:
-                    negativeRate = False
-                    for i in range(Nisom+Nreac+Nprod):
-                        for j in range(i):
-                            if (K[t,p,i,j] < 0 or K[t,p,j,i] < 0) and not negativeRate:
-                                negativeRate = True
-                                logging.error('Negative rate coefficient generated; rejecting result.')
-                                logging.info(K[t,p,0:Nisom+Nreac+Nprod,0:Nisom+Nreac])
-                                K[t,p,:,:] = 0 * K[t,p,:,:]
-                                p0[t,p,:,:,:] = 0 * p0[t,p,:,:,:]
-                            #elif K[t,p,i,j] < 0 and i < Nisom+Nreac and j < Nisom+Nreac:
-                                #K[t,p,i,j] = K[t,p,j,i] * eqRatios[j] / eqRatios[i]
-                            #elif K[t,p,j,i] < 0 and i < Nisom+Nreac and j < Nisom+Nreac:
-                                #K[t,p,j,i] = K[t,p,i,j] * eqRatios[i] / eqRatios[j]
-                                
-                            
-                logging.log(0, K[t,p,0:Nisom+Nreac+Nprod,0:Nisom+Nreac])
-                
+        if processes > 1 and len(Tlist) > 1 and hasattr(os, 'fork'):
+            import multiprocessing
+            # The last temperature is computed in this process, so that the
+            # network is left in the same state as when computing serially
+            parallelJob = (self, Tlist, Plist, method, errorCheck)
+            pool = multiprocessing.Pool(min(processes, len(Tlist) - 1))
+            try:
+                result = pool.map_async(calculateRateCoefficientsWorker, range(len(Tlist) - 1))
+                K[-1,:,:,:] = self.calculateRateCoefficientsAtTemperature(Tlist[-1], Plist, method, errorCheck)
+                for t, Kt in enumerate(result.get()):
+                    K[t,:,:,:] = Kt
+            finally:
+                pool.close()
+                pool.join()
+                parallelJob = None
+        else:
+            for t, T in enumerate(Tlist):
+                K[t,:,:,:] = self.calculateRateCoefficientsAtTemperature(T, Plist, method, errorCheck)
+        
         logging.debug('')
 
         # Mark network as valid
@@ -920,6 +878,86 @@ class Network:
 
         return K
 
+    def calculateRateCoefficientsAtTemperature(self, T, Plist, method, errorCheck=True):
+        """
+        Return the phenomenological rate coefficients :math:`k(T,P)` for the
+        network at the temperature `T` in K and each of the pressures `Plist`
+        in Pa using the given `method`, as an array indexed by pressure. The
+        network must already have been initialized.
+        """
+        Nisom = len(self.isomers)
+        Nreac = len(self.reactants)
+        Nprod = len(self.products)
+        
+        K = numpy.zeros((len(Plist),Nisom+Nreac+Nprod,Nisom+Nreac+Nprod), numpy.float64)
+        
+        for p, P in enumerate(Plist):
+            self.setConditions(T, P)
+            
+            # Apply method
+            if method.lower() == 'modified strong collision':
+                self.applyModifiedStrongCollisionMethod()
+            elif method.lower() == 'reservoir state':
+                self.applyReservoirStateMethod()
+            elif method.lower() == 'chemically-significant eigenvalues':
+                self.applyChemicallySignificantEigenvaluesMethod()
+            else:
+                raise NetworkError('Unknown method "{0}".'.format(method))
+
+            K[p,:,:] = self.K
+
+            # Check that the k(T,P) values satisfy macroscopic equilibrium
+            eqRatios = self.eqRatios
+            for i in range(Nisom+Nreac):
+                for j in range(i):
+                    Keq0 = K[p,i,j] / K[p,j,i]
+                    Keq = eqRatios[i] / eqRatios[j]
+                    if Keq0 / Keq < 0.5 or Keq0 / Keq > 2.0:
+                        if i < Nisom:
+                            reactants = [self.isomers[i]]
+                        elif i < Nisom+Nreac:
+                            reactants = self.reactants[i-Nisom]
+                        else:
+                            reactants = self.products[i-Nisom-Nreac]
+                        if j < Nisom:
+                            products = [self.isomers[j]]
+                        elif j < Nisom+Nreac:
+                            products = self.reactants[j-Nisom]
+                        else:
+                            products = self.products[j-Nisom-Nreac]
+                        reaction = Reaction(reactants=reactants, products=products)
+                        logging.error('For net reaction {0!s}:'.format(reaction))
+                        logging.error('Expected Keq({1:g} K, {2:g} bar) = {0:11.3e}'.format(Keq, T, P/1e5))
+                        logging.error('  Actual Keq({1:g} K, {2:g} bar) = {0:11.3e}'.format(Keq0, T, P/1e5))
+                        raise NetworkError('MEASURE computed k(T,P) values for reaction {0!s} do not satisfy macroscopic equilibrium.'.format(reaction))
+                        
+            # Compute k(T,P) values from the return p0
+            # This should be identical to the k(T,P) values returned by each method
+            #if method.lower() != 'modified strong collision':
+            #    import me
+            #    K[p,:,:] = me.computeRateCoefficients(Mcoll, Kij, Fim, Gnj, p0[p,:,:,:], Nisom, Nreac, Nprod)
+
+            # Reject if any rate coefficients are negative
+            if errorCheck:
+                negativeRate = False
+                for i in range(Nisom+Nreac+Nprod):
+                    for j in range(i):
+                        if (K[p,i,j] < 0 or K[p,j,i] < 0) and not negativeRate:
+                            negativeRate = True
+                            logging.error('Negative rate coefficient generated; rejecting result.')
+                            logging.info(K[p,0:Nisom+Nreac+Nprod,0:Nisom+Nreac])
+                            K[p,:,:] = 0 * K[p,:,:]
+                            p0[p,:,:,:] = 0 * p0[p,:,:,:]
+                        #elif K[p,i,j] < 0 and i < Nisom+Nreac and j < Nisom+Nreac:
+                            #K[p,i,j] = K[p,j,i] * eqRatios[j] / eqRatios[i]
+                        #elif K[p,j,i] < 0 and i < Nisom+Nreac and j < Nisom+Nreac:
+                            #K[p,j,i] = K[p,i,j] * eqRatios[i] / eqRatios[j]
+                            
+                        
+            logging.log(0, K[p,0:Nisom+Nreac+Nprod,0:Nisom+Nreac])
+
+        return K
+
     def generateFullMEMatrix(self, T, P, grainSize=None, grainCount=None):
         """
         Generate the full master equation matrix for the network at the
@@ -1312,3 +1350,19 @@ class Network:
 
         return surfaces, width, height, boundingRects
         
+
+################################################################################
+
+# The network and arguments of the current call to
+# Network.calculateRateCoefficients() using multiple processes; stored at the
+# module level so that forked worker processes inherit them without pickling
+parallelJob = None
+
+def calculateRateCoefficientsWorker(t):
+    """
+    Return the phenomenological rate coefficients for the network of the job
+    stored in `parallelJob` at the temperature with index `t`, for use in the
+    worker processes forked by :meth:`Network.calculateRateCoefficients()`.
+    """
+    network, Tlist, Plist, method, errorCheck = parallelJob
+    return network.calculateRateCoefficientsAtTemperature(Tlist[t], Plist, method, errorCheck)
@@ -90,7 +90,12 @@ cdef class Molecule(Graph):
     cdef public bint implicitHydrogens
     cdef public int symmetryNumber
     cdef str _fingerprint
+    cdef public dict templateMappings
     
+    cpdef resetConnectivityValues(self)
+
+    cpdef updateConnectivityValues(self)
+
     cpdef str getFingerprint(self)
     
     cpdef addAtom(self, Atom atom)
@@ -131,6 +136,8 @@ cdef class Molecule(Graph):
 
     cpdef dict getLabeledAtoms(self)
 
+    cpdef getCanonicalHash(self)
+
     cpdef bint isIsomorphic(self, Graph other, dict initialMap=?) except -2
 
     cpdef list findIsomorphism(self, Graph other, dict initialMap=?)
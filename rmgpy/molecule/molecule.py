@@ -472,6 +472,7 @@ class Molecule(Graph):
     Attribute               Type        Description
     ======================= =========== ========================================
     `symmetryNumber`        ``int``     The (estimated) external + internal symmetry number of the molecule
+    `templateMappings`      ``dict``    The subgraph isomorphisms to reaction family template nodes found so far
     ======================= =========== ========================================
 
     A new molecule object can be easily instantiated by passing the `SMILES` or
@@ -482,6 +483,7 @@ class Molecule(Graph):
         Graph.__init__(self, atoms)
         self.symmetryNumber = symmetry
         self._fingerprint = None
+        self.templateMappings = {}
         if SMILES != '': self.fromSMILES(SMILES)
         elif InChI != '': self.fromInChI(InChI)
     
@@ -512,6 +514,7 @@ class Molecule(Graph):
         Add an `atom` to the graph. The atom is initialized with no bonds.
         """
         self._fingerprint = None
+        self.templateMappings = {}
         return self.addVertex(atom)
     
     def addBond(self, bond):
@@ -520,6 +523,7 @@ class Molecule(Graph):
         and `atom2`.
         """
         self._fingerprint = None
+        self.templateMappings = {}
         return self.addEdge(bond)
 
     def getBonds(self, atom):
@@ -555,6 +559,7 @@ class Molecule(Graph):
         removal.
         """
         self._fingerprint = None
+        self.templateMappings = {}
         return self.removeVertex(atom)
 
     def removeBond(self, bond):
@@ -564,6 +569,7 @@ class Molecule(Graph):
         this removal.
         """
         self._fingerprint = None
+        self.templateMappings = {}
         return self.removeEdge(bond)
 
     def sortAtoms(self):
@@ -752,18 +758,125 @@ class Molecule(Graph):
                     labeled[atom.label] = atom
         return labeled
 
+    def resetConnectivityValues(self):
+        """
+        Reset the connectivity values for each atom in the molecule. This also
+        invalidates the stored fingerprint and template mappings, since this
+        is called when the structure of the molecule is about to be modified.
+        """
+        self._fingerprint = None
+        self.templateMappings = {}
+        Graph.resetConnectivityValues(self)
+
+    def updateConnectivityValues(self):
+        """
+        Update the connectivity values for each atom in the molecule. This also
+        invalidates the stored fingerprint and template mappings, since this
+        is called after the structure of the molecule has been modified.
+        """
+        self._fingerprint = None
+        self.templateMappings = {}
+        Graph.updateConnectivityValues(self)
+
     def getFingerprint(self):
         """
         Return a string containing the "fingerprint" used to accelerate graph
         isomorphism comparisons with other molecules. The fingerprint is a
         short string containing a summary of selected information about the 
-        molecule. Two fingerprint strings matching is a necessary (but not
-        sufficient) condition for the associated molecules to be isomorphic.
+        molecule: the formula, the counts of each atom type (element and bond
+        orders), the bond order histogram, the distribution of radicals and
+        charges, the number of rings, and the multiset of connectivity values.
+        Two fingerprint strings matching is a necessary (but not sufficient)
+        condition for the associated molecules to be isomorphic.
+        
+        The fingerprint is generated once and stored; it is invalidated when
+        atoms or bonds are added or removed, or when the connectivity values
+        are reset or updated after the structure is modified in place.
         """
-        if self._fingerprint is None:
-            self._fingerprint = self.getFormula()
-        return self._fingerprint
+        cython.declare(atom=Atom, atom1=Atom, atom2=Atom, bond=Bond)
+        cython.declare(atomTypes=dict, bondOrders=dict, radicals=list, charges=list, connectivity=list)
+        cython.declare(visited=set, stack=list, numBonds=cython.int, numComponents=cython.int, fingerprint=str)
+        
+        if self._fingerprint is not None:
+            return self._fingerprint
+        
+        Graph.updateConnectivityValues(self)
+        atomTypes = {}; bondOrders = {}; radicals = []; charges = []; connectivity = []
+        numBonds = 0
+        for atom in self.vertices:
+            orders = ''.join(sorted([bond.order for bond in atom.edges.values()]))
+            label = atom.element.symbol + orders
+            atomTypes[label] = atomTypes.get(label, 0) + 1
+            for order in orders:
+                bondOrders[order] = bondOrders.get(order, 0) + 1
+            numBonds += len(atom.edges)
+            if atom.radicalElectrons != 0:
+                radicals.append('{0}{1:d}{2:d}'.format(label, atom.radicalElectrons, atom.spinMultiplicity))
+            if atom.charge != 0:
+                charges.append('{0}{1:+d}'.format(label, atom.charge))
+            connectivity.append('{0:d}.{1:d}.{2:d}'.format(atom.connectivity1, atom.connectivity2, atom.connectivity3))
+        numBonds /= 2
+        
+        # Count the connected components to get the number of rings
+        visited = set(); numComponents = 0
+        for atom in self.vertices:
+            if atom in visited: continue
+            numComponents += 1
+            visited.add(atom)
+            stack = [atom]
+            while stack:
+                atom1 = stack.pop()
+                for atom2 in atom1.edges:
+                    if atom2 not in visited:
+                        visited.add(atom2)
+                        stack.append(atom2)
+        
+        fingerprint = '|'.join([
+            self.getFormula(),
+            ','.join(['{0}{1:d}'.format(label, count) for label, count in sorted(atomTypes.items())]),
+            ','.join(['{0}{1:d}'.format(order, count / 2) for order, count in sorted(bondOrders.items())]),
+            ','.join(sorted(radicals)),
+            ','.join(sorted(charges)),
+            str(numBonds - len(self.vertices) + numComponents),
+            ','.join(sorted(connectivity)),
+        ])
+        self._fingerprint = fingerprint
+        return fingerprint
     
+    def getCanonicalHash(self):
+        """
+        Return an integer hash of the molecular graph, computed by
+        Weisfeiler-Lehman refinement of the atom invariants starting from the
+        connectivity values. Isomorphic molecules always have the same hash,
+        so two molecules with different hashes cannot be isomorphic; the
+        converse is not guaranteed, so molecules with the same hash must still
+        be compared using :meth:`isIsomorphic()`. The hash is not stored, since
+        the atoms and bonds may be modified in place.
+        """
+        cython.declare(atom1=Atom, labels=dict, newLabels=dict, neighbors=list)
+        cython.declare(count=cython.int, newCount=cython.int, i=cython.int)
+        
+        Graph.updateConnectivityValues(self)
+        labels = {}
+        for atom1 in self.vertices:
+            labels[atom1] = hash((atom1.element.symbol, atom1.radicalElectrons, atom1.spinMultiplicity, atom1.charge,
+                atom1.connectivity1, atom1.connectivity2, atom1.connectivity3))
+        count = len(set(labels.values()))
+        
+        # Refine the labels using those of the neighboring atoms until the
+        # number of distinct labels stops increasing
+        for i in range(len(self.vertices)):
+            newLabels = {}
+            for atom1 in self.vertices:
+                neighbors = sorted([(bond.order, labels[atom2]) for atom2, bond in atom1.edges.iteritems()])
+                newLabels[atom1] = hash((labels[atom1], tuple(neighbors)))
+            newCount = len(set(newLabels.values()))
+            labels = newLabels
+            if newCount == count: break
+            count = newCount
+        
+        return hash(tuple(sorted(labels.values())))
+
     def isIsomorphic(self, other, initialMap=None):
         """
         Returns :data:`True` if two graphs are isomorphic and :data:`False`
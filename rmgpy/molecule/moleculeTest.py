@@ -581,6 +581,46 @@ class TestMolecule(unittest.TestCase):
         self.assertTrue(molecule1.isIsomorphic(molecule2))
         self.assertTrue(molecule2.isIsomorphic(molecule1))
 
+    def testFingerprint(self):
+        """
+        Check that the fingerprint distinguishes structural isomers and is
+        updated when the molecule is modified.
+        """
+        molecule1 = Molecule().fromSMILES('CCCO')
+        molecule2 = Molecule().fromSMILES('OCCC')
+        molecule3 = Molecule().fromSMILES('CCOC')
+        self.assertEqual(molecule1.getFingerprint(), molecule2.getFingerprint())
+        self.assertNotEqual(molecule1.getFingerprint(), molecule3.getFingerprint())
+        self.assertFalse(molecule1.isIsomorphic(molecule3))
+        molecule4 = Molecule().fromAdjacencyList("""
+        1 C 0 {2,D}
+        2 C 0 {1,D} {3,S}
+        3 C 0 {2,S}
+        """)
+        molecule5 = Molecule().fromAdjacencyList("""
+        1 C 1 {2,S}
+        2 C 1 {1,S} {3,S}
+        3 C 0 {2,S}
+        """)
+        fingerprint = molecule4.getFingerprint()
+        bond = molecule4.getBond(molecule4.atoms[0], molecule4.atoms[1])
+        bond.decrementOrder()
+        molecule4.atoms[0].incrementRadical()
+        molecule4.atoms[1].incrementRadical()
+        molecule4.updateConnectivityValues()
+        self.assertNotEqual(molecule4.getFingerprint(), fingerprint)
+        self.assertTrue(molecule4.isIsomorphic(molecule5))
+
+    def testCanonicalHash(self):
+        """
+        Check that the canonical hash matches only for isomorphic molecules.
+        """
+        molecule1 = Molecule().fromSMILES('C=CC=C[CH]C')
+        molecule2 = Molecule().fromSMILES('C[CH]C=CC=C')
+        molecule3 = Molecule().fromSMILES('C=CC=CC[CH2]')
+        self.assertEqual(molecule1.getCanonicalHash(), molecule2.getCanonicalHash())
+        self.assertNotEqual(molecule1.getCanonicalHash(), molecule3.getCanonicalHash())
+
     def testSubgraphIsomorphism(self):
         """
         Check the graph isomorphism functions.
@@ -928,6 +968,30 @@ class TestMolecule(unittest.TestCase):
         """
         self.assertEqual(Molecule().fromSMILES('CC#CC').countInternalRotors(), 1)
 
+    def testTemplateMappingsInvalidated(self):
+        """
+        Test that the stored template mappings of a molecule are discarded
+        whenever its structure is modified.
+        """
+        molecule = Molecule().fromSMILES('CC')
+        atom1, atom2 = molecule.atoms[0], molecule.atoms[1]
+        bond = molecule.getBond(atom1, atom2)
+        atom = Atom(element=getElement('H'), radicalElectrons=0, spinMultiplicity=1, charge=0)
+        for method, args in [
+            (molecule.removeBond, (bond,)),
+            (molecule.addBond, (bond,)),
+            (molecule.addAtom, (atom,)),
+            (molecule.removeAtom, (atom,)),
+            (molecule.resetConnectivityValues, ()),
+            (molecule.updateConnectivityValues, ()),
+        ]:
+            molecule.templateMappings['template'] = []
+            method(*args)
+            self.assertEqual(molecule.templateMappings, {})
+        # Copies start without any mappings
+        molecule.templateMappings['template'] = []
+        self.assertEqual(molecule.copy(deep=True).templateMappings, {})
+
 ################################################################################
 
 if __name__ == '__main__':
@@ -62,4 +62,6 @@ cdef class Configuration:
         
     cpdef numpy.ndarray generateCollisionMatrix(self, double T, numpy.ndarray densStates, numpy.ndarray Elist, numpy.ndarray Jlist=?)
     
+    cpdef list getActiveModes(self, bint activeJRotor=?, bint activeKRotor=?, bint rmgmode=?)
+
     cpdef calculateDensityOfStates(self, numpy.ndarray Elist, bint activeJRotor=?, bint activeKRotor=?, bint rmgmode=?)
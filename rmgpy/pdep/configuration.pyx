@@ -201,22 +201,18 @@ cdef class Configuration:
         assert self.species[0].energyTransferModel is not None
         return self.species[0].energyTransferModel.generateCollisionMatrix(T, densStates, Elist, Jlist)
     
-    cpdef calculateDensityOfStates(self, numpy.ndarray Elist, bint activeJRotor=True, bint activeKRotor=True, bint rmgmode=False):
+    cpdef list getActiveModes(self, bint activeJRotor=True, bint activeKRotor=True, bint rmgmode=False):
         """
-        Calculate the density (and sum) of states for the configuration at the
-        given energies above the ground state `Elist` in J/mol. The 
+        Return the list of active rovibrational modes used to compute the
+        density and sum of states of the configuration, including the relative
+        translational motion of bimolecular configurations. The
         `activeJRotor` and `activeKRotor` flags control whether the J-rotor
-        and/or K-rotor are treated as active (and therefore included in the
-        density and sum of states). The computed density and sum of states
-        arrays are stored on the object for future use.
+        and/or K-rotor are treated as active. An empty list is returned if the
+        configuration has no active modes.
         """
         cdef list modes
         cdef int i
         
-        self.Elist = Elist
-        self.activeJRotor = activeJRotor
-        self.activeKRotor = activeKRotor
-        
         # Get the active rovibrational modes for each species in the configuration
         modes = []
         for i, species in enumerate(self.species):
@@ -240,26 +236,45 @@ cdef class Configuration:
                 else:
                     modes.insert(0, NonlinearRotor(inertia=([1.0,1.0,1.0],"amu*angstrom^2"), symmetry=1))
         
+        if len(modes) > 0 and self.isBimolecular():
+            # If the configuration is bimolecular, also include the relative
+            # translational motion of the two molecules
+            mass = []
+            for species in self.species:
+                for mode in species.conformer.modes:
+                    if isinstance(mode, IdealGasTranslation):
+                        mass.append(mode.mass.value_si)
+                        break
+                else:
+                    if species.molecularWeight is not None:
+                        mass.append(species.molecularWeight.value_si)
+            assert len(mass) == 2
+            mu = 1.0/(1.0/mass[0] + 1.0/mass[1])
+            modes.insert(0, IdealGasTranslation(mass=(mu/constants.amu,"amu")))
+        
+        return modes
+    
+    cpdef calculateDensityOfStates(self, numpy.ndarray Elist, bint activeJRotor=True, bint activeKRotor=True, bint rmgmode=False):
+        """
+        Calculate the density (and sum) of states for the configuration at the
+        given energies above the ground state `Elist` in J/mol. The 
+        `activeJRotor` and `activeKRotor` flags control whether the J-rotor
+        and/or K-rotor are treated as active (and therefore included in the
+        density and sum of states). The computed density and sum of states
+        arrays are stored on the object for future use.
+        """
+        cdef list modes
+        
+        self.Elist = Elist
+        self.activeJRotor = activeJRotor
+        self.activeKRotor = activeKRotor
+        
+        modes = self.getActiveModes(activeJRotor=activeJRotor, activeKRotor=activeKRotor, rmgmode=rmgmode)
+        
         if len(modes) == 0:
             self.densStates = None
             self.sumStates = None
         else:        
-            # If the configuration is bimolecular, also include the relative
-            # translational motion of the two molecules
-            if self.isBimolecular():
-                mass = []
-                for species in self.species:
-                    for mode in species.conformer.modes:
-                        if isinstance(mode, IdealGasTranslation):
-                            mass.append(mode.mass.value_si)
-                            break
-                    else:
-                        if species.molecularWeight is not None:
-                            mass.append(species.molecularWeight.value_si)
-                assert len(mass) == 2
-                mu = 1.0/(1.0/mass[0] + 1.0/mass[1])
-                modes.insert(0, IdealGasTranslation(mass=(mu/constants.amu,"amu")))
-                
             if rmgmode:
                 # Compute the density of states by direct count
                 # This is currently faster than the method of steepest descents,
@@ -35,12 +35,18 @@ import numpy
 cimport numpy
 import logging
 import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
 
 from libc.math cimport exp, log, sqrt
 
 import rmgpy.constants as constants
 
-from rmgpy.pdep.me import generateFullMEMatrix
+from rmgpy.pdep.me import generateFullMEMatrix, generateSparseMEMatrix
+
+# Networks whose master equation matrix has more rows than this are solved
+# using a sparse matrix and an iterative solver for the slowest eigenmodes
+SPARSE_MATRIX_ROWS = 2000
 
 ################################################################################
 
@@ -65,6 +71,7 @@ def applyChemicallySignificantEigenvaluesMethod(network, list lumpingOrder=None)
     cdef double T, P, ymB
     cdef int Nisom, Nreac, Nprod, Ngrains, NJ, Nchem, Ncse, Nrows
     cdef int i, n, r, s, index
+    cdef bint sparse
 
     T = network.T
     P = network.P
@@ -88,10 +95,13 @@ def applyChemicallySignificantEigenvaluesMethod(network, list lumpingOrder=None)
     
     ymB = 1.0e-6 * P / constants.R / T
     
-    # Generate the full master equation matrix
-    M, indices = generateFullMEMatrix(network, products=False)
-    Nrows = M.shape[0]
-    M[:,Nrows-Nreac:] *= ymB
+    # Generate the master equation matrix
+    Nrows = numpy.count_nonzero(densStates[:Nisom,:,:] > 0) + Nreac
+    sparse = Nrows > SPARSE_MATRIX_ROWS
+    if sparse:
+        Msparse, indices = generateSparseMEMatrix(network, products=False)
+    else:
+        M, indices = generateFullMEMatrix(network, products=False)
     
     # Generate symmetrization matrix and its inverse
     S = numpy.zeros(Nrows, numpy.float64)
@@ -108,30 +118,43 @@ def applyChemicallySignificantEigenvaluesMethod(network, list lumpingOrder=None)
         S[index] = sqrt(eqRatios[n+Nisom] / ymB)
         Sinv[index] = 1.0 / S[index]
 
-    # Symmetrize master equation matrix: M = S * Msymm * Sinv
+    # Scale the reactant columns and symmetrize the master equation matrix:
+    # M = S * Msymm * Sinv
     # Since S and Sinv are diagonal we can do this very efficiently
-    for r in range(Nrows):
-        for s in range(Nrows):
-            M[r,s] = Sinv[r] * M[r,s] * S[s]
+    scale = S.copy()
+    scale[Nrows-Nreac:] *= ymB
+    if sparse:
+        Msparse = (scipy.sparse.diags(Sinv, 0) * Msparse * scipy.sparse.diags(scale, 0)).tocsr()
+        Mcoo = scipy.sparse.tril(Msparse, -1).tocoo()
+        rows, cols, lower = Mcoo.row, Mcoo.col, Mcoo.data
+        upper = numpy.asarray(Msparse[cols, rows]).ravel()
+    else:
+        M = Sinv.reshape(-1,1) * M * scale
+        rows, cols = numpy.nonzero(numpy.tril(M, -1))
+        lower = M[rows, cols]
+        upper = M[cols, rows]
 
     # DEBUG: Check that the matrix has been properly symmetrized
-    properlySymmetrized = True
-    for r in range(Nrows):
-        for s in range(r):
-            if M[r,s] != 0:
-                if abs(M[r,s] - M[s,r]) > 0.01 * M[r,s]:
-                    if M[r,s] > 1e-200 or M[s,r] > 1e-200:
-                        print r, s, M[r,s], M[s,r]
-                        properlySymmetrized = False
-    if not properlySymmetrized:
+    unsymmetric = (numpy.abs(lower - upper) > 0.01 * lower) & ((lower > 1e-200) | (upper > 1e-200))
+    if numpy.any(unsymmetric):
+        for r, s in zip(rows[unsymmetric], cols[unsymmetric]):
+            logging.debug('Unsymmetric master equation matrix element: {0:d} {1:d}'.format(r, s))
         raise ChemicallySignificantEigenvaluesError('Master equation matrix not properly symmetrized.')
 
     # Get eigenvalues and eigenvectors
     # We only need the slowest Nchem + 1 eigenmodes, so only compute those
     try:
-        #W0, V0 = scipy.linalg.eigh(M, eigvals=(Nrows-Nchem-1,Nrows-1), overwrite_a=True, overwrite_b=True)
-        W0, V0 = scipy.linalg.eigh(M, overwrite_a=True, overwrite_b=True)
-    except numpy.linalg.LinAlgError:
+        if sparse:
+            # The eigenvalues are all negative or zero, so the slowest are the
+            # ones nearest a small positive shift, which also keeps the
+            # shifted matrix nonsingular if there is a zero eigenvalue
+            sigma = 1e-12 * numpy.max(numpy.abs(Msparse.diagonal()))
+            W0, V0 = scipy.sparse.linalg.eigsh(Msparse, k=Nchem+1, sigma=sigma, which='LM')
+        elif Nrows > Nchem + 1:
+            W0, V0 = scipy.linalg.eigh(M, eigvals=(Nrows-Nchem-1,Nrows-1), overwrite_a=True)
+        else:
+            W0, V0 = scipy.linalg.eigh(M, overwrite_a=True)
+    except (numpy.linalg.LinAlgError, scipy.sparse.linalg.ArpackError):
         raise ChemicallySignificantEigenvaluesError('Eigenvalue calculation failed to converge.')
     
     # We can't assume that eigh returns them in sorted order
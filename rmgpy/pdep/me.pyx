@@ -132,3 +132,115 @@ cpdef generateFullMEMatrix(network, bint products=True):
                                 M[v,v] -= val
 
     return M, indices
+
+################################################################################
+
+cpdef generateSparseMEMatrix(network, bint products=True):
+    """
+    Generate the full master equation matrix for the network as a
+    :class:`scipy.sparse.csr_matrix`. The rows and columns are ordered as for
+    :func:`generateFullMEMatrix()`, but only the nonzero terms are stored; in
+    particular, the collisional transfer terms vanish away from the diagonal
+    band of each isomer, so the storage grows much more slowly than the
+    square of the number of rows.
+    """
+    import scipy.sparse
+    
+    cdef numpy.ndarray[numpy.int_t,ndim=1] Jlist
+    cdef numpy.ndarray[numpy.int_t,ndim=3] indices
+    cdef numpy.ndarray[numpy.float64_t,ndim=1] Elist, diagonal
+    cdef numpy.ndarray[numpy.float64_t,ndim=3] densStates
+    cdef numpy.ndarray[numpy.float64_t,ndim=4] Kij, Gnj, Fim
+    cdef numpy.ndarray[numpy.float64_t,ndim=5] Mcoll
+    cdef list rows, cols, data
+    cdef double T, P, beta, val
+    cdef int Nisom, Nreac, Nprod, Ngrains, NJ, Nrows
+    cdef int i, j, n, r, s, u, v
+
+    T = network.T
+    P = network.P
+    Elist = network.Elist
+    Jlist = network.Jlist
+    densStates = network.densStates
+    Mcoll = network.Mcoll
+    Kij = network.Kij
+    Fim = network.Fim
+    Gnj = network.Gnj
+    Nisom = network.Nisom
+    Nreac = network.Nreac
+    Nprod = network.Nprod
+    Ngrains = network.Ngrains
+    NJ = network.NJ
+    
+    beta = 1. / (constants.R * T)
+    
+    # Construct accounting matrix
+    indices = -numpy.ones((Nisom,Ngrains,NJ), numpy.int)
+    Nrows = 0
+    for r in range(Ngrains):
+        for s in range(NJ):
+            for i in range(Nisom):
+                if densStates[i,r,s] > 0:
+                    indices[i,r,s] = Nrows
+                    Nrows += 1
+    Nrows += Nreac
+    if products:
+        Nrows += Nprod
+    
+    # The off-diagonal terms are collected in coordinate form; the diagonal
+    # terms are accumulated separately
+    rows = []; cols = []; data = []
+    diagonal = numpy.zeros(Nrows, numpy.float64)
+    
+    # Collision terms
+    for i in range(Nisom):
+        for r in range(Ngrains):
+            for s in range(NJ):
+                if indices[i,r,s] > -1:
+                    diagonal[indices[i,r,s]] += Mcoll[i,r,s,r,s]
+                    for u in range(r, Ngrains):
+                        for v in range(s, NJ):
+                            if indices[i,u,v] == -1 or indices[i,u,v] == indices[i,r,s]:
+                                continue
+                            if Mcoll[i,r,s,u,v] != 0:
+                                rows.append(indices[i,r,s]); cols.append(indices[i,u,v]); data.append(Mcoll[i,r,s,u,v])
+                            if Mcoll[i,u,v,r,s] != 0:
+                                rows.append(indices[i,u,v]); cols.append(indices[i,r,s]); data.append(Mcoll[i,u,v,r,s])
+    
+    # Isomerization terms
+    for i in range(Nisom):
+        for j in range(i):
+            if Kij[i,j,Ngrains-1,0] > 0 or Kij[j,i,Ngrains-1,0] > 0:
+                for r in range(Ngrains):
+                    for s in range(NJ):
+                        u = indices[i,r,s]; v = indices[j,r,s]
+                        if u > -1 and v > -1:
+                            rows.append(v); cols.append(u); data.append(Kij[j,i,r,s])
+                            diagonal[u] -= Kij[j,i,r,s]
+                            rows.append(u); cols.append(v); data.append(Kij[i,j,r,s])
+                            diagonal[v] -= Kij[i,j,r,s]
+    
+    # Association/dissociation terms
+    for i in range(Nisom):
+        for n in range(Nreac+Nprod):
+            if Gnj[n,i,Ngrains-1,0] > 0:
+                for r in range(Ngrains):
+                    for s in range(NJ):
+                        u = indices[i,r,s]
+                        if products: 
+                            v = Nrows - Nreac - Nprod + n
+                        else:
+                            v = Nrows - Nreac + n
+                        if u > -1:
+                            diagonal[u] -= Gnj[n,i,r,s]
+                            if n < Nreac or products:
+                                rows.append(v); cols.append(u); data.append(Gnj[n,i,r,s])
+                            if n < Nreac:
+                                val = Fim[i,n,r,s] * densStates[n+Nisom,r,s] * (2*Jlist[s]+1) * exp(-Elist[r] * beta)
+                                rows.append(u); cols.append(v); data.append(val)
+                                diagonal[v] -= val
+
+    rows.extend(range(Nrows)); cols.extend(range(Nrows)); data.extend(diagonal)
+    M = scipy.sparse.coo_matrix((data, (rows, cols)), shape=(Nrows,Nrows)).tocsr()
+
+    return M, indices
@@ -33,9 +33,11 @@ This module contains the :class:`Network` class, a representation of a
 pressure-dependent unimolecular reaction network
 """
 
+import os
 import math
 import numpy
 import logging
+import collections
 
 import rmgpy.constants as constants
 from rmgpy.reaction import Reaction
@@ -189,7 +191,15 @@ class Network:
         
         self.calculateDensitiesOfStates()
 
-    def calculateRateCoefficients(self, Tlist, Plist, method, errorCheck=True):
+    def calculateRateCoefficients(self, Tlist, Plist, method, errorCheck=True, processes=1):
+        """
+        Calculate the phenomenological rate coefficients :math:`k(T,P)` for the
+        network at the given temperatures `Tlist` in K and pressures `Plist` in
+        Pa using the given `method`. If `processes` is greater than one, the
+        temperatures are divided among a pool of worker processes forked from
+        this process, which share the precomputed densities of states.
+        """
+        global parallelJob
         
         Nisom = len(self.isomers)
         Nreac = len(self.reactants)
@@ -205,58 +215,90 @@ class Network:
         logging.info('Calculating phenomenological rate coefficients for {0}...'.format(self))
         K = numpy.zeros((len(Tlist),len(Plist),Nisom+Nreac+Nprod,Nisom+Nreac+Nprod), numpy.float64)
         
-        for t, T in enumerate(Tlist):
-            for p, P in enumerate(Plist):
-                self.setConditions(T, P)
-                
-                # Apply method
-                if method.lower() == 'modified strong collision':
-                    self.applyModifiedStrongCollisionMethod()
-                elif method.lower() == 'reservoir state':
-                    self.applyReservoirStateMethod()
-                elif method.lower() == 'chemically-significant eigenvalues':
-                    self.applyChemicallySignificantEigenvaluesMethod()
-                else:
-                    raise NetworkError('Unknown method "{0}".'.format(method))
+        if processes > 1 and len(Tlist) > 1 and hasattr(os, 'fork'):
+            import multiprocessing
+            # The last temperature is computed in this process, so that the
+            # network is left in the same state as when computing serially
+            parallelJob = (self, Tlist, Plist, method, errorCheck)
+            pool = multiprocessing.Pool(min(processes, len(Tlist) - 1))
+            try:
+                result = pool.map_async(calculateRateCoefficientsWorker, range(len(Tlist) - 1))
+                K[-1,:,:,:] = self.calculateRateCoefficientsAtTemperature(Tlist[-1], Plist, method, errorCheck)
+                for t, Kt in enumerate(result.get()):
+                    K[t,:,:,:] = Kt
+            finally:
+                pool.close()
+                pool.join()
+                parallelJob = None
+        else:
+            for t, T in enumerate(Tlist):
+                K[t,:,:,:] = self.calculateRateCoefficientsAtTemperature(T, Plist, method, errorCheck)
 
-                K[t,p,:,:] = self.K
-                
-                # Check that the k(T,P) values satisfy macroscopic equilibrium
-                eqRatios = self.eqRatios
-                for i in range(Nisom+Nreac):
+        return K
+
+    def calculateRateCoefficientsAtTemperature(self, T, Plist, method, errorCheck=True):
+        """
+        Return the phenomenological rate coefficients :math:`k(T,P)` for the
+        network at the temperature `T` in K and each of the pressures `Plist`
+        in Pa using the given `method`, as an array indexed by pressure.
+        """
+        Nisom = len(self.isomers)
+        Nreac = len(self.reactants)
+        Nprod = len(self.products)
+        
+        K = numpy.zeros((len(Plist),Nisom+Nreac+Nprod,Nisom+Nreac+Nprod), numpy.float64)
+        
+        for p, P in enumerate(Plist):
+            self.setConditions(T, P)
+            
+            # Apply method
+            if method.lower() == 'modified strong collision':
+                self.applyModifiedStrongCollisionMethod()
+            elif method.lower() == 'reservoir state':
+                self.applyReservoirStateMethod()
+            elif method.lower() == 'chemically-significant eigenvalues':
+                self.applyChemicallySignificantEigenvaluesMethod()
+            else:
+                raise NetworkError('Unknown method "{0}".'.format(method))
+
+            K[p,:,:] = self.K
+            
+            # Check that the k(T,P) values satisfy macroscopic equilibrium
+            eqRatios = self.eqRatios
+            for i in range(Nisom+Nreac):
+                for j in range(i):
+                    Keq0 = K[p,j,i] / K[p,i,j]
+                    Keq = eqRatios[j] / eqRatios[i]
+                    if Keq0 / Keq < 0.5 or Keq0 / Keq > 2.0:
+                        if i < Nisom:
+                            reactants = self.isomers[i]
+                        elif i < Nisom+Nreac:
+                            reactants = self.reactants[i-Nisom]
+                        else:
+                            reactants = self.products[i-Nisom-Nreac]
+                        if j < Nisom:
+                            products = self.isomers[j]
+                        elif j < Nisom+Nreac:
+                            products = self.reactants[j-Nisom]
+                        else:
+                            products = self.products[j-Nisom-Nreac]
+                        reaction = Reaction(reactants=reactants.species[:], products=products.species[:])
+                        logging.error('For net reaction {0!s}:'.format(reaction))
+                        logging.error('Expected Keq({1:g} K, {2:g} bar) = {0:11.3e}'.format(Keq, T, P*1e-5))
+                        logging.error('  Actual Keq({1:g} K, {2:g} bar) = {0:11.3e}'.format(Keq0, T, P*1e-5))
+                        raise NetworkError('Computed k(T,P) values for reaction {0!s} do not satisfy macroscopic equilibrium.'.format(reaction))
+                        
+            # Reject if any rate coefficients are negative
+            if errorCheck:
+                negativeRate = False
+                for i in range(Nisom+Nreac+Nprod):
                     for j in range(i):
-                        Keq0 = K[t,p,j,i] / K[t,p,i,j]
-                        Keq = eqRatios[j] / eqRatios[i]
-                        if Keq0 / Keq < 0.5 or Keq0 / Keq > 2.0:
-                            if i < Nisom:
-                                reactants = self.isomers[i]
-                            elif i < Nisom+Nreac:
-                                reactants = self.reactants[i-Nisom]
-                            else:
-                                reactants = self.products[i-Nisom-Nreac]
-                            if j < Nisom:
-                                products = self.isomers[j]
-                            elif j < Nisom+Nreac:
-                                products = self.reactants[j-Nisom]
-                            else:
-                                products = self.products[j-Nisom-Nreac]
-                            reaction = Reaction(reactants=reactants.species[:], products=products.species[:])
-                            logging.error('For net reaction {0!s}:'.format(reaction))
-                            logging.error('Expected Keq({1:g} K, {2:g} bar) = {0:11.3e}'.format(Keq, T, P*1e-5))
-                            logging.error('  Actual Keq({1:g} K, {2:g} bar) = {0:11.3e}'.format(Keq0, T, P*1e-5))
-                            raise NetworkError('Computed k(T,P) values for reaction {0!s} do not satisfy macroscopic equilibrium.'.format(reaction))
-                            
-                # Reject if any rate coefficients are negative
-                if errorCheck:
-                    negativeRate = False
-                    for i in range(Nisom+Nreac+Nprod):
-                        for j in range(i):
-                            if (K[t,p,i,j] < 0 or K[t,p,j,i] < 0) and not negativeRate:
-                                negativeRate = True
-                                logging.error('Negative rate coefficient generated; rejecting result.')
-                                logging.info(K[t,p,0:Nisom+Nreac+Nprod,0:Nisom+Nreac])
-                                K[t,p,:,:] = 0 * K[t,p,:,:]
-                                self.K = 0 * self.K
+                        if (K[p,i,j] < 0 or K[p,j,i] < 0) and not negativeRate:
+                            negativeRate = True
+                            logging.error('Negative rate coefficient generated; rejecting result.')
+                            logging.info(K[p,0:Nisom+Nreac+Nprod,0:Nisom+Nreac])
+                            K[p,:,:] = 0 * K[p,:,:]
+                            self.K = 0 * self.K
 
         return K
 
@@ -440,6 +482,11 @@ class Network:
         Emax0 = numpy.max(Elist0)
         
         Elist = self.__getEnergyGrains(Emin0, Emax0, grainSize0, grainCount0)
+        if self.rmgmode:
+            # The grain size chosen from a number of grains differs for each
+            # network, so round it down to a value that other networks will
+            # also use, so that they can share cached densities of states
+            Elist = self.__getEnergyGrains(Emin0, Emax0, getSharedGrainSize(Elist[1] - Elist[0]), 0)
         Ngrains = len(Elist)
         dE = Elist[1] - Elist[0]
         logging.info('Using {0:d} grains from {1:.2f} to {2:.2f} kJ/mol in steps of {3:.2f} kJ/mol to compute densities of states'.format(
@@ -453,13 +500,13 @@ class Network:
         # Densities of states for isomers
         for i in range(Nisom):
             logging.debug('Calculating density of states for isomer "{0}"'.format(self.isomers[i]))
-            self.isomers[i].calculateDensityOfStates(Elist, activeKRotor=self.activeKRotor, activeJRotor=self.activeJRotor, rmgmode=self.rmgmode)
+            densityOfStatesCache.calculateDensityOfStates(self.isomers[i], Elist, activeKRotor=self.activeKRotor, activeJRotor=self.activeJRotor, rmgmode=self.rmgmode)
         
         # Densities of states for reactant channels
         for n in range(Nreac):
             if self.reactants[n].hasStatMech():
                 logging.debug('Calculating density of states for reactant channel "{0}"'.format(self.reactants[n]))
-                self.reactants[n].calculateDensityOfStates(Elist, activeKRotor=self.activeKRotor, activeJRotor=self.activeJRotor, rmgmode=self.rmgmode)
+                densityOfStatesCache.calculateDensityOfStates(self.reactants[n], Elist, activeKRotor=self.activeKRotor, activeJRotor=self.activeJRotor, rmgmode=self.rmgmode)
             else:
                 logging.debug('NOT calculating density of states for reactant channel "{0}"'.format(self.reactants[n]))
             
@@ -468,7 +515,7 @@ class Network:
             for n in range(Nprod):
                 if self.products[n].hasStatMech():
                     logging.debug('Calculating density of states for product channel "{0}"'.format(self.products[n]))
-                    self.products[n].calculateDensityOfStates(Elist, activeKRotor=self.activeKRotor, activeJRotor=self.activeJRotor, rmgmode=self.rmgmode)
+                    densityOfStatesCache.calculateDensityOfStates(self.products[n], Elist, activeKRotor=self.activeKRotor, activeJRotor=self.activeJRotor, rmgmode=self.rmgmode)
                 else:
                     logging.debug('NOT calculating density of states for product channel "{0}"'.format(self.products[n]))
 
@@ -952,3 +999,198 @@ class Network:
             logging.log(level, '    {0:<48s} {1:12g} kJ/mol'.format(rxn, float(rxn.transitionState.conformer.E0.value_si*0.001)))
         logging.log(level, '========================================================================')
         logging.log(level, '')
+
+################################################################################
+
+class DensityOfStatesCache:
+    """
+    An in-memory cache of the densities and sums of states of configurations,
+    so that they need not be recomputed when the same species appear in
+    several networks or when a network is updated again. Each entry is keyed
+    by the labels of the species in the configuration, the parameters of its
+    active modes, the method of calculation, and the energy grain size, and
+    holds the states computed on energy grains starting from zero. The
+    attributes are:
+
+    =================== ========================================================
+    Attribute           Description
+    =================== ========================================================
+    `entries`           An ordered dictionary of the cached densities and sums of states, least recently used first
+    `maximumMemory`     The maximum total size in bytes of the cached arrays
+    `memory`            The current total size in bytes of the cached arrays
+    `growthFactor`      The factor by which to lengthen an entry that is too short
+    `modified`          The set of keys of the entries stored since :meth:`resetModified()` was last called
+    =================== ========================================================
+
+    Since the direct count and steepest descents algorithms compute the states
+    at each grain from those at lower energies only, a request for fewer
+    grains than are cached is served from the start of the cached arrays.
+    When a request needs more grains than are cached, the entry is recomputed
+    with at least `growthFactor` times as many grains, so that a network
+    whose maximum energy creeps up over successive updates recomputes its
+    states only occasionally.
+
+    Entries are only shared between requests with the same grain size. In RMG
+    mode, :meth:`Network.calculateDensitiesOfStates()` rounds the grain size
+    of each network down using :func:`getSharedGrainSize()` so that this is
+    usually the case; otherwise, networks whose grain size is set by their
+    number of grains will rarely share entries.
+    """
+
+    def __init__(self, maximumMemory=256*1024*1024, growthFactor=1.5):
+        self.entries = collections.OrderedDict()
+        self.maximumMemory = maximumMemory
+        self.memory = 0
+        self.growthFactor = growthFactor
+        self.modified = set()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        self.entries.clear()
+        self.memory = 0
+        self.modified.clear()
+
+    def getKey(self, configuration, grainSize, activeJRotor=True, activeKRotor=True, rmgmode=False):
+        """
+        Return the key of the densities and sums of states of the given
+        `configuration` computed with energy grains of size `grainSize` in
+        J/mol and the given options.
+        """
+        modes = configuration.getActiveModes(activeJRotor=activeJRotor, activeKRotor=activeKRotor, rmgmode=rmgmode)
+        degeneracy = 1
+        for spec in configuration.species:
+            degeneracy *= spec.conformer.spinMultiplicity * spec.conformer.opticalIsomers
+        return (
+            tuple([spec.label for spec in configuration.species]),
+            tuple([repr(mode) for mode in modes]),
+            degeneracy,
+            bool(rmgmode),
+            round(grainSize, 6),
+        )
+
+    def __getEntryMemory(self, entry):
+        """
+        Return the size in bytes of the arrays of the cache `entry`.
+        """
+        Ngrains, densStates, sumStates = entry
+        return (densStates.nbytes if densStates is not None else 0) + (sumStates.nbytes if sumStates is not None else 0)
+
+    def __pop(self, key):
+        """
+        Remove and return the entry with the given `key`, or ``None`` if there
+        is no such entry.
+        """
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.memory -= self.__getEntryMemory(entry)
+        return entry
+
+    def __store(self, key, entry):
+        """
+        Store the `entry` with the given `key` as the most recently used, then
+        remove the least recently used entries until the cached arrays fit in
+        `maximumMemory` (always keeping the new entry).
+        """
+        self.entries[key] = entry
+        self.memory += self.__getEntryMemory(entry)
+        while self.memory > self.maximumMemory and len(self.entries) > 1:
+            oldKey = next(iter(self.entries))
+            self.__pop(oldKey)
+            self.modified.discard(oldKey)
+
+    def calculateDensityOfStates(self, configuration, Elist, activeJRotor=True, activeKRotor=True, rmgmode=False):
+        """
+        Set the density and sum of states of the given `configuration` at the
+        energies `Elist` in J/mol, as by
+        :meth:`Configuration.calculateDensityOfStates()`, using the cached
+        values if possible. The energies must be evenly spaced and start from
+        zero for the cache to be used.
+        """
+        Ngrains = len(Elist)
+        if Ngrains < 4 or Elist[0] != 0:
+            configuration.calculateDensityOfStates(Elist, activeJRotor=activeJRotor, activeKRotor=activeKRotor, rmgmode=rmgmode)
+            return
+        grainSize = Elist[1] - Elist[0]
+
+        key = self.getKey(configuration, grainSize, activeJRotor, activeKRotor, rmgmode)
+        entry = self.__pop(key)
+        if entry is None or entry[0] < Ngrains:
+            if entry is not None:
+                Ngrains0 = max(Ngrains, int(math.ceil(self.growthFactor * entry[0])))
+            else:
+                Ngrains0 = Ngrains
+            Elist0 = numpy.arange(Ngrains0, dtype=numpy.float64) * grainSize
+            configuration.calculateDensityOfStates(Elist0, activeJRotor=activeJRotor, activeKRotor=activeKRotor, rmgmode=rmgmode)
+            entry = (Ngrains0, configuration.densStates, configuration.sumStates)
+            self.modified.add(key)
+        self.__store(key, entry)
+
+        Ngrains0, densStates, sumStates = entry
+        configuration.Elist = Elist
+        configuration.activeJRotor = activeJRotor
+        configuration.activeKRotor = activeKRotor
+        configuration.densStates = densStates[:Ngrains].copy() if densStates is not None else None
+        configuration.sumStates = sumStates[:Ngrains].copy() if sumStates is not None else None
+
+    def resetModified(self):
+        """
+        Forget which entries have been stored, so that :meth:`getModified()`
+        returns only those stored after this call.
+        """
+        self.modified.clear()
+
+    def getModified(self):
+        """
+        Return a dictionary of the entries stored since :meth:`resetModified()`
+        was last called, e.g. to send the densities of states computed in a
+        worker process back to the parent process.
+        """
+        return dict([(key, self.entries[key]) for key in self.modified])
+
+    def merge(self, entries):
+        """
+        Add the dictionary of `entries` returned by :meth:`getModified()` to
+        the cache, keeping the longer of the new and any existing entry for
+        each key.
+        """
+        for key, entry in entries.items():
+            oldEntry = self.__pop(key)
+            if oldEntry is not None and oldEntry[0] >= entry[0]:
+                entry = oldEntry
+            self.__store(key, entry)
+        # The merged entries are not counted as modified in this process
+        self.modified.intersection_update(self.entries)
+
+def getSharedGrainSize(grainSize):
+    """
+    Return the largest energy grain size in J/mol that is no larger than
+    `grainSize` and is of the form :math:`2^{k/16}` J/mol for an integer
+    :math:`k`. Using these grain sizes makes the grains of different networks
+    at most about 4% finer than requested, but lets them share cached
+    densities of states.
+    """
+    return 2.0 ** (math.floor(16 * math.log(grainSize, 2) + 1e-9) / 16.)
+
+# The cache of densities of states shared by all networks in this process
+densityOfStatesCache = DensityOfStatesCache()
+
+################################################################################
+
+# The network and arguments of the current call to
+# Network.calculateRateCoefficients() using multiple processes; stored at the
+# module level so that forked worker processes inherit them without pickling
+parallelJob = None
+
+def calculateRateCoefficientsWorker(t):
+    """
+    Return the phenomenological rate coefficients for the network of the job
+    stored in `parallelJob` at the temperature with index `t`, for use in the
+    worker processes forked by :meth:`Network.calculateRateCoefficients()`.
+    """
+    network, Tlist, Plist, method, errorCheck = parallelJob
+    return network.calculateRateCoefficientsAtTemperature(Tlist[t], Plist, method, errorCheck)
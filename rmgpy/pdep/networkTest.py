@@ -36,7 +36,7 @@ import unittest
 import math
 import numpy
 
-from rmgpy.pdep.network import Network
+from rmgpy.pdep.network import Network, DensityOfStatesCache, getSharedGrainSize
 from rmgpy.pdep.configuration import Configuration
 from rmgpy.statmech import *
 from rmgpy.species import Species, TransitionState
@@ -197,6 +197,151 @@ class TestNetwork(unittest.TestCase):
         """
         self.network.initialize(Tmin=300., Tmax=2000., Pmin=1e3, Pmax=1e7, minimumGrainCount=200, maximumGrainSize=4184.0)
     
+    def test_calculateRateCoefficientsInParallel(self):
+        """
+        Test that calculating the :math:`k(T,P)` values of the network using
+        several processes gives the same values as calculating them serially.
+        """
+        Tlist = [400., 700., 1000., 1300.]
+        Plist = [1e4, 1e5, 1e6]
+        self.network.initialize(Tmin=300., Tmax=2000., Pmin=1e3, Pmax=1e7, minimumGrainCount=200, maximumGrainSize=4184.0)
+        for method in ['modified strong collision', 'reservoir state']:
+            Kserial = self.network.calculateRateCoefficients(Tlist, Plist, method)
+            Kparallel = self.network.calculateRateCoefficients(Tlist, Plist, method, processes=2)
+            self.assertEqual(Kserial.shape, Kparallel.shape)
+            self.assertTrue(numpy.any(Kserial > 0))
+            self.assertTrue(numpy.allclose(Kparallel, Kserial, rtol=1e-10, atol=0))
+            # The network is left at the last conditions, as when serial
+            self.assertEqual(self.network.T, Tlist[-1])
+            self.assertEqual(self.network.P, Plist[-1])
+    
+    def test_densityOfStatesCache(self):
+        """
+        Test that the DensityOfStatesCache class reuses and extends the cached
+        densities of states.
+        """
+        cache = DensityOfStatesCache(growthFactor=1.5)
+        configuration = self.network.isomers[0]
+        Elist = numpy.arange(0, 300000., 1000.)
+        configuration.calculateDensityOfStates(Elist, rmgmode=True)
+        densStates = configuration.densStates
+        
+        cache.calculateDensityOfStates(configuration, Elist[:100], rmgmode=True)
+        self.assertEqual(1, len(cache))
+        self.assertEqual(100, len(configuration.densStates))
+        self.assertEqual(1, len(cache.getModified()))
+        cache.resetModified()
+        
+        # Fewer grains are served from the cache
+        cache.calculateDensityOfStates(configuration, Elist[:80], rmgmode=True)
+        self.assertEqual(0, len(cache.getModified()))
+        self.assertEqual(80, len(configuration.densStates))
+        for r in range(80):
+            if densStates[r] == 0:
+                self.assertEqual(configuration.densStates[r], 0.0)
+            else:
+                self.assertAlmostEqual(configuration.densStates[r] / densStates[r], 1.0, 6)
+        
+        # More grains extend the cached entry by at least the growth factor
+        cache.calculateDensityOfStates(configuration, Elist[:120], rmgmode=True)
+        self.assertEqual(1, len(cache))
+        self.assertEqual(1, len(cache.getModified()))
+        self.assertEqual(150, cache.entries.values()[0][0])
+        self.assertEqual(120, len(configuration.densStates))
+        for r in range(120):
+            if densStates[r] == 0:
+                self.assertEqual(configuration.densStates[r], 0.0)
+            else:
+                self.assertAlmostEqual(configuration.densStates[r] / densStates[r], 1.0, 6)
+        
+        # Different grain sizes are cached separately
+        cache.calculateDensityOfStates(configuration, Elist[:100:2], rmgmode=True)
+        self.assertEqual(2, len(cache))
+    
+    def test_densityOfStatesCacheMemory(self):
+        """
+        Test that the DensityOfStatesCache class keeps the cached arrays within
+        its maximum memory by removing the least recently used entries.
+        """
+        configuration = self.network.isomers[0]
+        Elist = numpy.arange(0, 300000., 1000.)
+        cache = DensityOfStatesCache(maximumMemory=1000000)
+        cache.calculateDensityOfStates(configuration, Elist[:100], rmgmode=True)
+        entryMemory = cache.memory
+        self.assertTrue(entryMemory >= 100 * 8)
+        
+        cache = DensityOfStatesCache(maximumMemory=int(2.5 * entryMemory))
+        cache.calculateDensityOfStates(configuration, Elist[:100], rmgmode=True)
+        cache.calculateDensityOfStates(configuration, Elist[:200:2], rmgmode=True)
+        cache.calculateDensityOfStates(configuration, Elist[:100], rmgmode=True)
+        self.assertEqual(2, len(cache))
+        self.assertEqual(2 * entryMemory, cache.memory)
+        
+        # The least recently used entry is removed to make room
+        cache.calculateDensityOfStates(configuration, Elist[:300:3], rmgmode=True)
+        self.assertEqual(2, len(cache))
+        self.assertEqual(2 * entryMemory, cache.memory)
+        self.assertEqual([1000., 3000.], [key[-1] for key in cache.entries])
+        
+        cache.clear()
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.memory)
+    
+    def test_getSharedGrainSize(self):
+        """
+        Test that the grain sizes used to share cached densities of states are
+        no larger than and close to the requested grain sizes.
+        """
+        for grainSize in [1.0, 123.4, 1000.0, 4184.0, 4321.5, 8368.0]:
+            sharedGrainSize = getSharedGrainSize(grainSize)
+            self.assertTrue(sharedGrainSize <= grainSize * (1 + 1e-9))
+            self.assertTrue(sharedGrainSize > grainSize / 2**(1./16) * (1 - 1e-9))
+            self.assertEqual(sharedGrainSize, getSharedGrainSize(sharedGrainSize))
+        self.assertEqual(getSharedGrainSize(4300.0), getSharedGrainSize(4310.0))
+
+    def test_generateSparseMEMatrix(self):
+        """
+        Test that the sparse master equation matrix has the same entries as
+        the full master equation matrix.
+        """
+        import rmgpy.pdep.me as me
+        self.network.initialize(Tmin=300., Tmax=2000., Pmin=1e3, Pmax=1e7, minimumGrainCount=200, maximumGrainSize=4184.0)
+        self.network.setConditions(1000., 1e5)
+        for products in [True, False]:
+            M, indices = me.generateFullMEMatrix(self.network, products=products)
+            Msparse, indicesSparse = me.generateSparseMEMatrix(self.network, products=products)
+            self.assertTrue(numpy.all(indices == indicesSparse))
+            self.assertEqual(M.shape, Msparse.shape)
+            Mscale = numpy.max(numpy.abs(M))
+            self.assertTrue(numpy.allclose(Msparse.toarray(), M, rtol=1e-10, atol=1e-12*Mscale))
+    
+    def test_chemicallySignificantEigenvaluesSparse(self):
+        """
+        Test that the chemically-significant eigenvalues method gives the same
+        :math:`k(T,P)` values when using a sparse master equation matrix as
+        when using a dense one.
+        """
+        import rmgpy.pdep.cse as cse
+        Tlist = [500., 1000., 1500.]
+        Plist = [1e4, 1e5, 1e6]
+        self.network.initialize(Tmin=300., Tmax=2000., Pmin=1e3, Pmax=1e7, minimumGrainCount=200, maximumGrainSize=4184.0)
+        Kdense = self.network.calculateRateCoefficients(Tlist, Plist, 'chemically-significant eigenvalues')
+        sparseMatrixRows = cse.SPARSE_MATRIX_ROWS
+        cse.SPARSE_MATRIX_ROWS = 10
+        try:
+            Ksparse = self.network.calculateRateCoefficients(Tlist, Plist, 'chemically-significant eigenvalues')
+        finally:
+            cse.SPARSE_MATRIX_ROWS = sparseMatrixRows
+        self.assertTrue(numpy.any(Kdense > 0))
+        for t in range(len(Tlist)):
+            for p in range(len(Plist)):
+                for i in range(Kdense.shape[2]):
+                    for j in range(Kdense.shape[3]):
+                        if Kdense[t,p,i,j] == 0:
+                            self.assertEqual(Ksparse[t,p,i,j], 0.0)
+                        else:
+                            self.assertAlmostEqual(Ksparse[t,p,i,j] / Kdense[t,p,i,j], 1.0, 4)
+    
 ################################################################################
 
 if __name__ == '__main__':
@@ -123,9 +123,10 @@ def simpleReactor(temperature, pressure, initialMoleFractions, terminationConver
     system = SimpleReactor(T, P, initialMoleFractions, termination)
     rmg.reactionSystems.append(system)
 
-def simulator(atol, rtol):
+def simulator(atol, rtol, sparse=False):
     rmg.absoluteTolerance = atol
     rmg.relativeTolerance = rtol
+    rmg.sparseJacobian = sparse
 
 def model(toleranceMoveToCore, toleranceKeepInEdge=0.0, toleranceInterruptSimulation=1.0, maximumEdgeSpecies=None):
     rmg.fluxToleranceKeepInEdge = toleranceKeepInEdge
@@ -171,13 +172,16 @@ def pressureDependence(method, temperatures, pressures, maximumGrainSize=0.0, mi
     rmg.pressureDependence.activeKRotor = True
     rmg.pressureDependence.rmgmode = True
 
-def options(units='si', saveRestartPeriod=None, drawMolecules=False, generatePlots=False, saveConcentrationProfiles=False, verboseComments=False):
+def options(units='si', saveRestartPeriod=None, drawMolecules=False, generatePlots=False, saveConcentrationProfiles=False, verboseComments=False, thermoCache=False, thermoCacheSize=100000, databaseSnapshot=False):
     rmg.units = units
     rmg.saveRestartPeriod = Quantity(saveRestartPeriod) if saveRestartPeriod else None
     rmg.drawMolecules = drawMolecules
     rmg.generatePlots = generatePlots
     rmg.saveConcentrationProfiles = saveConcentrationProfiles
     rmg.verboseComments = verboseComments
+    rmg.thermoCache = thermoCache
+    rmg.thermoCacheSize = thermoCacheSize
+    rmg.databaseSnapshot = databaseSnapshot
 
 def generatedSpeciesConstraints(**kwargs):
     validConstraints = [
@@ -255,6 +259,7 @@ def readInputFile(path, rmg0):
         for label, moleFrac in reactionSystem.initialMoleFractions.iteritems():
             initialMoleFractions[speciesDict[label]] = moleFrac
         reactionSystem.initialMoleFractions = initialMoleFractions
+        reactionSystem.sparse = rmg.sparseJacobian
 
     logging.info('')
 
@@ -322,6 +327,7 @@ def saveInputFile(path, rmg):
     f.write('simulator(\n')
     f.write('    atol = {0:g},\n'.format(rmg.absoluteTolerance))
     f.write('    rtol = {0:g},\n'.format(rmg.relativeTolerance))
+    f.write('    sparse = {0},\n'.format(rmg.sparseJacobian))
     f.write(')\n\n')
 
     # Model
@@ -364,6 +370,9 @@ def saveInputFile(path, rmg):
     f.write('    generatePlots = {0},\n'.format(rmg.generatePlots))
     f.write('    saveConcentrationProfiles = {0},\n'.format(rmg.saveConcentrationProfiles))
     f.write('    verboseComments = {0},\n'.format(rmg.verboseComments))
+    f.write('    thermoCache = {0},\n'.format(rmg.thermoCache))
+    f.write('    thermoCacheSize = {0:d},\n'.format(rmg.thermoCacheSize))
+    f.write('    databaseSnapshot = {0},\n'.format(rmg.databaseSnapshot))
     f.write(')\n\n')
         
     f.close()
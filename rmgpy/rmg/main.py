@@ -48,11 +48,12 @@ except ImportError:
 from rmgpy.molecule import Molecule
 from rmgpy.solver.base import TerminationTime, TerminationConversion
 from rmgpy.solver.simple import SimpleReactor
-from rmgpy.data.rmg import RMGDatabase
-from rmgpy.data.kinetics import KineticsLibrary, KineticsFamily, LibraryReaction, TemplateReaction
+from rmgpy.data.rmg import RMGDatabase, getDatabaseSourceHash, loadDatabaseSnapshot, saveDatabaseSnapshot
 
 from model import Species, CoreEdgeReactionModel
 from pdep import PDepNetwork
+from thermocache import ThermoCache, getThermoDatabaseHash
+from restart import RestartFile
 
 ################################################################################
 
@@ -82,6 +83,7 @@ class RMG:
     --------------------------- ------------------------------------------------
     `absoluteTolerance`         The absolute tolerance used in the ODE/DAE solver
     `relativeTolerance`         The relative tolerance used in the ODE/DAE solver
+    `sparseJacobian`            ``True`` to use sparse linear algebra for the reaction system Jacobians, ``False`` otherwise
     `fluxToleranceKeepInEdge`   The relative species flux below which species are discarded from the edge
     `fluxToleranceMoveToCore`   The relative species flux above which species are moved from the edge to the core
     `fluxToleranceInterrupt`    The relative species flux above which the simulation will halt
@@ -93,15 +95,22 @@ class RMG:
     `verbosity`                 The level of logging verbosity for console output
     `loadRestart`               ``True`` if restarting a previous job, ``False`` otherwise
     `saveRestartPeriod`         The time period to periodically save a restart file (:class:`Quantity`), or ``None`` for never.
+    `restartFile`               The :class:`RestartFile` last saved or loaded, or ``None`` if not yet used
     `units`                     The unit system to use to save output files (currently must be 'si')
     `drawMolecules`             ``True`` to draw pictures of the species in the core, ``False`` otherwise
     `generatePlots`             ``True`` to generate plots of the job execution statistics after each iteration, ``False`` otherwise
     `verboseComments`           ``True`` to keep the verbose comments for database estimates, ``False`` otherwise
+    `thermoCache`               ``True`` to store species thermo data in a persistent cache in the scratch directory, ``False`` otherwise
+    `thermoCacheSize`           The maximum number of species to keep in the thermo cache
+    `databaseSnapshot`          ``True`` to reuse a snapshot of the loaded database saved in the scratch directory, ``False`` otherwise
     `pressureDependence`        Whether to process unimolecular (pressure-dependent) reaction networks
     `wallTime`                  The maximum amount of CPU time in seconds to expend on this job; used to stop gracefully so we can still get profiling information
+    `processes`                 The maximum number of processes to use when simulating reaction systems, generating reactions, and updating pressure-dependent networks
     --------------------------- ------------------------------------------------
     `initializationTime`        The time at which the job was initiated, in seconds since the epoch (i.e. from time.time())
     `done`                      Whether the job has completed (there is nothing new to add)
+    `outputProcess`             The background process writing the output HTML and Chemkin files, or ``None`` if not started
+    `outputPending`             ``True`` if the output files need to be written again once the background process finishes, ``False`` otherwise
     =========================== ================================================
     
     """
@@ -135,6 +144,7 @@ class RMG:
         self.fluxToleranceInterrupt = 1.0
         self.absoluteTolerance = 1.0e-8
         self.relativeTolerance = 1.0e-4
+        self.sparseJacobian = False
         self.maximumEdgeSpecies = 1000000
         self.termination = []
         
@@ -142,15 +152,22 @@ class RMG:
         self.verbosity = logging.INFO
         self.loadRestart = None
         self.saveRestartPeriod = None
+        self.restartFile = None
         self.units = 'si'
         self.drawMolecules = None
         self.generatePlots = None
         self.saveConcentrationProfiles = None
         self.verboseComments = None
+        self.thermoCache = False
+        self.thermoCacheSize = 100000
+        self.databaseSnapshot = False
         self.pressureDependence = None
         self.reactionGenerationOptions = {}
         self.wallTime = 0
+        self.processes = 1
         self.initializationTime = 0
+        self.outputProcess = None
+        self.outputPending = False
     
     def loadInput(self, path=None):
         """
@@ -170,6 +187,7 @@ class RMG:
             self.reactionModel.pressureDependence = self.pressureDependence
         self.reactionModel.reactionGenerationOptions = self.reactionGenerationOptions
         self.reactionModel.verboseComments = self.verboseComments
+        self.reactionModel.processes = self.processes
         
     def checkInput(self):
         """
@@ -195,9 +213,7 @@ class RMG:
         
     def loadDatabase(self):
         
-        self.database = RMGDatabase()
-        self.database.load(
-            path = self.databaseDirectory,
+        arguments = dict(
             thermoLibraries = self.thermoLibraries,
             reactionLibraries = [library for library, option in self.reactionLibraries],
             seedMechanisms = self.seedMechanisms,
@@ -206,6 +222,19 @@ class RMG:
             #frequenciesLibraries = self.statmechLibraries,
             depository = False, # Don't bother loading the depository information, as we don't use it
         )
+        
+        if self.databaseSnapshot:
+            # The snapshot is only reused if it was saved from the same
+            # database files, loaded the same way
+            snapshotPath = os.path.join(self.scratchDirectory, 'database.pkl')
+            sourceHash = getDatabaseSourceHash(self.databaseDirectory, sorted(arguments.items()) + [('kineticsEstimator', self.kineticsEstimator)])
+            self.database = loadDatabaseSnapshot(snapshotPath, sourceHash)
+            if self.database is not None:
+                logging.info('Loaded database snapshot from {0}'.format(snapshotPath))
+                return
+        
+        self.database = RMGDatabase()
+        self.database.load(path=self.databaseDirectory, **arguments)
         if self.kineticsEstimator == 'rate rules':
             logging.info('Adding rate rules from training set in kinetics families...')
             for family in self.database.kinetics.families.values():
@@ -213,7 +242,21 @@ class RMG:
             logging.info('Filling in rate rules in kinetics families by averaging...')
             for family in self.database.kinetics.families.values():
                 family.fillKineticsRulesByAveragingUp()
+        
+        if self.databaseSnapshot:
+            logging.info('Saving database snapshot to {0}...'.format(snapshotPath))
+            saveDatabaseSnapshot(snapshotPath, sourceHash)
     
+    def openThermoCache(self):
+        """
+        Open the persistent cache of species thermo data in the scratch
+        directory. Only thermo data generated using the same thermo database
+        as the one currently loaded will be taken from the cache.
+        """
+        path = os.path.join(self.scratchDirectory, 'thermo.sqlite')
+        logging.info('Using thermo cache at {0}...'.format(path))
+        return ThermoCache(path, getThermoDatabaseHash(self.database.thermo), maximumSize=self.thermoCacheSize)
+
     def initialize(self, args):
         """
         Initialize an RMG job using the command-line arguments `args` as returned
@@ -233,6 +276,9 @@ class RMG:
         self.outputDirectory = args.output_directory
         self.scratchDirectory = args.scratch_directory
         
+        # Set the number of processes to use
+        self.processes = args.processes
+        
         if args.restart:
             if not os.path.exists(os.path.join(self.outputDirectory,'restart.pkl')):
                 logging.error("Could not find restart file (restart.pkl). Please run without --restart option.")
@@ -267,6 +313,10 @@ class RMG:
         
         # Load databases
         self.loadDatabase()
+        
+        # Open the persistent thermo cache if desired
+        if self.thermoCache:
+            self.reactionModel.thermoCache = self.openThermoCache()
     
         # Set wall time
         if args.walltime == '0': 
@@ -308,7 +358,7 @@ class RMG:
             self.reactionModel.enlarge([spec for spec in self.initialSpecies if not spec.reactive])
             # Then add remaining reactive species
             for spec in self.initialSpecies:
-                spec.generateThermoData(self.database)
+                spec.generateThermoData(self.database, thermoCache=self.reactionModel.thermoCache)
             self.reactionModel.enlarge([spec for spec in self.initialSpecies if spec.reactive])
             
             # Save a restart file if desired
@@ -344,33 +394,26 @@ class RMG:
             self.done = True
             objectsToEnlarge = []
             allTerminated = True
-            for index, reactionSystem in enumerate(self.reactionSystems):
-    
-                if self.saveConcentrationProfiles:
-                    worksheet = workbook.add_sheet('#{0:d}'.format(index+1))
-                else:
-                    worksheet = None
-                
-                # Conduct simulation
-                pdepNetworks = []
-                for source, networks in self.reactionModel.networkDict.items():
-                    pdepNetworks.extend(networks)
-                logging.info('Conducting simulation of reaction system %s...' % (index+1))
-                terminated, obj = reactionSystem.simulate(
-                    coreSpecies = self.reactionModel.core.species,
-                    coreReactions = self.reactionModel.core.reactions,
-                    edgeSpecies = self.reactionModel.edge.species,
-                    edgeReactions = self.reactionModel.edge.reactions,
-                    toleranceKeepInEdge = self.fluxToleranceKeepInEdge,
-                    toleranceMoveToCore = self.fluxToleranceMoveToCore,
-                    toleranceInterruptSimulation = self.fluxToleranceInterrupt,
-                    pdepNetworks = pdepNetworks,
-                    worksheet = worksheet,
-                    absoluteTolerance = self.absoluteTolerance,
-                    relativeTolerance = self.relativeTolerance,
-                )
+            
+            pdepNetworks = []
+            for source, networks in self.reactionModel.networkDict.items():
+                pdepNetworks.extend(networks)
+            
+            if self.processes > 1 and len(self.reactionSystems) > 1 and not self.saveConcentrationProfiles:
+                # Conduct all simulations concurrently
+                results = self.simulateReactionSystemsInParallel(pdepNetworks)
+            else:
+                results = []
+                for index, reactionSystem in enumerate(self.reactionSystems):
+                    if self.saveConcentrationProfiles:
+                        worksheet = workbook.add_sheet('#{0:d}'.format(index+1))
+                    else:
+                        worksheet = None
+                    # Conduct simulation
+                    results.append(self.simulateReactionSystem(index, pdepNetworks, worksheet))
+            
+            for reactionSystem, (terminated, obj) in zip(self.reactionSystems, results):
                 allTerminated = allTerminated and terminated
-                logging.info('')
                 
                 # If simulation is invalid, note which species should be added to
                 # the core
@@ -424,8 +467,8 @@ class RMG:
                 logging.info('    Memory used: %.2f MB' % (memoryUse[-1]))
             except ImportError:
                 memoryUse.append(0.0)
-            if os.path.exists(os.path.join(self.outputDirectory,'restart.pkl.gz')):
-                restartSize.append(os.path.getsize(os.path.join(self.outputDirectory,'restart.pkl.gz')) / 1.0e6)
+            if os.path.exists(os.path.join(self.outputDirectory,'restart.pkl')):
+                restartSize.append(os.path.getsize(os.path.join(self.outputDirectory,'restart.pkl')) / 1.0e6)
                 logging.info('    Restart file size: %.2f MB' % (restartSize[-1]))
             else:
                 restartSize.append(0.0)
@@ -449,6 +492,7 @@ class RMG:
                     coreSpec, coreReac, edgeSpec, edgeReac = self.reactionModel.getModelSize()
                     logging.info('The current model core has %s species and %s reactions' % (coreSpec, coreReac))
                     logging.info('The current model edge has %s species and %s reactions' % (edgeSpec, edgeReac))
+                    self.flushOutputFiles()
                     return
     
         # Write output file
@@ -461,6 +505,80 @@ class RMG:
         
         self.finish()
         
+    def simulateReactionSystem(self, index, pdepNetworks, worksheet=None):
+        """
+        Simulate the reaction system at position `index` in the list of
+        reaction systems using the current model core and edge and the list
+        of `pdepNetworks`. Returns a flag indicating whether the termination
+        criteria were reached and the object that caused the model to become
+        invalid (or ``None`` if the model remained valid).
+        """
+        reactionSystem = self.reactionSystems[index]
+        logging.info('Conducting simulation of reaction system %s...' % (index+1))
+        terminated, obj = reactionSystem.simulate(
+            coreSpecies = self.reactionModel.core.species,
+            coreReactions = self.reactionModel.core.reactions,
+            edgeSpecies = self.reactionModel.edge.species,
+            edgeReactions = self.reactionModel.edge.reactions,
+            toleranceKeepInEdge = self.fluxToleranceKeepInEdge,
+            toleranceMoveToCore = self.fluxToleranceMoveToCore,
+            toleranceInterruptSimulation = self.fluxToleranceInterrupt,
+            pdepNetworks = pdepNetworks,
+            worksheet = worksheet,
+            absoluteTolerance = self.absoluteTolerance,
+            relativeTolerance = self.relativeTolerance,
+        )
+        logging.info('')
+        return terminated, obj
+    
+    def simulateReactionSystemsInParallel(self, pdepNetworks):
+        """
+        Simulate all of the reaction systems concurrently using a pool of up
+        to `processes` worker processes. The workers are forked from this
+        process, so each one simulates its own copy of the current model; only
+        the maximum rate arrays, the position of the invalid object (if any)
+        and the rate coefficients cached by the reaction system (if any) are
+        sent back. This process therefore remains the only one that
+        modifies the reaction model. Returns a list of the ``(terminated, obj)``
+        results for each reaction system, in order.
+        """
+        global parallelJob
+        
+        if not hasattr(os, 'fork'):
+            logging.warning('Parallel simulation requires os.fork(); simulating reaction systems serially.')
+            return [self.simulateReactionSystem(index, pdepNetworks) for index in range(len(self.reactionSystems))]
+        
+        import multiprocessing
+        logging.info('Conducting simulations of {0:d} reaction systems using {1:d} processes...'.format(len(self.reactionSystems), min(self.processes, len(self.reactionSystems))))
+        parallelJob = (self, pdepNetworks)
+        pool = multiprocessing.Pool(min(self.processes, len(self.reactionSystems)))
+        try:
+            workerResults = pool.map(simulateReactionSystemWorker, range(len(self.reactionSystems)))
+        finally:
+            pool.close()
+            pool.join()
+            parallelJob = None
+        
+        # Merge the results of each worker into the corresponding reaction system
+        results = []
+        reactions = self.reactionModel.core.reactions + self.reactionModel.edge.reactions
+        for reactionSystem, (terminated, invalid, maxCoreSpeciesRates, maxEdgeSpeciesRates, maxNetworkLeakRates, rateCoefficients) in zip(self.reactionSystems, workerResults):
+            reactionSystem.maxCoreSpeciesRates = maxCoreSpeciesRates
+            reactionSystem.maxEdgeSpeciesRates = maxEdgeSpeciesRates
+            reactionSystem.maxNetworkLeakRates = maxNetworkLeakRates
+            if rateCoefficients is not None:
+                # The kinetics of each reaction are the ones the worker used,
+                # since the model has not changed since it was forked
+                reactionSystem.rateCoefficientCache = dict([(rxn, (rxn.kinetics, kf, kr)) for rxn, (kf, kr) in zip(reactions, rateCoefficients)])
+            if invalid is None:
+                obj = None
+            elif invalid[0] == 'network':
+                obj = pdepNetworks[invalid[1]]
+            else:
+                obj = self.reactionModel.edge.species[invalid[1]]
+            results.append((terminated, obj))
+        return results
+    
     def saveEverything(self):
         """
         Saves the output HTML, the Chemkin file, and the Restart file (if appropriate).
@@ -476,22 +594,89 @@ class RMG:
             if option:
                 self.reactionModel.addReactionLibraryToOutput(library)
                 
-        # Save the current state of the model core to a pretty HTML file
-        self.saveOutputHTML()
-        # Save a Chemkin file containing the current model core
-        self.saveChemkinFile()
+        # Save the HTML and Chemkin files in the background
+        self.saveOutputFilesInBackground()
         # Save the restart file if desired
+        # This is done in this process since only the changes since the last
+        # save are appended to the restart file
         if self.saveRestartPeriod or self.done:
             self.saveRestartFile( os.path.join(self.outputDirectory,'restart.pkl'),
                                   self.reactionModel,
                                   delay=0 if self.done else self.saveRestartPeriod.value_si
                                 )
             
+    def saveOutputFiles(self):
+        """
+        Save the current state of the model core to the output HTML file and
+        the Chemkin files.
+        """
+        # Save the current state of the model core to a pretty HTML file
+        self.saveOutputHTML()
+        # Save a Chemkin file containing the current model core
+        self.saveChemkinFile()
+    
+    def saveOutputFilesInBackground(self):
+        """
+        Save the output HTML and Chemkin files in a forked process, which works
+        from its own copy of the current model so that model generation can
+        continue meanwhile. If the previous output process is still running,
+        the files are instead marked as pending and written by the next call
+        to this method or to :meth:`flushOutputFiles()`, so that only the
+        latest state of the model is written.
+        
+        Duplicate reactions are marked in this process before forking, since
+        any changes made by the forked process are lost when it exits.
+        """
+        self.reactionModel.markChemkinDuplicates()
+        
+        if not hasattr(os, 'fork'):
+            self.saveOutputFiles()
+            return
+        
+        if self.outputProcess is not None:
+            if self.outputProcess.is_alive():
+                logging.info('Output files from the previous iteration are still being saved; deferring.')
+                self.outputPending = True
+                return
+            self.joinOutputProcess()
+        
+        import multiprocessing
+        self.outputPending = False
+        self.outputProcess = multiprocessing.Process(target=self.saveOutputFiles)
+        self.outputProcess.start()
+    
+    def joinOutputProcess(self):
+        """
+        Wait for the background output process (if any) to finish.
+        """
+        if self.outputProcess is None:
+            return
+        self.outputProcess.join()
+        if self.outputProcess.exitcode != 0:
+            logging.warning('Saving the output files in the background failed with exit code {0}.'.format(self.outputProcess.exitcode))
+        self.outputProcess = None
+    
+    def flushOutputFiles(self):
+        """
+        Wait for the background output process to finish, then write the
+        output files for the current model if a save is still pending.
+        """
+        self.joinOutputProcess()
+        if self.outputPending:
+            self.outputPending = False
+            self.saveOutputFiles()
             
     def finish(self):
         """
         Complete the model generation.
         """
+        # Make sure the output files are complete
+        self.flushOutputFiles()
+        
+        # Record which thermo cache entries were used in this job
+        if self.reactionModel.thermoCache is not None:
+            self.reactionModel.thermoCache.commit()
+        
         # Log end timestamp
         logging.info('')
         logging.info('RMG execution terminated at ' + time.asctime())
@@ -544,13 +729,11 @@ class RMG:
         Load a restart file at `path` on disk.
         """
     
-        import cPickle
-    
-        # Unpickle the reaction model from the specified restart file
+        # Load the reaction model from the specified restart file
+        # Subsequent saves of the restart file will append to it
         logging.info('Loading previous restart file...')
-        f = open(path, 'rb')
-        self.reactionModel = cPickle.load(f)
-        f.close()
+        self.restartFile = RestartFile(path, self.database)
+        self.restartFile.load(self.reactionModel)
     
         # A few things still point to the species in the input file, so update
         # those to point to the equivalent species loaded from the restart file
@@ -570,48 +753,6 @@ class RMG:
                 initialMoleFractions[spec] = moleFrac
             reactionSystem.initialMoleFractions = initialMoleFractions
     
-        # The reactions and reactionDict still point to the old reaction families
-        reactionDict = {}
-        oldFamilies = self.reactionModel.reactionDict.keys()
-        for family0 in self.reactionModel.reactionDict:
-    
-            # Find the equivalent library or family in the newly-loaded kinetics database
-            family = None
-            if isinstance(family0, KineticsLibrary):
-                for label, database in self.database.kinetics.libraries.iteritems():
-                    if database.label == family0.label:
-                        family = database
-                        break
-            elif isinstance(family0, KineticsFamily):
-                for label, database in self.database.kinetics.families.iteritems():
-                    if database.label == family0.label:
-                        family = database
-                        break    
-            else:
-                import pdb; pdb.set_trace()
-            if family is None:
-                raise Exception("Unable to find matching reaction family for %s" % family0.label)
-    
-            # Update each affected reaction to point to that new family
-            # Also use that new family in a duplicate reactionDict
-            reactionDict[family] = {}
-            for reactant1 in self.reactionModel.reactionDict[family0]:
-                reactionDict[family][reactant1] = {}
-                for reactant2 in self.reactionModel.reactionDict[family0][reactant1]:
-                    reactionDict[family][reactant1][reactant2] = []
-                    if isinstance(family0, KineticsLibrary):
-                        for rxn in self.reactionModel.reactionDict[family0][reactant1][reactant2]:
-                            assert isinstance(rxn, LibraryReaction)
-                            rxn.library = family
-                            reactionDict[family][reactant1][reactant2].append(rxn)
-                    elif isinstance(family0, KineticsFamily):
-                        for rxn in self.reactionModel.reactionDict[family0][reactant1][reactant2]:
-                            assert isinstance(rxn, TemplateReaction)
-                            rxn.family = family
-                            reactionDict[family][reactant1][reactant2].append(rxn)
-        
-        self.reactionModel.reactionDict = reactionDict
-    
     def saveOutputHTML(self):
         """
         Save the current reaction model to a pretty HTML file.
@@ -641,20 +782,17 @@ class RMG:
         the restart file is not at least that old, the save is aborted. (Use the
         default value of 0 to force the restart file to be saved.)
         """
-        import cPickle
-        
-        # Saving of a restart file is very slow (likely due to all the Quantity objects)
-        # Therefore, to save it less frequently, don't bother if the restart file is less than an hour old
+        # To save the restart file less frequently, don't bother if the restart file is less than an hour old
         if os.path.exists(path) and time.time() - os.path.getmtime(path) < delay:
             logging.info('Not saving restart file in this iteration.')
             return
         
-        # Pickle the reaction model to the specified file
-        # We also compress the restart file to save space (and lower the disk read/write time)
+        # Only the species and reactions that are new or have changed since
+        # the last save are appended to the restart file
         logging.info('Saving restart file...')
-        f = open(path, 'wb')
-        cPickle.dump(reactionModel, f, cPickle.HIGHEST_PROTOCOL)
-        f.close()
+        if self.restartFile is None or self.restartFile.path != path:
+            self.restartFile = RestartFile(path, self.database)
+        self.restartFile.save(reactionModel)
     
     def saveExecutionStatistics(self, execTime, coreSpeciesCount, coreReactionCount,
         edgeSpeciesCount, edgeReactionCount, memoryUse, restartSize):
@@ -942,6 +1080,41 @@ class RMG:
     
 ################################################################################
 
+# The job being simulated by the worker processes of a parallel simulation
+parallelJob = None
+
+def simulateReactionSystemWorker(index):
+    """
+    Simulate the reaction system at position `index` of the job stored in
+    `parallelJob`, for use in the worker processes forked by
+    :meth:`RMG.simulateReactionSystemsInParallel()`. The invalid object is
+    returned as its position in the list of edge species or networks, since
+    the copy in this process is not the one in the main process. For the
+    same reason, the rate coefficients cached by the reaction system are
+    returned as a list of the forward and reverse rate coefficients of each
+    core and edge reaction in turn, or ``None`` if it has no cache.
+    """
+    rmg, pdepNetworks = parallelJob
+    terminated, obj = rmg.simulateReactionSystem(index, pdepNetworks)
+    if obj is None:
+        invalid = None
+    elif isinstance(obj, PDepNetwork):
+        invalid = ('network', pdepNetworks.index(obj))
+    else:
+        invalid = ('species', rmg.reactionModel.edge.species.index(obj))
+    reactionSystem = rmg.reactionSystems[index]
+    rateCoefficientCache = getattr(reactionSystem, 'rateCoefficientCache', None)
+    if rateCoefficientCache is None:
+        rateCoefficients = None
+    else:
+        rateCoefficients = []
+        for rxn in rmg.reactionModel.core.reactions + rmg.reactionModel.edge.reactions:
+            kinetics, kf, kr = rateCoefficientCache[rxn]
+            rateCoefficients.append((kf, kr))
+    return terminated, invalid, reactionSystem.maxCoreSpeciesRates, reactionSystem.maxEdgeSpeciesRates, reactionSystem.maxNetworkLeakRates, rateCoefficients
+
+################################################################################
+
 def initializeLog(verbose, log_file_name):
     """
     Set up a logger for RMG to use to print output to stdout. The
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+"""
+This script contains unit tests of the :mod:`rmgpy.rmg.main` module.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import numpy
+
+from rmgpy.molecule import Molecule
+from rmgpy.species import Species
+from rmgpy.kinetics import Arrhenius
+from rmgpy.thermo import ThermoData
+from rmgpy.reaction import Reaction
+from rmgpy.solver.base import TerminationTime
+from rmgpy.solver.simple import SimpleReactor
+from rmgpy.rmg.main import RMG
+from rmgpy.rmg.model import CoreEdgeReactionModel
+
+################################################################################
+
+class TestSaveOutputFilesInBackground(unittest.TestCase):
+    """
+    Contains unit tests of the saving of the output files in a background
+    process by the :class:`RMG` class.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.outputDirectory = tempfile.mkdtemp()
+        self.rmg = RMG(outputDirectory=self.outputDirectory)
+        self.rmg.reactionModel = CoreEdgeReactionModel()
+        # Record the number of core species at each save instead of writing
+        # the HTML and Chemkin files, which need a fully generated model
+        self.rmg.saveOutputFiles = self.saveOutputFiles
+        self.path = os.path.join(self.outputDirectory, 'saves.txt')
+
+    def tearDown(self):
+        """
+        A function run after each unit test in this class.
+        """
+        self.rmg.joinOutputProcess()
+        shutil.rmtree(self.outputDirectory)
+
+    def saveOutputFiles(self):
+        """
+        Append the number of core species to the saves file, slowly enough
+        that further saves are requested while this one is in progress.
+        """
+        time.sleep(0.5)
+        with open(self.path, 'a') as f:
+            f.write('{0:d}\n'.format(len(self.rmg.reactionModel.core.species)))
+
+    def readSaves(self):
+        """
+        Return the list of the numbers of core species in each save.
+        """
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, 'r') as f:
+            return [int(line) for line in f]
+
+    def addCoreSpecies(self, smiles):
+        """
+        Add a new species with the given `smiles` string to the model core.
+        """
+        spec = self.rmg.reactionModel.makeNewSpecies(Molecule().fromSMILES(smiles))[0]
+        self.rmg.reactionModel.core.species.append(spec)
+        return spec
+
+    def test_coalesceSaves(self):
+        """
+        Test that saves requested while a save is in progress are coalesced,
+        and that the final flush writes the latest state of the model.
+        """
+        self.addCoreSpecies('C')
+        self.rmg.saveOutputFilesInBackground()
+        outputProcess = self.rmg.outputProcess
+        self.assertTrue(outputProcess is not None)
+        self.assertFalse(self.rmg.outputPending)
+
+        self.addCoreSpecies('CC')
+        self.rmg.saveOutputFilesInBackground()
+        self.addCoreSpecies('CCC')
+        self.rmg.saveOutputFilesInBackground()
+        # No new process is started while the first is still running
+        self.assertTrue(self.rmg.outputProcess is outputProcess)
+        self.assertTrue(self.rmg.outputPending)
+
+        self.rmg.flushOutputFiles()
+        self.assertTrue(self.rmg.outputProcess is None)
+        self.assertFalse(self.rmg.outputPending)
+        # One save from the background process and one for the pending saves
+        self.assertEqual(self.readSaves(), [1, 3])
+
+    def test_flushWithoutPendingSave(self):
+        """
+        Test that the final flush does not save again if the files are
+        already up to date.
+        """
+        self.addCoreSpecies('C')
+        self.rmg.saveOutputFilesInBackground()
+        self.rmg.flushOutputFiles()
+        self.assertEqual(self.readSaves(), [1])
+
+    def test_markDuplicates(self):
+        """
+        Test that duplicate reactions are marked in this process rather than
+        only in the background process.
+        """
+        CH4 = self.addCoreSpecies('C')
+        CH3 = self.addCoreSpecies('[CH3]')
+        H = self.addCoreSpecies('[H]')
+        for i in range(2):
+            self.rmg.reactionModel.core.reactions.append(Reaction(
+                reactants = [CH4],
+                products = [CH3, H],
+                kinetics = Arrhenius(A=(1e13,"s^-1"), n=0.0, Ea=(100.0*(i+1),"kJ/mol"), T0=(1,"K")),
+            ))
+        self.rmg.saveOutputFilesInBackground()
+        self.rmg.flushOutputFiles()
+        for rxn in self.rmg.reactionModel.core.reactions:
+            self.assertTrue(rxn.duplicate)
+
+################################################################################
+
+class TestSimulateReactionSystemsInParallel(unittest.TestCase):
+    """
+    Contains unit tests of the simulation of the reaction systems in parallel
+    by the :class:`RMG` class.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class. Sets up a model
+        of ethane pyrolysis with methane, methyl and ethane in the core and
+        ethyl and hydrogen atom in the edge.
+        """
+        Tdata = ([300,400,500,600,800,1000,1500],"K")
+        self.CH4 = Species(label='CH4', molecule=[Molecule().fromSMILES("C")],
+            thermo=ThermoData(Tdata=Tdata, Cpdata=([ 8.615, 9.687,10.963,12.301,14.841,16.976,20.528],"cal/(mol*K)"), H298=(-17.714,"kcal/mol"), S298=(44.472,"cal/(mol*K)")))
+        self.CH3 = Species(label='CH3', molecule=[Molecule().fromSMILES("[CH3]")],
+            thermo=ThermoData(Tdata=Tdata, Cpdata=([ 9.397,10.123,10.856,11.571,12.899,14.055,16.195],"cal/(mol*K)"), H298=(  9.357,"kcal/mol"), S298=(45.174,"cal/(mol*K)")))
+        self.C2H6 = Species(label='C2H6', molecule=[Molecule().fromSMILES("CC")],
+            thermo=ThermoData(Tdata=Tdata, Cpdata=([12.684,15.506,18.326,20.971,25.500,29.016,34.595],"cal/(mol*K)"), H298=(-19.521,"kcal/mol"), S298=(54.799,"cal/(mol*K)")))
+        self.C2H5 = Species(label='C2H5', molecule=[Molecule().fromSMILES("C[CH2]")],
+            thermo=ThermoData(Tdata=Tdata, Cpdata=([11.635,13.744,16.085,18.246,21.885,24.676,29.107],"cal/(mol*K)"), H298=( 29.496,"kcal/mol"), S298=(56.687,"cal/(mol*K)")))
+        self.H = Species(label='H', molecule=[Molecule().fromSMILES("[H]")],
+            thermo=ThermoData(Tdata=Tdata, Cpdata=([4.968,4.968,4.968,4.968,4.968,4.968,4.968],"cal/(mol*K)"), H298=( 52.103,"kcal/mol"), S298=(27.392,"cal/(mol*K)")))
+
+        self.rmg = RMG()
+        self.rmg.reactionModel = CoreEdgeReactionModel()
+        self.rmg.reactionModel.core.species = [self.CH4, self.CH3, self.C2H6]
+        self.rmg.reactionModel.core.reactions = [
+            Reaction(reactants=[self.C2H6], products=[self.CH3, self.CH3], kinetics=Arrhenius(A=(1.0e16,'s^-1'), n=0.0, Ea=(88.0,'kcal/mol'), T0=(1,'K'))),
+        ]
+        self.rmg.reactionModel.edge.species = [self.C2H5, self.H]
+        self.rmg.reactionModel.edge.reactions = [
+            Reaction(reactants=[self.C2H6, self.CH3], products=[self.C2H5, self.CH4], kinetics=Arrhenius(A=(686.375*6,'m^3/(mol*s)'), n=4.40721, Ea=(7.82799,'kcal/mol'), T0=(298.15,'K'))),
+            Reaction(reactants=[self.C2H6], products=[self.C2H5, self.H], kinetics=Arrhenius(A=(1.0e16,'s^-1'), n=0.0, Ea=(101.0,'kcal/mol'), T0=(1,'K'))),
+        ]
+        self.rmg.fluxToleranceMoveToCore = 0.1
+        self.rmg.fluxToleranceInterrupt = 1.0
+        self.rmg.processes = 2
+
+    def makeReactionSystems(self):
+        """
+        Return a new list of reaction systems at a range of temperatures.
+        """
+        return [
+            SimpleReactor(T, 1.0e5, initialMoleFractions={self.C2H6: 0.9, self.CH4: 0.1}, termination=[TerminationTime((1.0,'s'))])
+            for T in [800, 1000, 1200, 1500]
+        ]
+
+    def test_simulateReactionSystemsInParallel(self):
+        """
+        Test that simulating the reaction systems in parallel gives the same
+        results as simulating them one after another.
+        """
+        self.rmg.reactionSystems = self.makeReactionSystems()
+        serialResults = [self.rmg.simulateReactionSystem(index, []) for index in range(len(self.rmg.reactionSystems))]
+        serialSystems = self.rmg.reactionSystems
+
+        self.rmg.reactionSystems = self.makeReactionSystems()
+        parallelResults = self.rmg.simulateReactionSystemsInParallel([])
+        parallelSystems = self.rmg.reactionSystems
+
+        self.assertEqual(len(parallelResults), len(serialResults))
+        for (terminated1, obj1), (terminated2, obj2) in zip(serialResults, parallelResults):
+            self.assertEqual(terminated1, terminated2)
+            # The invalid objects are the ones in this process
+            self.assertTrue(obj1 is obj2)
+
+        reactions = self.rmg.reactionModel.core.reactions + self.rmg.reactionModel.edge.reactions
+        for serialSystem, parallelSystem in zip(serialSystems, parallelSystems):
+            self.assertTrue(numpy.allclose(serialSystem.maxCoreSpeciesRates, parallelSystem.maxCoreSpeciesRates))
+            self.assertTrue(numpy.allclose(serialSystem.maxEdgeSpeciesRates, parallelSystem.maxEdgeSpeciesRates))
+            self.assertEqual(len(parallelSystem.maxNetworkLeakRates), 0)
+            for rxn in reactions:
+                kinetics1, kf1, kr1 = serialSystem.rateCoefficientCache[rxn]
+                kinetics2, kf2, kr2 = parallelSystem.rateCoefficientCache[rxn]
+                self.assertTrue(kinetics2 is rxn.kinetics)
+                self.assertAlmostEqual(kf1 / kf2, 1.0, 6)
+                self.assertAlmostEqual(kr1 / kr2, 1.0, 6)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
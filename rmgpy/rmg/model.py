@@ -51,6 +51,7 @@ from rmgpy.data.thermo import *
 from rmgpy.data.kinetics import *
 from rmgpy.data.statmech import *
 import rmgpy.data.rmg
+from rmgpy.data.base import LogicNode
 
 from pdep import PDepReaction, PDepNetwork, PressureDependenceError
 
@@ -72,13 +73,22 @@ class Species(rmgpy.species.Species):
         """
         return (Species, (self.index, self.label, self.thermo, self.conformer, self.molecule, self.lennardJones, self.molecularWeight, self.dipoleMoment, self.polarizability, self.Zrot, self.energyTransferModel, self.reactive, self.coreSizeAtCreation),)
 
-    def generateThermoData(self, database, thermoClass=NASA):
+    def generateThermoData(self, database, thermoClass=NASA, thermoCache=None):
         """
         Generate thermodynamic data for the species using the thermo database.
 
         Generates the thermo data for each structure (resonance isomer),
         picks that with lowest H298 value, and saves it to `self.thermoData`.
-        """
+        If a :class:`ThermoCache` object `thermoCache` is given, the thermo
+        data and the order of the resonance isomers are taken from it if
+        present, and stored in it otherwise.
+        """
+        if thermoCache is not None:
+            thermo = thermoCache.get(self, thermoClass)
+            if thermo is not None:
+                self.thermo = thermo
+                return self.thermo
+        
         # Get the thermo data for the species from the database
         thermo0 = database.thermo.getThermoData(self)
 
@@ -120,6 +130,9 @@ class Species(rmgpy.species.Species):
             err = math.sqrt(err/len(Tlist))/constants.R
             logging.log(logging.WARNING if err > 0.2 else 0, 'Average RMS error in heat capacity fit to {0} = {1:g}*R'.format(self, err))
 
+        if thermoCache is not None:
+            thermoCache.put(self, thermoClass, self.thermo)
+
         return self.thermo
 
     def generateStatMech(self, database):
@@ -204,6 +217,11 @@ class CoreEdgeReactionModel:
     `edge`                     The species and reactions of the current model edge
     `networkDict`              A list of pressure-dependent reaction networks (:class:`Network` objects)
     `networkCount`             A counter for the number of unirxn networks created
+    `speciesDict`              A dictionary of the species in the model, indexed by the canonical hash of each resonance isomer
+    `reactionDict`             A dictionary of the reactions in the model, indexed by the sorted indices of the reactant and product species
+    `reactionKeys`             A dictionary of the set of keys of `reactionDict` involving each species, indexed by species index
+    `processes`                The maximum number of processes to use when generating reactions and updating pressure-dependent networks
+    `thermoCache`              A :class:`ThermoCache` object to use for species thermo data, or ``None`` if not used
     =========================  ==============================================================
 
 
@@ -225,6 +243,7 @@ class CoreEdgeReactionModel:
         self.networkCount = 0
         self.speciesDict = {}
         self.reactionDict = {}
+        self.reactionKeys = {}
         self.speciesCache = [None for i in range(4)]
         self.speciesCounter = 0
         self.reactionCounter = 0
@@ -236,6 +255,8 @@ class CoreEdgeReactionModel:
         self.verboseComments = False
         self.kineticsEstimator = 'group additivity'
         self.reactionGenerationOptions = {}
+        self.processes = 1
+        self.thermoCache = None
 
     def checkForExistingSpecies(self, molecule):
         """
@@ -254,9 +275,10 @@ class CoreEdgeReactionModel:
                         return True, spec
 
         # Return an existing species if a match is found
-        formula = molecule.getFormula()
+        # Only species with a resonance isomer having the same canonical hash
+        # can match, so a full isomorphism check is only needed for those
         try:
-             speciesList = self.speciesDict[formula]
+             speciesList = self.speciesDict[molecule.getCanonicalHash()]
         except KeyError:
             return False, None
         for spec in speciesList:
@@ -306,11 +328,10 @@ class CoreEdgeReactionModel:
         spec.molecularWeight = Quantity(spec.molecule[0].getMolecularWeight()*1000.,"amu")
         spec.generateLennardJonesParameters()
         spec.generateEnergyTransferModel()
-        formula = molecule.getFormula()
-        if formula in self.speciesDict:
-            self.speciesDict[formula].append(spec)
-        else:
-            self.speciesDict[formula] = [spec]
+        for mol in spec.molecule:
+            speciesList = self.speciesDict.setdefault(mol.getCanonicalHash(), [])
+            if spec not in speciesList:
+                speciesList.append(spec)
 
         self.speciesCounter += 1
 
@@ -330,67 +351,24 @@ class CoreEdgeReactionModel:
         rxn.reactants.sort()
         rxn.products.sort()
 
-        # Get the short-list of reactions with the same family, reactant1 and reactant2
-        r1 = rxn.reactants[0]
-        if len(rxn.reactants)==1: r2 = None
-        else: r2 = rxn.reactants[1]
         family = rxn.family
-        try:
-            my_reactionList = self.reactionDict[family][r1][r2]
-        except KeyError: # no such short-list: must be new, unless in seed.
-            my_reactionList = []
-        
-        # if the family is its own reverse (H-Abstraction) then check the other direction
-        if isinstance(family,KineticsFamily) and family.ownReverse: # (family may be a KineticsLibrary)
-            # Get the short-list of reactions with the same family, product1 and product2
-            r1 = rxn.products[0]
-            if len(rxn.products)==1: r2 = None
-            else: r2 = rxn.products[1]
-            family = rxn.family
-            try:
-                my_reactionList.extend(self.reactionDict[family][r1][r2])
-            except KeyError: # no such short-list: must be new, unless in seed.
-                pass
+        ownReverse = isinstance(family,KineticsFamily) and family.ownReverse # (family may be a KineticsLibrary)
 
-        # Now use short-list to check for matches. All should be in same forward direction.
-        for rxn0 in my_reactionList:
-            if (rxn0.reactants == rxn.reactants and rxn0.products == rxn.products):
-                return True, rxn0
-            
-            if isinstance(family,KineticsFamily) and family.ownReverse:
-                if (rxn0.reactants == rxn.products and rxn0.products == rxn.reactants):
-                    return True, rxn0
-
-        # Now check seed mechanisms
+        # Reactions with the same reactants and products in the same direction
+        # must have the same family to match, unless one of them comes from a
+        # seed mechanism or reaction library
         # We want to check for duplicates in *other* seed mechanisms, but allow
         # duplicated *within* the same seed mechanism
-        for family0 in self.reactionDict:
-            if isinstance(family0, KineticsLibrary) and family0 != family:
+        for rxn0 in self.reactionDict.get(getReactionKey(rxn.reactants, rxn.products), []):
+            if rxn0.family == family or (isinstance(rxn0.family, KineticsLibrary) and rxn0.family != family):
+                return True, rxn0
 
-                # First check seed short-list in forward direction
-                r1 = rxn.reactants[0]
-                if len(rxn.reactants)==1: r2 = None
-                else: r2 = rxn.reactants[1]
-                try:
-                    my_reactionList = self.reactionDict[family0][r1][r2]
-                except KeyError:
-                    my_reactionList = []
-                for rxn0 in my_reactionList:
-                    if (rxn0.reactants == rxn.reactants and rxn0.products == rxn.products) or \
-                        (rxn0.reactants == rxn.products and rxn0.products == rxn.reactants):
-                        return True, rxn0
-                # Now get the seed short-list of the reverse reaction
-                r1 = rxn.products[0]
-                if len(rxn.products)==1: r2 = None
-                else: r2 = rxn.products[1]
-                try:
-                    my_reactionList = self.reactionDict[family0][r1][r2]
-                except KeyError:
-                    my_reactionList = []
-                for rxn0 in my_reactionList:
-                    if (rxn0.reactants == rxn.reactants and rxn0.products == rxn.products) or \
-                        (rxn0.reactants == rxn.products and rxn0.products == rxn.reactants):
-                        return True, rxn0
+        # Reactions in the reverse direction only match if the family is its
+        # own reverse (H-Abstraction) or one of them comes from a seed
+        # mechanism or reaction library
+        for rxn0 in self.reactionDict.get(getReactionKey(rxn.products, rxn.reactants), []):
+            if (rxn0.family == family and ownReverse) or (isinstance(rxn0.family, KineticsLibrary) and rxn0.family != family):
+                return True, rxn0
 
         return False, None
 
@@ -441,20 +419,12 @@ class CoreEdgeReactionModel:
         else:
             raise Exception("Unrecognized reaction type {0!s}".format(forward.__class__))
         
-        # Add to the global dict/list of existing reactions (a list broken down by family, r1, r2)
-        # identify r1 and r2
-        r1 = forward.reactants[0]
-        r2 = None if len(forward.reactants) == 1 else forward.reactants[1]
-        family = forward.family
-        # make dictionary entries if necessary
-        if family not in self.reactionDict:
-            self.reactionDict[family] = {}
-        if not self.reactionDict[family].has_key(r1):
-            self.reactionDict[family][r1] = dict()
-        if not self.reactionDict[family][r1].has_key(r2):
-            self.reactionDict[family][r1][r2] = list()
-        # store this reaction at the top of the relevant short-list
-        self.reactionDict[family][r1][r2].insert(0, forward)
+        # Add to the global dict of existing reactions, indexed by the
+        # reactant and product species, at the top of the relevant short-list
+        key = getReactionKey(forward.reactants, forward.products)
+        self.reactionDict.setdefault(key, []).insert(0, forward)
+        for index in key[0] + key[1]:
+            self.reactionKeys.setdefault(index, set()).add(key)
 
         forward.index = self.reactionCounter + 1
         self.reactionCounter += 1
@@ -512,6 +482,72 @@ class CoreEdgeReactionModel:
                     moleculeB.clearLabeledAtoms()
         return reactionList
 
+    def reactInParallel(self, database, speciesA, speciesList):
+        """
+        Generate the reactions of :class:`rmgpy.species.Species` `speciesA`
+        with each of the species in `speciesList`, where an item of ``None``
+        indicates the unimolecular reactions of `speciesA`. The family
+        reactions for each (species, reaction family) pair are generated using
+        a pool of up to `processes` worker processes forked from this process;
+        the library reactions are cheap and are generated here. The returned
+        list contains the same reactions in the same order as calling
+        :meth:`react()` for each item of `speciesList` in turn, so that they
+        can be deduplicated by :meth:`processNewReactions()` as usual.
+
+        The features required by each family are determined here before
+        forking, so that the workers share them, and the template mappings
+        found by the workers are returned and stored on the molecules of this
+        process, so that they are reused when generating later reactions.
+        """
+        global parallelJob
+
+        if not hasattr(os, 'fork'):
+            logging.warning('Parallel reaction generation requires os.fork(); generating reactions serially.')
+            reactionList = []
+            for speciesB in speciesList:
+                reactionList.extend(self.react(database, speciesA, speciesB))
+            return reactionList
+
+        import multiprocessing
+        options = self.reactionGenerationOptions
+        onlyFamilies = options.get('only_families', None)
+        familyLabels = [label for label in database.kinetics.families if onlyFamilies is None or label in onlyFamilies]
+        units = [(index, label) for index in range(len(speciesList)) for label in familyLabels]
+        for label in familyLabels:
+            database.kinetics.families[label].getRequiredFeatures()
+
+        parallelJob = (self, speciesA, speciesList)
+        pool = multiprocessing.Pool(max(1, min(self.processes, len(units))))
+        try:
+            workerResults = dict(zip(units, pool.map(reactWorker, units)))
+        finally:
+            pool.close()
+            pool.join()
+            parallelJob = None
+
+        # Keep the template mappings found by the workers
+        for (index, label), (results, mappings) in workerResults.iteritems():
+            family = database.kinetics.families[label]
+            for position, moleculeIndex, entryLabel, data in mappings:
+                species = speciesA if position is None else speciesList[position]
+                molecule = species.molecule[moleculeIndex]
+                entry = family.groups.entries[entryLabel]
+                if entry not in molecule.templateMappings:
+                    molecule.templateMappings[entry] = decodeTemplateMappings(data, molecule, family, entry)
+
+        # Reassemble the reactions in the order they would have been generated serially
+        reactionList = []
+        for index, speciesB in enumerate(speciesList):
+            for moleculeIndex, molecules in enumerate(getReactantMolecules(speciesA, speciesB)):
+                reactionList.extend(database.kinetics.generateReactionsFromLibraries(molecules, None, **options))
+                for molecule in molecules:
+                    molecule.clearLabeledAtoms()
+                for label in familyLabels:
+                    family = database.kinetics.families[label]
+                    for data in workerResults[(index, label)][0][moleculeIndex]:
+                        reactionList.append(decodeTemplateReaction(data, family))
+        return reactionList
+
     def enlarge(self, newObject):
         """
         Enlarge a reaction model by processing `newObject`. If `newObject` is a
@@ -551,17 +587,23 @@ class CoreEdgeReactionModel:
                     logging.info('Adding species {0} to model core'.format(newSpecies))
                     display(newSpecies) # if running in IPython --pylab mode, draws the picture!
                     
-                    # Find reactions involving the new species as unimolecular reactant
-                    # or product (e.g. A <---> products)
-                    newReactions.extend(self.react(database, newSpecies))
-                    # Find reactions involving the new species as bimolecular reactants
-                    # or products with other core species (e.g. A + B <---> products)
-                    for coreSpecies in self.core.species:
-                        if coreSpecies.reactive:
-                            newReactions.extend(self.react(database, newSpecies, coreSpecies))
-                    # Find reactions involving the new species as bimolecular reactants
-                    # or products with itself (e.g. A + A <---> products)
-                    newReactions.extend(self.react(database, newSpecies, newSpecies))
+                    if self.processes > 1:
+                        # Generate the same reactions as below, but spread
+                        # across a pool of worker processes
+                        coreSpeciesList = [coreSpecies for coreSpecies in self.core.species if coreSpecies.reactive]
+                        newReactions.extend(self.reactInParallel(database, newSpecies, [None] + coreSpeciesList + [newSpecies]))
+                    else:
+                        # Find reactions involving the new species as unimolecular reactant
+                        # or product (e.g. A <---> products)
+                        newReactions.extend(self.react(database, newSpecies))
+                        # Find reactions involving the new species as bimolecular reactants
+                        # or products with other core species (e.g. A + B <---> products)
+                        for coreSpecies in self.core.species:
+                            if coreSpecies.reactive:
+                                newReactions.extend(self.react(database, newSpecies, coreSpecies))
+                        # Find reactions involving the new species as bimolecular reactants
+                        # or products with itself (e.g. A + A <---> products)
+                        newReactions.extend(self.react(database, newSpecies, newSpecies))
     
                 # Add new species
                 reactionsMovedFromEdge = self.addSpeciesToCore(newSpecies)
@@ -613,7 +655,7 @@ class CoreEdgeReactionModel:
         # Generate thermodynamics of new species
         logging.info('Generating thermodynamics for new species...')
         for spec in newSpeciesList:
-            spec.generateThermoData(database)
+            spec.generateThermoData(database, thermoCache=self.thermoCache)
         
         # Generate kinetics of new reactions
         logging.info('Generating kinetics for new reactions...')
@@ -1049,18 +1091,19 @@ class CoreEdgeReactionModel:
                         # Recompute the isomers, reactants, and products for this network
                         network.updateConfigurations()
 
-        # Remove from the global list of reactions
-        # also remove it from the global list of reactions
-        for family in self.reactionDict:
-            if spec in self.reactionDict[family]:
-                del self.reactionDict[family][spec]
-            for reactant1 in self.reactionDict[family]:
-                if spec in self.reactionDict[family][reactant1]:
-                    del self.reactionDict[family][reactant1][spec]
+        # Remove from the global list of reactions, using the keys involving
+        # the species rather than scanning every key
+        for key in self.reactionKeys.pop(spec.index, set()):
+            self.reactionDict.pop(key, None)
+            for index in key[0] + key[1]:
+                if index != spec.index and index in self.reactionKeys:
+                    self.reactionKeys[index].discard(key)
 
         # remove from the global list of species, to free memory
-        formula = spec.molecule[0].getFormula()
-        self.speciesDict[formula].remove(spec)
+        for mol in spec.molecule:
+            speciesList = self.speciesDict.get(mol.getCanonicalHash(), [])
+            if spec in speciesList:
+                speciesList.remove(spec)
         if spec in self.speciesCache:
             self.speciesCache.remove(spec)
             self.speciesCache.append(None)
@@ -1168,7 +1211,7 @@ class CoreEdgeReactionModel:
             rxn = LibraryReaction(reactants=entry.item.reactants[:], products=entry.item.products[:], library=seedMechanism, kinetics=entry.data)
             r, isNew = self.makeNewReaction(rxn) # updates self.newSpeciesList and self.newReactionlist
         for spec in self.newSpeciesList:
-            if spec.reactive: spec.generateThermoData(database)
+            if spec.reactive: spec.generateThermoData(database, thermoCache=self.thermoCache)
         for spec in self.newSpeciesList:
             self.addSpeciesToCore(spec)
 
@@ -1179,7 +1222,7 @@ class CoreEdgeReactionModel:
                 # ...but are Seed Mechanisms run through PDep? Perhaps not.
                 for spec in itertools.chain(rxn.reactants, rxn.products):
                     if spec.thermo is None:
-                        spec.generateThermoData(database)
+                        spec.generateThermoData(database, thermoCache=self.thermoCache)
                 rxn.fixBarrierHeight(forcePositive=True)
             self.addReactionToCore(rxn)
         
@@ -1217,7 +1260,7 @@ class CoreEdgeReactionModel:
             r, isNew = self.makeNewReaction(rxn) # updates self.newSpeciesList and self.newReactionlist
             if not isNew: logging.info("This library reaction was not new: {0}".format(rxn))
         for spec in self.newSpeciesList:
-            if spec.reactive: spec.generateThermoData(database)
+            if spec.reactive: spec.generateThermoData(database, thermoCache=self.thermoCache)
         for spec in self.newSpeciesList:
             self.addSpeciesToEdge(spec)
 
@@ -1374,14 +1417,18 @@ class CoreEdgeReactionModel:
             count += sum([1 for network in networks if not network.valid and not (len(network.explored) == 0 and len(network.source) > 1)])
         logging.info('Updating {0:d} modified unimolecular reaction networks...'.format(count))
         
-        # Iterate over all the networks, updating the invalid ones as necessary
+        # Iterate over all the networks, preparing the invalid ones for update
         # self = reactionModel object
         updatedNetworks = []
+        calculatedNetworks = []
         for source, networks in self.networkDict.items():
             for network in networks:
                 if not network.valid:
-                    network.update(self, database, self.pressureDependence)
+                    if network.prepareUpdate(self, database, self.pressureDependence):
+                        calculatedNetworks.append(network)
                     updatedNetworks.append(network)
+
+        self.updateNetworkKinetics(calculatedNetworks)
             
         # PDepReaction objects generated from partial networks are irreversible
         # However, it makes more sense to have reversible reactions in the core
@@ -1428,6 +1475,61 @@ class CoreEdgeReactionModel:
                 else:
                     reaction.reversible = True
 
+    def updateNetworkKinetics(self, networks):
+        """
+        Compute the :math:`k(T,P)` values of each of the prepared
+        :class:`PDepNetwork` objects in `networks`, using multiple processes
+        if `processes` is greater than one, then apply the fitted net reaction
+        kinetics to the model in network order, so that the new net reactions
+        are indexed and placed the same way whether or not the calculations
+        were done in parallel.
+        """
+        if self.processes > 1 and len(networks) > 1:
+            results = self.calculateNetworksInParallel(networks)
+            for network, (K, kineticsList) in zip(networks, results):
+                network.applyNetKinetics(self, self.pressureDependence, K, kineticsList)
+        else:
+            for network in networks:
+                K, kineticsList = network.calculateNetKinetics(self.pressureDependence)
+                network.applyNetKinetics(self, self.pressureDependence, K, kineticsList)
+
+    def calculateNetworksInParallel(self, networks):
+        """
+        Compute the :math:`k(T,P)` values and fitted net reaction kinetics of
+        each of the prepared :class:`PDepNetwork` objects in `networks`, using
+        a pool of up to `processes` worker processes forked from this process.
+        Returns a list of the results of
+        :meth:`PDepNetwork.calculateNetKinetics()` in the same order as
+        `networks`; applying them to the model is left to the caller. The
+        densities of states computed by the workers are added to the cache of
+        this process.
+        """
+        global parallelJob
+        from rmgpy.pdep.network import densityOfStatesCache
+
+        if not hasattr(os, 'fork'):
+            logging.warning('Parallel network updates require os.fork(); updating networks serially.')
+            return [network.calculateNetKinetics(self.pressureDependence) for network in networks]
+
+        import multiprocessing
+        logging.info('Calculating k(T,P) values for {0:d} networks using {1:d} processes...'.format(len(networks), min(self.processes, len(networks))))
+        parallelJob = (self, networks)
+        densityOfStatesCache.resetModified()
+        pool = multiprocessing.Pool(min(self.processes, len(networks)))
+        try:
+            # Networks vary widely in cost, so hand them out one at a time
+            workerResults = pool.map(calculateNetworkWorker, range(len(networks)), chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+            parallelJob = None
+        
+        results = []
+        for K, kineticsList, cacheEntries in workerResults:
+            densityOfStatesCache.merge(cacheEntries)
+            results.append((K, kineticsList))
+        return results
+
     def loadSeedMechanism(self, path):
         """
         Loads a seed mechanism from the folder indicated by `path` into the
@@ -1547,3 +1649,158 @@ class CoreEdgeReactionModel:
         saveChemkinFile(verbose_path, speciesList, rxnList, verbose = True, checkForDuplicates=False)
         if dictionaryPath:
             saveSpeciesDictionary(dictionaryPath, speciesList)
+
+################################################################################
+
+# The job being processed by the worker processes of parallel reaction
+# generation or of parallel network updates
+parallelJob = None
+
+def getReactantMolecules(speciesA, speciesB=None):
+    """
+    Return a list of the combinations of reactant molecules (resonance
+    isomers) to react for species `speciesA` and `speciesB`, in the order
+    used by :meth:`CoreEdgeReactionModel.react()`.
+    """
+    if speciesB is None:
+        return [[moleculeA] for moleculeA in speciesA.molecule]
+    else:
+        return [[moleculeA, moleculeB] for moleculeA in speciesA.molecule for moleculeB in speciesB.molecule]
+
+def getReactionKey(reactants, products):
+    """
+    Return a key for the reaction between the given lists of `reactants` and
+    `products` species, formed from the sorted species indices of each side.
+    Reactions in the same direction between the same species have equal keys.
+    """
+    return (tuple(sorted([spec.index for spec in reactants])), tuple(sorted([spec.index for spec in products])))
+
+def reactWorker(unit):
+    """
+    Generate the reactions of the reaction family with label `unit[1]`
+    between the new species and the species at position `unit[0]` of the job
+    stored in `parallelJob`, for use in the worker processes forked by
+    :meth:`CoreEdgeReactionModel.reactInParallel()`. Returns a list of the
+    encoded reactions for each combination of reactant molecules, along with
+    the encoded template mappings of the family found for the reactant
+    molecules, each identified by the position of its species in the job
+    (``None`` for the new species) and its index in that species.
+    """
+    model, speciesA, speciesList = parallelJob
+    index, label = unit
+    database = rmgpy.data.rmg.database
+    family = database.kinetics.families[label]
+    options = model.reactionGenerationOptions.copy()
+    options['only_families'] = [label]
+
+    speciesB = speciesList[index]
+    speciesPositions = [(None, speciesA)]
+    if speciesB is not None and speciesB is not speciesA:
+        speciesPositions.append((index, speciesB))
+    knownMappings = {}
+    for position, species in speciesPositions:
+        for molecule in species.molecule:
+            knownMappings[molecule] = set(molecule.templateMappings.keys())
+
+    results = []
+    for molecules in getReactantMolecules(speciesA, speciesB):
+        reactionList = database.kinetics.generateReactionsFromFamilies(molecules, None, **options)
+        for molecule in molecules:
+            molecule.clearLabeledAtoms()
+        results.append([encodeTemplateReaction(reaction) for reaction in reactionList])
+
+    # Only the mappings found by this worker need to be returned
+    mappings = []
+    for position, species in speciesPositions:
+        for moleculeIndex, molecule in enumerate(species.molecule):
+            for entry, entryMappings in molecule.templateMappings.iteritems():
+                if entry not in knownMappings[molecule] and entry.label in family.groups.entries and family.groups.entries[entry.label] is entry:
+                    mappings.append((position, moleculeIndex, entry.label, encodeTemplateMappings(entryMappings, molecule, family, entry)))
+    return results, mappings
+
+def calculateNetworkWorker(index):
+    """
+    Return the :math:`k(T,P)` values and fitted net reaction kinetics of the
+    network at position `index` of the job stored in `parallelJob`, for use
+    in the worker processes forked by
+    :meth:`CoreEdgeReactionModel.calculateNetworksInParallel()`, along with
+    the densities of states this worker has computed since its last task.
+    """
+    from rmgpy.pdep.network import densityOfStatesCache
+    model, networks = parallelJob
+    K, kineticsList = networks[index].calculateNetKinetics(model.pressureDependence)
+    cacheEntries = densityOfStatesCache.getModified()
+    densityOfStatesCache.resetModified()
+    return K, kineticsList, cacheEntries
+
+def encodeTemplateReaction(reaction):
+    """
+    Return a picklable representation of the :class:`TemplateReaction`
+    `reaction` that refers to its reaction family and template by label,
+    since pickling the reaction itself would also pickle the entire family.
+    The `reverse` attribute set for families that are their own reverse is
+    included as well.
+    """
+    reverse = getattr(reaction, 'reverse', None)
+    return (
+        reaction.reactants,
+        reaction.products,
+        reaction.pairs,
+        reaction.degeneracy,
+        reaction.reversible,
+        [entry.label for entry in reaction.template],
+        encodeTemplateReaction(reverse) if reverse is not None else None,
+    )
+
+def getTemplateStructures(family, entry):
+    """
+    Return the list of :class:`Group` structures that a molecule is matched
+    against for the template reactant `entry` of reaction `family`, in the
+    order used when finding its template mappings.
+    """
+    struct = entry.item
+    if isinstance(struct, LogicNode):
+        return struct.getPossibleStructures(family.groups.entries)
+    else:
+        return [struct]
+
+def encodeTemplateMappings(mappings, molecule, family, entry):
+    """
+    Return a picklable representation of the list of template `mappings`
+    from the atoms of `molecule` to those of the template reactant `entry`
+    of reaction `family`, with each atom replaced by its index.
+    """
+    atomIndices = dict([(atom, index) for index, atom in enumerate(molecule.atoms)])
+    groupAtomIndices = {}
+    for structIndex, struct in enumerate(getTemplateStructures(family, entry)):
+        for index, atom in enumerate(struct.atoms):
+            groupAtomIndices[atom] = (structIndex, index)
+    return [[(atomIndices[atom], groupAtomIndices[groupAtom]) for atom, groupAtom in mapping.iteritems()] for mapping in mappings]
+
+def decodeTemplateMappings(data, molecule, family, entry):
+    """
+    Return the list of template mappings of `molecule` to the template
+    reactant `entry` of reaction `family` encoded as `data` by
+    :func:`encodeTemplateMappings()`.
+    """
+    structures = getTemplateStructures(family, entry)
+    return [dict([(molecule.atoms[atomIndex], structures[structIndex].atoms[groupAtomIndex]) for atomIndex, (structIndex, groupAtomIndex) in mapping]) for mapping in data]
+
+def decodeTemplateReaction(data, family):
+    """
+    Return the :class:`TemplateReaction` of reaction `family` encoded as
+    `data` by :func:`encodeTemplateReaction()`.
+    """
+    reactants, products, pairs, degeneracy, reversible, template, reverse = data
+    reaction = TemplateReaction(
+        reactants = reactants,
+        products = products,
+        pairs = pairs,
+        degeneracy = degeneracy,
+        reversible = reversible,
+        family = family,
+        template = [family.groups.entries[label] for label in template],
+    )
+    if reverse is not None:
+        reaction.reverse = decodeTemplateReaction(reverse, family)
+    return reaction
@@ -0,0 +1,315 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+"""
+This script contains unit tests of the :mod:`rmgpy.rmg.model` module.
+"""
+
+import os
+import unittest
+
+import rmgpy.data.rmg
+from rmgpy import settings
+from rmgpy.molecule import Molecule
+from rmgpy.data.rmg import RMGDatabase
+from rmgpy.kinetics import Arrhenius
+from rmgpy.species import Species, TransitionState
+from rmgpy.reaction import Reaction
+from rmgpy.statmech import Conformer, IdealGasTranslation, NonlinearRotor, HarmonicOscillator, HinderedRotor
+from rmgpy.pdep import Configuration, LennardJones, SingleExponentialDown
+from rmgpy.cantherm.pdep import PressureDependenceJob
+from rmgpy.rmg.pdep import PDepNetwork, PDepReaction
+from rmgpy.data.kinetics import KineticsFamily, KineticsLibrary, LibraryReaction, TemplateReaction
+from rmgpy.rmg.model import CoreEdgeReactionModel, getReactionKey
+
+################################################################################
+
+class TestReactionDict(unittest.TestCase):
+    """
+    Contains unit tests of the indexing of reactions in the
+    :class:`CoreEdgeReactionModel` class by their reactant and product
+    species.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.model = CoreEdgeReactionModel()
+        self.CH4 = self.model.makeNewSpecies(Molecule().fromSMILES('C'))[0]
+        self.CH3 = self.model.makeNewSpecies(Molecule().fromSMILES('[CH3]'))[0]
+        self.H = self.model.makeNewSpecies(Molecule().fromSMILES('[H]'))[0]
+        self.C2H6 = self.model.makeNewSpecies(Molecule().fromSMILES('CC'))[0]
+        self.C2H5 = self.model.makeNewSpecies(Molecule().fromSMILES('C[CH2]'))[0]
+        self.model.core.species.extend([self.CH4, self.CH3, self.H])
+        self.model.edge.species.extend([self.C2H6, self.C2H5])
+        self.library1 = KineticsLibrary(label='library1')
+        self.library2 = KineticsLibrary(label='library2')
+        self.abstraction = KineticsFamily(label='H_Abstraction')
+        self.abstraction.ownReverse = True
+        self.recombination = KineticsFamily(label='R_Recombination')
+        self.recombination.ownReverse = False
+
+    def makeReaction(self, reactants, products, family):
+        """
+        Return a new reaction between the given `reactants` and `products`
+        from the given reaction `family` or library.
+        """
+        kinetics = Arrhenius(A=(1e13,"cm^3/(mol*s)"), n=0.0, Ea=(0.0,"kJ/mol"), T0=(1,"K"))
+        if isinstance(family, KineticsLibrary):
+            return LibraryReaction(reactants=reactants, products=products, kinetics=kinetics, library=family)
+        else:
+            return TemplateReaction(reactants=reactants, products=products, kinetics=kinetics, family=family)
+
+    def test_getReactionKey(self):
+        """
+        Test that reaction keys ignore the order of the species on each side
+        of a reaction, but not the direction of the reaction.
+        """
+        key = getReactionKey([self.CH4, self.CH3], [self.CH3, self.CH4])
+        self.assertEqual(key, ((1, 2), (1, 2)))
+        self.assertEqual(getReactionKey([self.CH3, self.C2H6], [self.C2H5, self.CH4]),
+                         getReactionKey([self.C2H6, self.CH3], [self.CH4, self.C2H5]))
+        self.assertNotEqual(getReactionKey([self.CH3, self.CH3], [self.C2H6]),
+                            getReactionKey([self.C2H6], [self.CH3, self.CH3]))
+
+    def test_checkForExistingReactionSameFamily(self):
+        """
+        Test that a reaction from the same family is found in the forward
+        direction, and in the reverse direction only if the family is its own
+        reverse.
+        """
+        rxn, isNew = self.model.makeNewReaction(self.makeReaction([self.CH3, self.C2H6], [self.CH4, self.C2H5], self.abstraction))
+        self.assertTrue(isNew)
+        self.assertEqual(self.model.checkForExistingReaction(self.makeReaction([self.C2H6, self.CH3], [self.C2H5, self.CH4], self.abstraction)), (True, rxn))
+        self.assertEqual(self.model.checkForExistingReaction(self.makeReaction([self.CH4, self.C2H5], [self.CH3, self.C2H6], self.abstraction)), (True, rxn))
+
+        rxn, isNew = self.model.makeNewReaction(self.makeReaction([self.CH3, self.CH3], [self.C2H6], self.recombination))
+        self.assertTrue(isNew)
+        self.assertEqual(self.model.checkForExistingReaction(self.makeReaction([self.CH3, self.CH3], [self.C2H6], self.recombination)), (True, rxn))
+        self.assertEqual(self.model.checkForExistingReaction(self.makeReaction([self.C2H6], [self.CH3, self.CH3], self.recombination)), (False, None))
+
+    def test_checkForExistingReactionOtherSource(self):
+        """
+        Test that a reaction from a different family is not found, but one
+        from a different library is found in either direction.
+        """
+        rxn, isNew = self.model.makeNewReaction(self.makeReaction([self.CH3, self.CH3], [self.C2H6], self.library1))
+        self.assertTrue(isNew)
+        # Reactions within the same library may be duplicates
+        self.assertEqual(self.model.checkForExistingReaction(self.makeReaction([self.C2H6], [self.CH3, self.CH3], self.library1)), (False, None))
+        self.assertEqual(self.model.checkForExistingReaction(self.makeReaction([self.CH3, self.CH3], [self.C2H6], self.library2)), (True, rxn))
+        self.assertEqual(self.model.checkForExistingReaction(self.makeReaction([self.C2H6], [self.CH3, self.CH3], self.library2)), (True, rxn))
+        # Reactions from families match reactions from libraries, but not
+        # reactions from other families
+        self.assertEqual(self.model.checkForExistingReaction(self.makeReaction([self.CH3, self.CH3], [self.C2H6], self.recombination)), (True, rxn))
+        rxn, isNew = self.model.makeNewReaction(self.makeReaction([self.CH3, self.C2H6], [self.CH4, self.C2H5], self.abstraction))
+        self.assertTrue(isNew)
+        self.assertEqual(self.model.checkForExistingReaction(self.makeReaction([self.CH3, self.C2H6], [self.CH4, self.C2H5], self.recombination)), (False, None))
+
+    def test_removeSpeciesFromEdge(self):
+        """
+        Test that removing a species from the edge removes only the reactions
+        involving it from the reaction dictionary.
+        """
+        rxn1 = self.model.makeNewReaction(self.makeReaction([self.CH3, self.CH3], [self.C2H6], self.recombination))[0]
+        rxn2 = self.model.makeNewReaction(self.makeReaction([self.CH3, self.C2H6], [self.CH4, self.C2H5], self.abstraction))[0]
+        rxn3 = self.model.makeNewReaction(self.makeReaction([self.CH3, self.H], [self.CH4], self.recombination))[0]
+        self.model.addReactionToEdge(rxn1)
+        self.model.addReactionToEdge(rxn2)
+        self.model.addReactionToCore(rxn3)
+
+        self.model.removeSpeciesFromEdge(self.C2H5)
+        self.assertEqual(self.model.edge.species, [self.C2H6])
+        self.assertEqual(self.model.edge.reactions, [rxn1])
+        self.assertEqual(self.model.checkForExistingReaction(rxn1), (True, rxn1))
+        self.assertEqual(self.model.checkForExistingReaction(rxn2), (False, None))
+        self.assertEqual(self.model.checkForExistingReaction(rxn3), (True, rxn3))
+        self.assertEqual(sorted(self.model.reactionDict.keys()), sorted([getReactionKey(rxn1.reactants, rxn1.products), getReactionKey(rxn3.reactants, rxn3.products)]))
+        self.assertFalse(self.C2H5.index in self.model.reactionKeys)
+        for keys in self.model.reactionKeys.itervalues():
+            for key in keys:
+                self.assertTrue(key in self.model.reactionDict)
+
+################################################################################
+
+class TestReactInParallel(unittest.TestCase):
+    """
+    Contains unit tests of the generation of reactions using multiple
+    processes by the :class:`CoreEdgeReactionModel` class.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        A function run once before the unit tests in this class.
+        """
+        database = rmgpy.data.rmg.database or RMGDatabase()
+        database.loadKinetics(os.path.join(settings['database.directory'], 'kinetics'),
+                              reactionLibraries = [],
+                              kineticsFamilies = ['H_Abstraction', 'R_Recombination', 'R_Addition_MultipleBond'],
+                              )
+        cls.database = database
+
+    def makeModel(self, processes):
+        """
+        Return a new model with the given number of `processes`, along with
+        its core species and the new species to add to the core.
+        """
+        model = CoreEdgeReactionModel()
+        model.processes = processes
+        coreSpecies = [model.makeNewSpecies(Molecule().fromSMILES(smiles))[0] for smiles in ['C', '[CH3]', 'C=C']]
+        model.core.species.extend(coreSpecies)
+        newSpecies = model.makeNewSpecies(Molecule().fromSMILES('[CH2]C=C'))[0]
+        return model, coreSpecies, newSpecies
+
+    def describeReaction(self, rxn):
+        """
+        Return a summary of the generated reaction `rxn` to compare.
+        """
+        reverse = getattr(rxn, 'reverse', None)
+        return (rxn.family.label, str(rxn), rxn.degeneracy, [entry.label for entry in rxn.template], str(reverse) if reverse is not None else None)
+
+    def test_reactInParallel(self):
+        """
+        Test that generating reactions in parallel gives the same reactions in
+        the same order as generating them serially, and keeps the template
+        mappings found by the worker processes.
+        """
+        serialModel, serialCore, serialSpecies = self.makeModel(1)
+        serialReactions = []
+        for speciesB in [None] + serialCore + [serialSpecies]:
+            serialReactions.extend(serialModel.react(self.database, serialSpecies, speciesB))
+
+        parallelModel, parallelCore, parallelSpecies = self.makeModel(2)
+        parallelReactions = parallelModel.reactInParallel(self.database, parallelSpecies, [None] + parallelCore + [parallelSpecies])
+
+        self.assertTrue(len(serialReactions) > 0)
+        self.assertEqual([self.describeReaction(rxn) for rxn in parallelReactions], [self.describeReaction(rxn) for rxn in serialReactions])
+
+        for species1, species2 in zip(serialCore + [serialSpecies], parallelCore + [parallelSpecies]):
+            for molecule1, molecule2 in zip(species1.molecule, species2.molecule):
+                self.assertEqual(sorted([entry.label for entry in molecule2.templateMappings]), sorted([entry.label for entry in molecule1.templateMappings]))
+                for entry, mappings in molecule2.templateMappings.iteritems():
+                    self.assertTrue(entry in molecule1.templateMappings)
+                    self.assertEqual(len(mappings), len(molecule1.templateMappings[entry]))
+                    for mapping in mappings:
+                        for atom, groupAtom in mapping.iteritems():
+                            self.assertTrue(atom in molecule2.atoms)
+                            self.assertTrue(atom.isSpecificCaseOf(groupAtom))
+
+################################################################################
+
+class TestUpdateNetworkKinetics(unittest.TestCase):
+    """
+    Contains unit tests of the updating of pressure-dependent networks by
+    the :class:`CoreEdgeReactionModel` class.
+    """
+
+    def makeIsomer(self, label):
+        """
+        Return a new species with the states data of 1-butanol.
+        """
+        return Species(
+            label = label,
+            conformer = Conformer(
+                E0 = (-317.807,'kJ/mol'),
+                modes = [
+                    IdealGasTranslation(mass=(74.07,"g/mol")),
+                    NonlinearRotor(inertia=([41.5091,215.751,233.258],"amu*angstrom^2"), symmetry=1),
+                    HarmonicOscillator(frequencies=([240.915,341.933,500.066,728.41,809.987,833.93,926.308,948.571,1009.3,1031.46,1076,1118.4,1184.66,1251.36,1314.36,1321.42,1381.17,1396.5,1400.54,1448.08,1480.18,1485.34,1492.24,1494.99,1586.16,2949.01,2963.03,2986.19,2988.1,2995.27,3026.03,3049.05,3053.47,3054.83,3778.88],"cm^-1")),
+                    HinderedRotor(inertia=(2.81525,"amu*angstrom^2"), symmetry=3, barrier=(2.96807,"kcal/mol")),
+                ],
+                spinMultiplicity = 1,
+                opticalIsomers = 1,
+            ),
+            molecularWeight = (74.07,"g/mol"),
+            lennardJones = LennardJones(sigma=(5.94,'angstrom'), epsilon=(559,'K')),
+            energyTransferModel = SingleExponentialDown(alpha0=(447.5*0.011962,"kJ/mol"), T0=(300,"K"), n=0.85),
+        )
+
+    def makeModel(self, processes):
+        """
+        Return a new model with the given number of `processes`, along with a
+        list of prepared networks for the dehydration of two isomers that
+        have the states data of 1-butanol.
+        """
+        model = CoreEdgeReactionModel()
+        model.processes = processes
+        model.pressureDependence = PressureDependenceJob(network=None,
+            Tmin = (300,"K"), Tmax = (2000,"K"), Tcount = 4,
+            Pmin = (0.01,"bar"), Pmax = (100,"bar"), Pcount = 3,
+            maximumGrainSize = (2.0,"kcal/mol"), minimumGrainCount = 100,
+            method = 'modified strong collision', interpolationModel = ('chebyshev', 4, 3),
+            rmgmode = True,
+        )
+        model.pressureDependence.generateTemperatureList()
+        model.pressureDependence.generatePressureList()
+        
+        nC4H8 = Species(label='n-C4H8', conformer=Conformer(E0=(-17.8832,'kJ/mol')))
+        H2O = Species(label='H2O', conformer=Conformer(E0=(-269.598,'kJ/mol')))
+        N2 = Species(
+            label = 'N2',
+            molecularWeight = (28.04,"g/mol"),
+            lennardJones = LennardJones(sigma=(3.41,"angstrom"), epsilon=(124,"K")),
+            reactive = False,
+        )
+        isomers = [self.makeIsomer('isomer1'), self.makeIsomer('isomer2')]
+        model.core.species.extend(isomers + [N2])
+        model.edge.species.extend([nC4H8, H2O])
+        
+        networks = []
+        for index, isomer in enumerate(isomers):
+            pathReaction = Reaction(
+                reactants = [isomer],
+                products = [nC4H8, H2O],
+                kinetics = Arrhenius(A=(1e13 * (index + 1),"s^-1"), n=0.0, Ea=(275.0,"kJ/mol"), T0=(1,"K")),
+                transitionState = TransitionState(conformer=Conformer(E0=(-42.8,"kJ/mol"))),
+            )
+            network = PDepNetwork(index=index+1, source=[isomer])
+            network.explored = [isomer]
+            network.isomers = [Configuration(isomer)]
+            network.products = [Configuration(nC4H8, H2O)]
+            network.pathReactions = [pathReaction]
+            network.bathGas = {N2: 1.0}
+            network.valid = False
+            networks.append(network)
+        return model, networks
+
+    def describeReaction(self, rxn):
+        """
+        Return a summary of the net reaction `rxn` to compare.
+        """
+        return (rxn.index, rxn.network.index, [spec.label for spec in rxn.reactants], [spec.label for spec in rxn.products], rxn.kinetics.coeffs.value_si.tolist())
+
+    def test_updateNetworkKinetics(self):
+        """
+        Test that updating the networks in parallel gives the same net
+        reactions, in the same order and with the same kinetics, as updating
+        them serially.
+        """
+        serialModel, serialNetworks = self.makeModel(1)
+        serialModel.updateNetworkKinetics(serialNetworks)
+        parallelModel, parallelNetworks = self.makeModel(2)
+        parallelModel.updateNetworkKinetics(parallelNetworks)
+        
+        self.assertEqual(serialModel.reactionCounter, parallelModel.reactionCounter)
+        for network in serialNetworks + parallelNetworks:
+            self.assertTrue(network.valid)
+            self.assertEqual(len(network.netReactions), 1)
+            self.assertTrue(isinstance(network.netReactions[0], PDepReaction))
+        for reactions1, reactions2 in [(serialModel.core.reactions, parallelModel.core.reactions), (serialModel.edge.reactions, parallelModel.edge.reactions)]:
+            summary1 = [self.describeReaction(rxn) for rxn in reactions1]
+            summary2 = [self.describeReaction(rxn) for rxn in reactions2]
+            self.assertEqual([data[:4] for data in summary1], [data[:4] for data in summary2])
+            for data1, data2 in zip(summary1, summary2):
+                for coeffs1, coeffs2 in zip(data1[4], data2[4]):
+                    for coeff1, coeff2 in zip(coeffs1, coeffs2):
+                        self.assertAlmostEqual(coeff1, coeff2, 6)
+        self.assertEqual([self.describeReaction(rxn)[:4] for rxn in serialModel.edge.reactions],
+                         [(1, 1, ['isomer1'], ['n-C4H8', 'H2O']), (2, 2, ['isomer2'], ['n-C4H8', 'H2O'])])
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
@@ -409,11 +409,21 @@ class PDepNetwork(rmgpy.pdep.network.Network):
         Regenerate the :math:`k(T,P)` values for this partial network if the
         network is marked as invalid.
         """
+        if not self.prepareUpdate(reactionModel, database, pdepSettings):
+            return
+        K, kineticsList = self.calculateNetKinetics(pdepSettings)
+        self.applyNetKinetics(reactionModel, pdepSettings, K, kineticsList)
+
+    def prepareUpdate(self, reactionModel, database, pdepSettings):
+        """
+        Prepare this partial network for regenerating its :math:`k(T,P)`
+        values by updating its configurations and generating any missing
+        states data, transition state energies, and collision models. Returns
+        ``True`` if the network is invalid and :meth:`calculateNetKinetics()`
+        should be called, or ``False`` if there is nothing to update.
+        """
         from rmgpy.kinetics import Arrhenius, KineticsData, MultiArrhenius
         from rmgpy.measure.collision import SingleExponentialDown
-        from rmgpy.measure.reaction import fitInterpolationModel
-        from rmgpy.measure.main import MEASURE
-        import rmgpy.measure.settings
         
         # Get the parameters for the pressure dependence calculation
         job = pdepSettings
@@ -422,17 +432,6 @@ class PDepNetwork(rmgpy.pdep.network.Network):
         
         Tmin = job.Tmin.value_si
         Tmax = job.Tmax.value_si
-        Pmin = job.Pmin.value_si
-        Pmax = job.Pmax.value_si
-        Tlist = job.Tlist.value_si
-        Plist = job.Plist.value_si
-        maximumGrainSize = job.maximumGrainSize.value_si if job.maximumGrainSize is not None else 0.0
-        minimumGrainCount = job.minimumGrainCount
-        method = job.method
-        interpolationModel = job.interpolationModel
-        activeJRotor = job.activeJRotor
-        activeKRotor = job.activeKRotor
-        rmgmode = job.rmgmode
         
         # Figure out which configurations are isomers, reactant channels, and product channels
         self.updateConfigurations(reactionModel)
@@ -445,9 +444,9 @@ class PDepNetwork(rmgpy.pdep.network.Network):
                 raise PressureDependenceError('Pressure-dependent kinetics encountered for path reaction {0} in PDepNetwork #{1:d}.'.format(rxn, self.index))
         
         # Do nothing if the network is already valid
-        if self.valid: return
+        if self.valid: return False
         # Do nothing if there are no explored wells
-        if len(self.explored) == 0 and len(self.source) > 1: return
+        if len(self.explored) == 0 and len(self.source) > 1: return False
 
         # Generate states data for unimolecular isomers and reactants if necessary
         for isomer in self.isomers:
@@ -511,15 +510,81 @@ class PDepNetwork(rmgpy.pdep.network.Network):
         
         self.printSummary(level=logging.INFO)
 
-        # Calculate the rate coefficients
-        self.initialize(Tmin, Tmax, Pmin, Pmax, maximumGrainSize, minimumGrainCount, activeJRotor, activeKRotor, rmgmode)
-        K = self.calculateRateCoefficients(Tlist, Plist, method)
+        return True
 
-        # Generate PDepReaction objects
+    def getConfigurations(self):
+        """
+        Return the list of species in each configuration of the network, in
+        the order used to index the :math:`k(T,P)` array: isomers, then
+        reactant channels, then product channels.
+        """
         configurations = []
         configurations.extend([isom.species[:] for isom in self.isomers])
         configurations.extend([reactant.species[:] for reactant in self.reactants])
         configurations.extend([product.species[:] for product in self.products])
+        return configurations
+
+    def calculateNetKinetics(self, pdepSettings):
+        """
+        Compute the :math:`k(T,P)` values for this partial network, which must
+        already have been prepared by :meth:`prepareUpdate()`, and fit the
+        interpolation model of `pdepSettings` to those of each net reaction
+        from the source configuration. Returns the array of :math:`k(T,P)`
+        values and a list of the fitted kinetics for each configuration, with
+        ``None`` for the source. This method does not modify the reaction
+        model, and so can be run in a worker process.
+        """
+        job = pdepSettings
+        
+        Tmin = job.Tmin.value_si
+        Tmax = job.Tmax.value_si
+        Pmin = job.Pmin.value_si
+        Pmax = job.Pmax.value_si
+        Tlist = job.Tlist.value_si
+        Plist = job.Plist.value_si
+        maximumGrainSize = job.maximumGrainSize.value_si if job.maximumGrainSize is not None else 0.0
+        minimumGrainCount = job.minimumGrainCount
+        method = job.method
+        activeJRotor = job.activeJRotor
+        activeKRotor = job.activeKRotor
+        rmgmode = job.rmgmode
+
+        # Calculate the rate coefficients
+        self.initialize(Tmin, Tmax, Pmin, Pmax, maximumGrainSize, minimumGrainCount, activeJRotor, activeKRotor, rmgmode)
+        K = self.calculateRateCoefficients(Tlist, Plist, method)
+
+        # Fit the interpolation model to the k(T,P) values of each net reaction
+        configurations = self.getConfigurations()
+        j = configurations.index(self.source)
+        kineticsList = []
+        for i in range(K.shape[2]):
+            if i == j:
+                kineticsList.append(None)
+                continue
+            kdata = K[:,:,i,j].copy()
+            order = len(configurations[j])
+            kdata *= 1e6 ** (order-1)
+            kunits = {1: 's^-1', 2: 'cm^3/(mol*s)', 3: 'cm^6/(mol^2*s)'}[order]
+            kineticsList.append(job.fitInterpolationModel(Tlist, Plist, kdata, kunits))
+
+        # Delete intermediate arrays to conserve memory
+        self.cleanup()
+
+        return K, kineticsList
+
+    def applyNetKinetics(self, reactionModel, pdepSettings, K, kineticsList):
+        """
+        Set the kinetics of the net reactions of this partial network to the
+        `kineticsList` fitted to the :math:`k(T,P)` values `K` by
+        :meth:`calculateNetKinetics()`, creating any new net reactions and
+        placing them in the core or edge of `reactionModel`, and mark the
+        network as valid.
+        """
+        Tlist = pdepSettings.Tlist.value_si
+        Plist = pdepSettings.Plist.value_si
+
+        # Generate PDepReaction objects
+        configurations = self.getConfigurations()
         j = configurations.index(self.source)
 
         for i in range(K.shape[2]):
@@ -548,13 +613,7 @@ class PDepNetwork(rmgpy.pdep.network.Network):
                         reactionModel.addReactionToEdge(netReaction)
 
                 # Set/update the net reaction kinetics using interpolation model
-                Tdata = job.Tlist.value_si
-                Pdata = job.Plist.value_si
-                kdata = K[:,:,i,j].copy()
-                order = len(netReaction.reactants)
-                kdata *= 1e6 ** (order-1)
-                kunits = {1: 's^-1', 2: 'cm^3/(mol*s)', 3: 'cm^6/(mol^2*s)'}[order]
-                netReaction.kinetics = job.fitInterpolationModel(Tlist, Plist, kdata, kunits)
+                netReaction.kinetics = kineticsList[i]
 
                 # Check: For each net reaction that has a path reaction, make
                 # sure the k(T,P) values for the net reaction do not exceed
@@ -585,8 +644,5 @@ class PDepNetwork(rmgpy.pdep.network.Network):
                             logging.info('    k(T,P) = {0:9.2e}    k(T) = {1:9.2e}'.format(K[t,p,i,j], kinf))
                         break
         
-        # Delete intermediate arrays to conserve memory
-        self.cleanup()
-        
         # We're done processing this network, so mark it as valid
         self.valid = True
@@ -0,0 +1,405 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   RMG - Reaction Mechanism Generator
+#
+#   Copyright (c) 2002-2010 Prof. William H. Green (whgreen@mit.edu) and the
+#   RMG Team (rmg_dev@mit.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+Contains the reading and writing of RMG restart files. Rather than pickling
+the entire reaction model, a restart file is a stream of chunks that is
+appended to each time the file is saved. Each chunk is a pickled pair of its
+kind and its contents, pickled separately to a string:
+
+* ``'species'`` chunks contain the species that are new or whose data has
+  changed, with each species stored as the adjacency lists of its resonance
+  isomers
+* ``'reactions'`` chunks contain the reactions that are new or have changed,
+  with the species and the database families, libraries, depositories and
+  entries they refer to stored as persistent ids
+* ``'pdep'`` chunks contain the pressure-dependent networks and net reactions
+* ``'model'`` chunks contain the indices of the species and reactions in the
+  core and edge and in the model's lookup dictionaries
+
+Later chunks take precedence over earlier ones. A save is complete once its
+``'model'`` chunk has been written; any chunks after the last complete save
+(e.g. if RMG was interrupted while saving) are discarded when loading.
+"""
+
+import cPickle
+import cStringIO
+import logging
+import numpy
+import os
+import os.path
+
+from rmgpy.molecule import Molecule
+from rmgpy.reaction import Reaction
+from model import Species
+from pdep import PDepReaction
+
+RESTART_VERSION = 3
+
+################################################################################
+
+def getDatabaseObjects(database, loadDeferred=False):
+    """
+    Return a list of ``(pid, object)`` pairs for the kinetics families,
+    libraries, depositories and their entries in the loaded :class:`RMGDatabase`
+    `database` that reactions may refer to. The persistent ids are formed from
+    labels, so that they identify the equivalent objects in a freshly-loaded
+    database. Nothing can yet refer to the family depositories and library
+    entries whose loading was deferred, so these are skipped unless
+    `loadDeferred` is ``True``, in which case they are loaded.
+    """
+    objects = []
+    for label, family in database.kinetics.families.iteritems():
+        objects.append((('family', label), family))
+        for key, entry in family.groups.entries.iteritems():
+            objects.append((('groupEntry', label, key), entry))
+        if family.deferredLoad is not None and not loadDeferred:
+            continue
+        depositories = family.depositories
+        if isinstance(depositories, dict):
+            depositories = depositories.values()
+        for depository in depositories:
+            objects.append((('depository', depository.label), depository))
+            for key, entry in depository.entries.iteritems():
+                objects.append((('depositoryEntry', depository.label, key), entry))
+    for label, library in database.kinetics.libraries.iteritems():
+        objects.append((('library', label), library))
+        if library.deferredLoad is not None and not loadDeferred:
+            continue
+        for key, entry in library.entries.iteritems():
+            objects.append((('libraryEntry', label, key), entry))
+    return objects
+
+################################################################################
+
+class RestartFile(object):
+    """
+    A restart file for an RMG job. The attributes are:
+
+    =================== ========================================================
+    Attribute           Description
+    =================== ========================================================
+    `path`              The location of the restart file on disk
+    `database`          The loaded :class:`RMGDatabase` the reactions refer to
+    `speciesStates`     A dictionary of the state of each species stored in the file, indexed by species index
+    `reactionStates`    A dictionary of the state of each reaction stored in the file, indexed by reaction index
+    =================== ========================================================
+
+    The first call to :meth:`save()` writes the entire model; later calls only
+    append the species and reactions that are new or have changed since, as
+    well as the current pressure-dependent networks and model indices. If the
+    number of species stored in the file grows to more than twice the number
+    in the model (e.g. due to edge pruning), the file is rewritten. Loading
+    the file truncates it after the last complete save, so that later saves
+    are appended to a valid stream.
+    """
+
+    def __init__(self, path, database):
+        self.path = path
+        self.database = database
+        self.speciesStates = {}
+        self.reactionStates = {}
+        self.objectIDs = {}
+        self.species = {}
+        self.reactions = {}
+        self.pickleReactions = True
+
+    def getSpeciesState(self, spec):
+        """
+        Return the attributes of species `spec` that determine whether it must
+        be saved again.
+        """
+        return (spec.thermo, spec.conformer, spec.lennardJones, spec.energyTransferModel,
+                spec.label, spec.reactive)
+
+    def speciesChanged(self, spec):
+        """
+        Return ``True`` if species `spec` is not stored in the file or has
+        changed since it was last stored, or ``False`` otherwise.
+        """
+        oldState = self.speciesStates.get(spec.index)
+        if oldState is None:
+            return True
+        state = self.getSpeciesState(spec)
+        return any([old is not new for old, new in zip(oldState[:4], state[:4])]) or oldState[4:] != state[4:]
+
+    def getReactionState(self, reaction):
+        """
+        Return the attributes of `reaction` that determine whether it must be
+        saved again.
+        """
+        return (reaction.kinetics, reaction.reversible, reaction.duplicate,
+                tuple([spec.index for spec in reaction.reactants]),
+                tuple([spec.index for spec in reaction.products]))
+
+    def persistentID(self, obj):
+        """
+        Return the persistent id to store in place of `obj` when pickling, or
+        ``None`` if `obj` is to be pickled as usual.
+        """
+        pid = self.objectIDs.get(id(obj))
+        if pid is not None:
+            return pid
+        if isinstance(obj, Species):
+            if self.species.get(obj.index) is obj:
+                return ('species', obj.index)
+        elif not self.pickleReactions and isinstance(obj, Reaction) and not isinstance(obj, PDepReaction):
+            if self.reactions.get(obj.index) is obj:
+                return ('reaction', obj.index)
+        return None
+
+    def writeChunk(self, f, kind, data, pickleReactions=True):
+        """
+        Write a chunk of the given `kind` containing `data` to the file `f`.
+        """
+        cPickle.dump((kind, self.dumps(data, pickleReactions)), f, cPickle.HIGHEST_PROTOCOL)
+
+    def dumps(self, data, pickleReactions=True):
+        """
+        Return `data` pickled to a string, with the species and database
+        objects replaced by persistent ids. The model reactions are also
+        replaced by persistent ids unless `pickleReactions` is ``True``.
+        """
+        f = cStringIO.StringIO()
+        pickler = cPickle.Pickler(f, cPickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = self.persistentID
+        self.pickleReactions = pickleReactions
+        pickler.dump(data)
+        return f.getvalue()
+
+    def save(self, reactionModel):
+        """
+        Save the current state of the CoreEdgeReactionModel `reactionModel`
+        to the restart file.
+        """
+        self.species = {}
+        for speciesList in reactionModel.speciesDict.itervalues():
+            for spec in speciesList:
+                self.species[spec.index] = spec
+        for spec in reactionModel.core.species + reactionModel.edge.species:
+            self.species[spec.index] = spec
+        # Parts of the database may have been loaded since the last save
+        self.objectIDs = dict([(id(obj), pid) for pid, obj in getDatabaseObjects(self.database)])
+        self.reactions = {}
+        for reactionList in reactionModel.reactionDict.itervalues():
+            for rxn in reactionList:
+                self.reactions[rxn.index] = rxn
+        for rxn in reactionModel.core.reactions + reactionModel.edge.reactions:
+            if not isinstance(rxn, PDepReaction):
+                self.reactions[rxn.index] = rxn
+
+        # Start a new file the first time or if it contains too many species
+        # that are no longer in the model
+        if not self.speciesStates or not os.path.exists(self.path) or len(self.speciesStates) > 2 * len(self.species):
+            self.speciesStates = {}
+            self.reactionStates = {}
+            f = open(self.path, 'wb')
+            cPickle.dump(('RMG restart', RESTART_VERSION), f, cPickle.HIGHEST_PROTOCOL)
+        else:
+            f = open(self.path, 'ab')
+
+        try:
+            speciesRecords = []
+            for index, spec in self.species.iteritems():
+                if self.speciesChanged(spec):
+                    speciesRecords.append((index, [molecule.toAdjacencyList() for molecule in spec.molecule], (
+                        spec.label, spec.thermo, spec.conformer, spec.lennardJones, spec.molecularWeight, spec.dipoleMoment,
+                        spec.polarizability, spec.Zrot, spec.energyTransferModel, spec.reactive, spec.coreSizeAtCreation,
+                    )))
+                    self.speciesStates[index] = self.getSpeciesState(spec)
+            self.writeChunk(f, 'species', speciesRecords)
+
+            reactionRecords = []
+            for index, rxn in self.reactions.iteritems():
+                state = self.getReactionState(rxn)
+                oldState = self.reactionStates.get(index)
+                if oldState is None or oldState[0] is not state[0] or oldState[1:] != state[1:]:
+                    reactionRecords.append(rxn)
+                    self.reactionStates[index] = state
+            self.writeChunk(f, 'reactions', reactionRecords)
+
+            pdepReactions = [rxn for rxn in reactionModel.core.reactions + reactionModel.edge.reactions if isinstance(rxn, PDepReaction)]
+            self.writeChunk(f, 'pdep', (reactionModel.networkDict, reactionModel.networkCount, pdepReactions), pickleReactions=False)
+
+            self.writeChunk(f, 'model', {
+                'speciesCounter': reactionModel.speciesCounter,
+                'reactionCounter': reactionModel.reactionCounter,
+                'coreSpecies': numpy.array([spec.index for spec in reactionModel.core.species], numpy.int64),
+                'edgeSpecies': numpy.array([spec.index for spec in reactionModel.edge.species], numpy.int64),
+                'coreReactions': numpy.array([rxn.index for rxn in reactionModel.core.reactions], numpy.int64),
+                'edgeReactions': numpy.array([rxn.index for rxn in reactionModel.edge.reactions], numpy.int64),
+                # The canonical hashes that key the species dictionary depend
+                # on the platform, so only the species in it are saved
+                'speciesDict': numpy.array(sorted(set([spec.index for speciesList in reactionModel.speciesDict.itervalues() for spec in speciesList])), numpy.int64),
+                'reactionDict': dict([(key, [rxn.index for rxn in reactionList]) for key, reactionList in reactionModel.reactionDict.iteritems()]),
+            })
+        finally:
+            f.close()
+
+    def load(self, reactionModel):
+        """
+        Load the contents of the restart file into the (empty)
+        CoreEdgeReactionModel `reactionModel`. Any incomplete save at the end
+        of the file is removed, and subsequent calls to :meth:`save()` will
+        append to the file.
+        """
+        databaseObjects = dict(getDatabaseObjects(self.database))
+        speciesRecords = {}
+        species = {}
+        reactions = {}
+        pdep = None
+        model = None
+
+        def setSpeciesData(spec, data):
+            spec.label, spec.thermo, spec.conformer, spec.lennardJones, spec.molecularWeight, spec.dipoleMoment, \
+                spec.polarizability, spec.Zrot, spec.energyTransferModel, spec.reactive, spec.coreSizeAtCreation = data
+
+        def getSpecies(index):
+            # Construct each species the first time it is referred to, since
+            # parsing the adjacency lists of the removed species is wasted
+            try:
+                return species[index]
+            except KeyError:
+                adjacencyLists, data = speciesRecords[index]
+                spec = Species(index=index, molecule=[Molecule().fromAdjacencyList(adjlist) for adjlist in adjacencyLists])
+                setSpeciesData(spec, data)
+                species[index] = spec
+                return spec
+
+        def persistentLoad(pid):
+            if pid[0] == 'species':
+                return getSpecies(pid[1])
+            elif pid[0] == 'reaction':
+                return reactions[pid[1]]
+            if pid not in databaseObjects:
+                # The object may be in a part of the database whose loading
+                # was deferred
+                databaseObjects.update(getDatabaseObjects(self.database, loadDeferred=True))
+            try:
+                return databaseObjects[pid]
+            except KeyError:
+                raise Exception("Unable to find matching {0} for {1}".format(pid[0], ' '.join([str(label) for label in pid[1:]])))
+
+        def loads(data):
+            unpickler = cPickle.Unpickler(cStringIO.StringIO(data))
+            unpickler.persistent_load = persistentLoad
+            return unpickler.load()
+
+        logging.info('Loading restart file {0}...'.format(self.path))
+        f = open(self.path, 'rb')
+        try:
+            header = cPickle.load(f)
+            if not (isinstance(header, tuple) and header[0] == 'RMG restart'):
+                raise Exception('{0} is not an RMG restart file in the current format. Please run without --restart option.'.format(self.path))
+            if header[1] != RESTART_VERSION:
+                raise Exception('Unsupported version {0} of restart file {1}.'.format(header[1], self.path))
+
+            # Read each chunk in turn, but only use those of a save once its
+            # 'model' chunk shows that the save is complete
+            validLength = f.tell()
+            pending = []
+            lastPDep = None
+            while True:
+                try:
+                    chunk = cPickle.load(f)
+                except EOFError:
+                    break
+                except (cPickle.UnpicklingError, ValueError, IndexError, KeyError, TypeError, AttributeError):
+                    # A chunk truncated by an interrupted save
+                    break
+                pending.append(chunk)
+                if chunk[0] != 'model':
+                    continue
+                for kind, data in pending:
+                    if kind == 'species':
+                        for index, adjacencyLists, data in loads(data):
+                            speciesRecords[index] = (adjacencyLists, data)
+                            if index in species:
+                                setSpeciesData(species[index], data)
+                    elif kind == 'reactions':
+                        for rxn in loads(data):
+                            reactions[rxn.index] = rxn
+                    elif kind == 'pdep':
+                        lastPDep = data
+                    elif kind == 'model':
+                        model, pdep = loads(data), lastPDep
+                pending = []
+                validLength = f.tell()
+        finally:
+            f.close()
+
+        if model is None:
+            raise Exception('Restart file {0} does not contain a complete reaction model.'.format(self.path))
+
+        # Remove any incomplete save from the end of the file, so that the
+        # next save does not append to it
+        if os.path.getsize(self.path) > validLength:
+            logging.warning('Removing incomplete save at the end of restart file {0}.'.format(self.path))
+            f = open(self.path, 'r+b')
+            try:
+                f.truncate(validLength)
+            finally:
+                f.close()
+
+        networkDict, networkCount, pdepReactions = loads(pdep)
+        for rxn in pdepReactions:
+            reactions[rxn.index] = rxn
+        for networks in networkDict.itervalues():
+            for network in networks:
+                for rxn in network.netReactions:
+                    reactions[rxn.index] = rxn
+
+        reactionModel.speciesCounter = model['speciesCounter']
+        reactionModel.reactionCounter = model['reactionCounter']
+        reactionModel.core.species = [getSpecies(index) for index in model['coreSpecies']]
+        reactionModel.edge.species = [getSpecies(index) for index in model['edgeSpecies']]
+        reactionModel.core.reactions = [reactions[index] for index in model['coreReactions']]
+        reactionModel.edge.reactions = [reactions[index] for index in model['edgeReactions']]
+        reactionModel.speciesDict = {}
+        for index in model['speciesDict']:
+            spec = getSpecies(index)
+            for molecule in spec.molecule:
+                speciesList = reactionModel.speciesDict.setdefault(molecule.getCanonicalHash(), [])
+                if spec not in speciesList:
+                    speciesList.append(spec)
+        reactionModel.reactionDict = dict([(key, [reactions[index] for index in indices]) for key, indices in model['reactionDict'].iteritems()])
+        reactionModel.reactionKeys = {}
+        for key in reactionModel.reactionDict:
+            for index in key[0] + key[1]:
+                reactionModel.reactionKeys.setdefault(index, set()).add(key)
+        reactionModel.networkDict = networkDict
+        reactionModel.networkCount = networkCount
+
+        # Remember what the file contains so the next save only appends to it
+        self.speciesStates = dict([(index, self.getSpeciesState(species[index]) if index in species else None) for index in speciesRecords])
+        self.reactionStates = {}
+        for reactionList in reactionModel.reactionDict.itervalues():
+            for rxn in reactionList:
+                self.reactionStates[rxn.index] = self.getReactionState(rxn)
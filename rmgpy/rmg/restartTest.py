@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+"""
+This script contains unit tests of the :mod:`rmgpy.rmg.restart` module.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+
+from rmgpy.molecule import Molecule
+from rmgpy.kinetics import Arrhenius
+from rmgpy.thermo import ThermoData
+from rmgpy.statmech import Conformer
+from rmgpy.data.kinetics import KineticsDatabase, KineticsLibrary, LibraryReaction
+from rmgpy.rmg.model import CoreEdgeReactionModel
+from rmgpy.rmg.restart import RestartFile
+
+################################################################################
+
+class RestartDatabase(object):
+    """
+    The part of an :class:`RMGDatabase` that restart files refer to, with a
+    single empty kinetics library.
+    """
+    def __init__(self):
+        self.kinetics = KineticsDatabase()
+        self.kinetics.libraries['test'] = KineticsLibrary(label='test')
+        self.kinetics.libraryOrder = ['test']
+
+class TestRestartFile(unittest.TestCase):
+    """
+    Contains unit tests of the :class:`RestartFile` class.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'restart.pkl')
+        self.database = RestartDatabase()
+        self.model = CoreEdgeReactionModel()
+        CH4 = self.addSpecies('C', core=True)
+        CH3 = self.addSpecies('[CH3]', core=True)
+        H = self.addSpecies('[H]', core=True)
+        self.addReaction([CH4], [CH3, H], core=True)
+
+    def tearDown(self):
+        """
+        A function run after each unit test in this class.
+        """
+        shutil.rmtree(self.directory)
+
+    def addSpecies(self, smiles, core=False):
+        """
+        Add a new species with the given `smiles` string and placeholder
+        thermo data to the core or edge of the model.
+        """
+        spec = self.model.makeNewSpecies(Molecule().fromSMILES(smiles))[0]
+        spec.thermo = ThermoData(
+            Tdata = ([300,400,500,600,800,1000,1500],"K"),
+            Cpdata = ([10.0,11.0,12.0,13.0,14.0,15.0,16.0],"cal/(mol*K)"),
+            H298 = (10.0 * spec.index,"kcal/mol"),
+            S298 = (50.0,"cal/(mol*K)"),
+        )
+        if core:
+            self.model.core.species.append(spec)
+        else:
+            self.model.edge.species.append(spec)
+        return spec
+
+    def addReaction(self, reactants, products, core=False):
+        """
+        Add a new library reaction between the given `reactants` and
+        `products` species to the core or edge of the model.
+        """
+        rxn = LibraryReaction(
+            reactants = reactants,
+            products = products,
+            kinetics = Arrhenius(A=(1e13,"s^-1"), n=0.0, Ea=(100.0,"kJ/mol"), T0=(1,"K")),
+            library = self.database.kinetics.libraries['test'],
+        )
+        rxn = self.model.makeNewReaction(rxn)[0]
+        if core:
+            self.model.addReactionToCore(rxn)
+        else:
+            self.model.addReactionToEdge(rxn)
+        return rxn
+
+    def load(self):
+        """
+        Return a new model loaded from the restart file, along with the
+        :class:`RestartFile` object used to load it.
+        """
+        restartFile = RestartFile(self.path, self.database)
+        model = CoreEdgeReactionModel()
+        restartFile.load(model)
+        return model, restartFile
+
+    def assertModelsEqual(self, model1, model2):
+        """
+        Check that the species and reactions of the core and edge of the two
+        models are the same.
+        """
+        self.assertEqual(model1.speciesCounter, model2.speciesCounter)
+        self.assertEqual(model1.reactionCounter, model2.reactionCounter)
+        for speciesList1, speciesList2 in [(model1.core.species, model2.core.species), (model1.edge.species, model2.edge.species)]:
+            self.assertEqual([spec.index for spec in speciesList1], [spec.index for spec in speciesList2])
+            for spec1, spec2 in zip(speciesList1, speciesList2):
+                self.assertEqual(spec1.label, spec2.label)
+                self.assertEqual(spec1.reactive, spec2.reactive)
+                self.assertTrue(spec1.isIsomorphic(spec2))
+                self.assertAlmostEqual(spec1.thermo.H298.value_si, spec2.thermo.H298.value_si)
+                self.assertEqual(spec1.conformer is None, spec2.conformer is None)
+        for reactionList1, reactionList2 in [(model1.core.reactions, model2.core.reactions), (model1.edge.reactions, model2.edge.reactions)]:
+            self.assertEqual([rxn.index for rxn in reactionList1], [rxn.index for rxn in reactionList2])
+            for rxn1, rxn2 in zip(reactionList1, reactionList2):
+                self.assertEqual([spec.index for spec in rxn1.reactants], [spec.index for spec in rxn2.reactants])
+                self.assertEqual([spec.index for spec in rxn1.products], [spec.index for spec in rxn2.products])
+                self.assertTrue(rxn2.library is self.database.kinetics.libraries['test'])
+        self.assertEqual(sorted(model1.speciesDict.keys()), sorted(model2.speciesDict.keys()))
+        for key, speciesList in model1.speciesDict.iteritems():
+            self.assertEqual([spec.index for spec in speciesList], [spec.index for spec in model2.speciesDict[key]])
+        self.assertEqual(sorted(model1.reactionDict.keys()), sorted(model2.reactionDict.keys()))
+        self.assertEqual(model1.reactionKeys, model2.reactionKeys)
+
+    def test_saveAndLoad(self):
+        """
+        Test that a saved model is loaded back unchanged.
+        """
+        RestartFile(self.path, self.database).save(self.model)
+        model, restartFile = self.load()
+        self.assertModelsEqual(self.model, model)
+        # The loaded species are the same objects wherever they are used
+        self.assertTrue(model.core.reactions[0].reactants[0] is model.core.species[0])
+
+    def test_speciesDictRebuilt(self):
+        """
+        Test that the species dictionary is rebuilt from the canonical hashes
+        of the loaded species rather than from the saved ones, which depend
+        on the platform.
+        """
+        RestartFile(self.path, self.database).save(self.model)
+        model, restartFile = self.load()
+        for spec in model.core.species:
+            for molecule in spec.molecule:
+                self.assertTrue(spec in model.speciesDict[molecule.getCanonicalHash()])
+        found, spec = model.checkForExistingSpecies(Molecule().fromSMILES('[CH3]'))
+        self.assertTrue(found)
+        self.assertTrue(spec is model.core.species[1])
+
+    def test_appendedSave(self):
+        """
+        Test that changes saved by appending to the file are loaded,
+        including changes to species that keep the same thermo data.
+        """
+        restartFile = RestartFile(self.path, self.database)
+        restartFile.save(self.model)
+        size = os.path.getsize(self.path)
+        
+        C2H6 = self.addSpecies('CC')
+        self.addReaction([self.model.core.species[1], self.model.core.species[1]], [C2H6])
+        self.model.core.species[0].conformer = Conformer(E0=(-100.0,"kJ/mol"))
+        self.model.core.species[1].label = 'methyl'
+        self.model.core.species[2].reactive = False
+        restartFile.save(self.model)
+        self.assertTrue(os.path.getsize(self.path) > size)
+        
+        model, restartFile = self.load()
+        self.assertModelsEqual(self.model, model)
+        self.assertAlmostEqual(model.core.species[0].conformer.E0.value_si, -100000.0)
+        self.assertEqual(model.core.species[1].label, 'methyl')
+        self.assertFalse(model.core.species[2].reactive)
+        
+    def test_truncatedSave(self):
+        """
+        Test that an incomplete save at the end of the file is ignored and
+        removed, so that saves made after loading are not lost.
+        """
+        restartFile = RestartFile(self.path, self.database)
+        restartFile.save(self.model)
+        size = os.path.getsize(self.path)
+        self.addSpecies('CC')
+        restartFile.save(self.model)
+        
+        # Simulate a save interrupted partway through
+        f = open(self.path, 'r+b')
+        f.truncate(size + (os.path.getsize(self.path) - size) / 2)
+        f.close()
+        
+        model, restartFile = self.load()
+        self.assertEqual(len(model.edge.species), 0)
+        self.assertEqual(os.path.getsize(self.path), size)
+        
+        # Saves appended after loading are kept
+        spec = model.makeNewSpecies(Molecule().fromSMILES('CCC'))[0]
+        spec.thermo = model.core.species[0].thermo
+        model.edge.species.append(spec)
+        restartFile.save(model)
+        model2, restartFile2 = self.load()
+        self.assertModelsEqual(model, model2)
+        self.assertEqual(len(model2.edge.species), 1)
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
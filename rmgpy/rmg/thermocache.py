@@ -0,0 +1,219 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   RMG - Reaction Mechanism Generator
+#
+#   Copyright (c) 2002-2010 Prof. William H. Green (whgreen@mit.edu) and the
+#   RMG Team (rmg_dev@mit.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+Contains a persistent on-disk cache of the thermodynamics parameters generated
+for species by RMG, so that they need not be estimated again in later jobs or
+restarts that use the same thermodynamics database.
+"""
+
+import cPickle
+import hashlib
+import logging
+import sqlite3
+
+from rmgpy.molecule import Molecule
+
+################################################################################
+
+def getThermoDatabaseHash(database):
+    """
+    Return a hexadecimal digest of the contents of the loaded
+    :class:`ThermoDatabase` `database` that affect the thermodynamics
+    parameters generated for a species: the libraries (in order) and the
+    group additivity values. The depository is not used for estimation, so it
+    is not included.
+    """
+    digest = hashlib.md5()
+    databases = [(name, database.libraries[name]) for name in database.libraryOrder]
+    databases.extend([(name, database.groups[name]) for name in sorted(database.groups)])
+    for name, db in databases:
+        digest.update('{0}\n'.format(name))
+        for label in sorted(db.entries):
+            entry = db.entries[label]
+            if hasattr(entry.item, 'toAdjacencyList'):
+                item = entry.item.toAdjacencyList()
+            else:
+                item = str(entry.item)
+            parent = entry.parent.label if entry.parent is not None else ''
+            digest.update('{0}\n{1}\n{2}\n{3!r}\n'.format(label, parent, item, entry.data))
+    return digest.hexdigest()
+
+################################################################################
+
+class ThermoCache(object):
+    """
+    A persistent cache of species thermodynamics parameters, stored in an
+    SQLite database on disk. The attributes are:
+
+    =================== ========================================================
+    Attribute           Description
+    =================== ========================================================
+    `path`              The location of the SQLite database on disk
+    `databaseHash`      A digest of the thermodynamics database used to generate the parameters
+    `maximumSize`       The maximum number of sets of parameters to store
+    `lastUsed`          A dictionary of the times of use of the sets of parameters retrieved since the last commit, indexed by row id
+    =================== ========================================================
+
+    Each set of parameters is stored with the canonical hash of the species
+    (the smallest canonical hash of its resonance isomers), the adjacency list
+    of one of its resonance isomers to resolve hash collisions, the name of the
+    thermodynamics class, and the database digest. Sets generated with a
+    different database are never returned. When the cache grows larger than
+    `maximumSize`, the least recently used sets of parameters are removed.
+    Retrieving parameters does not write to the database; the times of use
+    are kept in memory and written by the next :meth:`put()` or
+    :meth:`commit()`.
+
+    Estimating thermodynamics parameters also sorts the resonance isomers of
+    the species, so the adjacency lists of the resonance isomers in that order
+    are stored as well and the same order is applied when the parameters are
+    retrieved.
+    """
+
+    def __init__(self, path, databaseHash, maximumSize=100000):
+        self.path = path
+        self.databaseHash = databaseHash
+        self.maximumSize = maximumSize
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS thermo (
+                id INTEGER PRIMARY KEY,
+                speciesHash INTEGER,
+                databaseHash TEXT,
+                thermoClass TEXT,
+                adjacencyList TEXT,
+                thermo BLOB,
+                lastUsed INTEGER,
+                moleculeOrder BLOB
+            )
+        """)
+        # Add the column for the order of the resonance isomers to caches
+        # created before it existed; rows without it are never returned
+        columns = [row[1] for row in self.connection.execute('PRAGMA table_info(thermo)')]
+        if 'moleculeOrder' not in columns:
+            self.connection.execute('ALTER TABLE thermo ADD COLUMN moleculeOrder BLOB')
+        self.connection.execute("""
+            CREATE INDEX IF NOT EXISTS thermoIndex ON thermo (speciesHash, databaseHash, thermoClass)
+        """)
+        self.connection.commit()
+        self.counter = self.connection.execute('SELECT MAX(lastUsed) FROM thermo').fetchone()[0] or 0
+        self.lastUsed = {}
+
+    def __reduce__(self):
+        """
+        A helper function used when pickling a ThermoCache object. The SQLite
+        connection is reopened when unpickling.
+        """
+        return (ThermoCache, (self.path, self.databaseHash, self.maximumSize))
+
+    def getSpeciesHash(self, species):
+        """
+        Return the canonical hash of the given `species`, which is the smallest
+        canonical hash of its resonance isomers.
+        """
+        return min([molecule.getCanonicalHash() for molecule in species.molecule])
+
+    def get(self, species, thermoClass):
+        """
+        Return the cached thermodynamics parameters of the `thermoClass` type
+        for the given `species`, or ``None`` if they are not in the cache. If
+        found, the resonance isomers of `species` are also sorted into the
+        order they had when the parameters were stored.
+        """
+        rows = self.connection.execute(
+            'SELECT id, adjacencyList, thermo, moleculeOrder FROM thermo WHERE speciesHash = ? AND databaseHash = ? AND thermoClass = ? AND moleculeOrder IS NOT NULL',
+            (self.getSpeciesHash(species), self.databaseHash, thermoClass.__name__),
+        ).fetchall()
+        for rowid, adjacencyList, thermo, moleculeOrder in rows:
+            if species.isIsomorphic(Molecule().fromAdjacencyList(str(adjacencyList))):
+                self.counter += 1
+                self.lastUsed[rowid] = self.counter
+                self.sortMolecules(species, cPickle.loads(str(moleculeOrder)))
+                return cPickle.loads(str(thermo))
+        return None
+
+    def sortMolecules(self, species, moleculeOrder):
+        """
+        Sort the resonance isomers of `species` into the order given by the
+        list of adjacency lists `moleculeOrder`. Any resonance isomers not in
+        the list are placed at the end in their current order.
+        """
+        molecules = species.molecule[:]
+        sortedMolecules = []
+        for adjacencyList in moleculeOrder:
+            other = Molecule().fromAdjacencyList(adjacencyList)
+            for molecule in molecules:
+                if molecule.isIsomorphic(other):
+                    sortedMolecules.append(molecule)
+                    molecules.remove(molecule)
+                    break
+        species.molecule = sortedMolecules + molecules
+
+    def put(self, species, thermoClass, thermo):
+        """
+        Store the thermodynamics parameters `thermo` of the `thermoClass` type
+        for the given `species` in the cache, removing the least recently
+        used parameters if the cache is full.
+        """
+        # The times of use must be up to date to find the least recently used
+        self.updateLastUsed()
+        self.counter += 1
+        self.connection.execute(
+            'INSERT INTO thermo (speciesHash, databaseHash, thermoClass, adjacencyList, thermo, lastUsed, moleculeOrder) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (self.getSpeciesHash(species), self.databaseHash, thermoClass.__name__, species.molecule[0].toAdjacencyList(),
+             sqlite3.Binary(cPickle.dumps(thermo, cPickle.HIGHEST_PROTOCOL)), self.counter,
+             sqlite3.Binary(cPickle.dumps([molecule.toAdjacencyList() for molecule in species.molecule], cPickle.HIGHEST_PROTOCOL))),
+        )
+        count = self.connection.execute('SELECT COUNT(*) FROM thermo').fetchone()[0]
+        if count > self.maximumSize:
+            logging.debug('Removing {0:d} least recently used entries from thermo cache.'.format(count - self.maximumSize))
+            self.connection.execute(
+                'DELETE FROM thermo WHERE id IN (SELECT id FROM thermo ORDER BY lastUsed LIMIT ?)',
+                (count - self.maximumSize,),
+            )
+        self.connection.commit()
+
+    def updateLastUsed(self):
+        """
+        Write the times of use of the parameters retrieved since the last
+        commit to the database, without committing.
+        """
+        if self.lastUsed:
+            self.connection.executemany('UPDATE thermo SET lastUsed = ? WHERE id = ?', [(counter, rowid) for rowid, counter in self.lastUsed.iteritems()])
+            self.lastUsed = {}
+
+    def commit(self):
+        """
+        Write the times of use of the parameters retrieved since the last
+        commit to the database and commit them.
+        """
+        self.updateLastUsed()
+        self.connection.commit()
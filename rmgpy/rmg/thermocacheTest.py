@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+"""
+This script contains unit tests of the :mod:`rmgpy.rmg.thermocache` module.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+
+from rmgpy.molecule import Molecule
+from rmgpy.species import Species
+from rmgpy.thermo import ThermoData, NASA
+from rmgpy.rmg.thermocache import ThermoCache
+
+################################################################################
+
+class TestThermoCache(unittest.TestCase):
+    """
+    Contains unit tests of the :class:`ThermoCache` class.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'thermo.sqlite')
+        self.cache = ThermoCache(self.path, 'abc')
+        self.thermo = ThermoData(
+            Tdata = ([300,400,500,600,800,1000,1500],"K"),
+            Cpdata = ([10.0,11.0,12.0,13.0,14.0,15.0,16.0],"cal/(mol*K)"),
+            H298 = (40.0,"kcal/mol"),
+            S298 = (60.0,"cal/(mol*K)"),
+        )
+
+    def tearDown(self):
+        """
+        A function run after each unit test in this class.
+        """
+        self.cache.connection.close()
+        shutil.rmtree(self.directory)
+
+    def makeSpecies(self, smiles):
+        """
+        Return a species with all of its resonance isomers for the given
+        `smiles` string.
+        """
+        species = Species(molecule=[Molecule().fromSMILES(smiles)])
+        species.generateResonanceIsomers()
+        return species
+
+    def test_getAndPut(self):
+        """
+        Test that stored parameters are only returned for the same species,
+        thermodynamics class, and database.
+        """
+        species = self.makeSpecies('CC')
+        self.assertTrue(self.cache.get(species, ThermoData) is None)
+        self.cache.put(species, ThermoData, self.thermo)
+        thermo = self.cache.get(self.makeSpecies('CC'), ThermoData)
+        self.assertAlmostEqual(thermo.H298.value_si, self.thermo.H298.value_si)
+        self.assertTrue(self.cache.get(self.makeSpecies('CCC'), ThermoData) is None)
+        self.assertTrue(self.cache.get(species, NASA) is None)
+        other = ThermoCache(self.path, 'def')
+        self.assertTrue(other.get(species, ThermoData) is None)
+        other.connection.close()
+
+    def test_persistence(self):
+        """
+        Test that stored parameters are returned by a cache reopened from
+        the same file.
+        """
+        self.cache.put(self.makeSpecies('CC'), ThermoData, self.thermo)
+        cache = ThermoCache(self.path, 'abc')
+        self.assertFalse(cache.get(self.makeSpecies('CC'), ThermoData) is None)
+        cache.connection.close()
+
+    def test_moleculeOrder(self):
+        """
+        Test that the resonance isomers of a species retrieved from the cache
+        are sorted into the order they had when stored.
+        """
+        species = self.makeSpecies('[CH2]C=CC=C')
+        self.assertTrue(len(species.molecule) > 1)
+        order = [molecule.toAdjacencyList() for molecule in species.molecule]
+        self.cache.put(species, ThermoData, self.thermo)
+        
+        other = self.makeSpecies('[CH2]C=CC=C')
+        other.molecule.reverse()
+        self.assertFalse(self.cache.get(other, ThermoData) is None)
+        self.assertEqual(len(other.molecule), len(order))
+        for molecule, adjacencyList in zip(other.molecule, order):
+            self.assertTrue(molecule.isIsomorphic(Molecule().fromAdjacencyList(adjacencyList)))
+
+    def test_maximumSize(self):
+        """
+        Test that the least recently used parameters are removed when the
+        cache is full.
+        """
+        cache = ThermoCache(os.path.join(self.directory, 'small.sqlite'), 'abc', maximumSize=2)
+        cache.put(self.makeSpecies('C'), ThermoData, self.thermo)
+        cache.put(self.makeSpecies('CC'), ThermoData, self.thermo)
+        self.assertFalse(cache.get(self.makeSpecies('C'), ThermoData) is None)
+        cache.put(self.makeSpecies('CCC'), ThermoData, self.thermo)
+        self.assertFalse(cache.get(self.makeSpecies('C'), ThermoData) is None)
+        self.assertTrue(cache.get(self.makeSpecies('CC'), ThermoData) is None)
+        self.assertFalse(cache.get(self.makeSpecies('CCC'), ThermoData) is None)
+        cache.connection.close()
+
+    def test_getDoesNotWrite(self):
+        """
+        Test that retrieving parameters does not write to the database, and
+        that the times of use are written by the next commit.
+        """
+        self.cache.put(self.makeSpecies('CC'), ThermoData, self.thermo)
+        changes = self.cache.connection.total_changes
+        for i in range(3):
+            self.assertFalse(self.cache.get(self.makeSpecies('CC'), ThermoData) is None)
+        self.assertEqual(self.cache.connection.total_changes, changes)
+        self.assertEqual(len(self.cache.lastUsed), 1)
+
+        self.cache.commit()
+        self.assertEqual(self.cache.lastUsed, {})
+        cache = ThermoCache(self.path, 'abc')
+        self.assertEqual(cache.counter, self.cache.counter)
+        cache.connection.close()
+
+################################################################################
+
+if __name__ == '__main__':
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
@@ -45,6 +45,7 @@ cdef class ReactionSystem(DASSL):
     cdef public numpy.ndarray sensitivityCoefficients
     
     cdef public list termination
+    cdef public bint sparse
 
     cpdef initializeModel(self, list coreSpecies, list coreReactions, list edgeSpecies, list edgeReactions, list pdepNetworks=?, atol=?, rtol=?)
 
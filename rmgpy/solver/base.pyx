@@ -35,6 +35,8 @@ cdef extern from "math.h":
 
 import numpy
 cimport numpy
+import scipy.sparse
+import scipy.sparse.linalg
 import rmgpy.constants as constants
 cimport rmgpy.constants as constants
 from pydas cimport DASSL
@@ -48,10 +50,13 @@ from rmgpy.quantity import Quantity
 
 cdef class ReactionSystem(DASSL):
     """
-    A base class for all RMG reaction systems.
+    A base class for all RMG reaction systems. If `sparse` is ``True``, the
+    Jacobian of the governing equations is stored as a sparse matrix and the
+    linear systems arising in the sensitivity analysis are solved with a
+    sparse direct solver.
     """
 
-    def __init__(self, termination=None):
+    def __init__(self, termination=None, sparse=False):
         DASSL.__init__(self)
         # The reaction and species rates at the current time (in mol/m^3*s)
         self.coreSpeciesConcentrations = None
@@ -65,6 +70,7 @@ cdef class ReactionSystem(DASSL):
         self.maxNetworkLeakRates = None
         self.sensitivityCoefficients = None
         self.termination = termination or []
+        self.sparse = sparse
     
     cpdef initializeModel(self, list coreSpecies, list coreReactions, list edgeSpecies, list edgeReactions, list pdepNetworks=None, atol=1e-16, rtol=1e-8):
         """
@@ -129,7 +135,7 @@ cdef class ReactionSystem(DASSL):
         cdef bint terminated
         cdef object maxSpecies, maxNetwork
         cdef int iteration, i
-        cdef numpy.ndarray[numpy.float64_t, ndim=2] A, sens, b
+        cdef numpy.ndarray[numpy.float64_t, ndim=2] sens, b
         
         pdepNetworks = pdepNetworks or []
 
@@ -182,9 +188,13 @@ cdef class ReactionSystem(DASSL):
             self.step(stepTime)
             iteration += 1
             if sensitivity:
-                A = self.jacobianMatrix - 1 / (self.t - prevTime) * numpy.identity(numCoreSpecies, numpy.float64)
                 b = - 1 / (self.t - prevTime) * sens - self.computeRateDerivative() 
-                sens = numpy.dot(numpy.linalg.inv(A), b)                
+                if self.sparse:
+                    A = self.jacobianMatrix - 1 / (self.t - prevTime) * scipy.sparse.identity(numCoreSpecies, numpy.float64, format='csc')
+                    sens = scipy.sparse.linalg.splu(A.tocsc()).solve(b)
+                else:
+                    A = self.jacobianMatrix - 1 / (self.t - prevTime) * numpy.identity(numCoreSpecies, numpy.float64)
+                    sens = numpy.dot(numpy.linalg.inv(A), b)                
                 prevTime = self.t
                 
             if worksheet:
@@ -32,6 +32,7 @@ consisting of a homogeneous, isothermal, isobaric batch reactor.
 
 import numpy
 cimport numpy
+import itertools
 from pydas cimport DASSL
 from base cimport ReactionSystem
 cimport cython
@@ -40,12 +41,22 @@ import rmgpy.constants as constants
 cimport rmgpy.constants as constants
 from rmgpy.quantity import Quantity
 from rmgpy.quantity cimport ScalarQuantity, ArrayQuantity
+from rmgpy.kinetics.table import KineticsTable
+from rmgpy.thermo.table import getEquilibriumConstants
 
 cdef class SimpleReactor(ReactionSystem):
     """
     A reaction system consisting of a homogeneous, isothermal, isobaric batch
     reactor. These assumptions allow for a number of optimizations that enable
     this solver to complete very rapidly, even for large kinetic models.
+    If `sparse` is ``True``, the Jacobian is assembled in sparse format
+    directly from the reactant and product index arrays of the core reactions,
+    which is much cheaper than the dense assembly for large model cores.
+    
+    The forward and reverse rate coefficients of each reaction are cached in
+    `rateCoefficientCache` (keyed by reaction), so that reinitializing the
+    reactor after an enlarge step only evaluates k(T,P) and K_eq(T) for new
+    reactions and reactions whose kinetics have been replaced.
     """
 
     cdef public ScalarQuantity T
@@ -58,10 +69,13 @@ cdef class SimpleReactor(ReactionSystem):
     cdef public numpy.ndarray forwardRateCoefficients
     cdef public numpy.ndarray reverseRateCoefficients
     cdef public numpy.ndarray networkLeakCoefficients
-    cdef public numpy.ndarray jacobianMatrix
+    cdef public object coreStoichiometry
+    cdef public object edgeStoichiometry
+    cdef public object jacobianMatrix
+    cdef public dict rateCoefficientCache
 
-    def __init__(self, T, P, initialMoleFractions, termination):
-        ReactionSystem.__init__(self, termination)
+    def __init__(self, T, P, initialMoleFractions, termination, sparse=False):
+        ReactionSystem.__init__(self, termination, sparse)
         self.T = Quantity(T)
         self.P = Quantity(P)
         self.initialMoleFractions = initialMoleFractions
@@ -72,7 +86,10 @@ cdef class SimpleReactor(ReactionSystem):
         self.networkIndices = None
         self.forwardRateCoefficients = None
         self.reverseRateCoefficients = None
+        self.coreStoichiometry = None
+        self.edgeStoichiometry = None
         self.jacobianMatrix = None
+        self.rateCoefficientCache = {}
 
     cpdef initializeModel(self, list coreSpecies, list coreReactions, list edgeSpecies, list edgeReactions, list pdepNetworks=None, atol=1e-16, rtol=1e-8):
         """
@@ -86,8 +103,10 @@ cdef class SimpleReactor(ReactionSystem):
 
         cdef int numCoreSpecies, numCoreReactions, numEdgeSpecies, numEdgeReactions, numPdepNetworks
         cdef int i, j, l, index
-        cdef double V
-        cdef dict speciesIndex, reactionIndex
+        cdef double V, kf, kr
+        cdef dict speciesIndex, rateCoefficientCache
+        cdef list newReactions
+        cdef set newSpecies
         cdef numpy.ndarray[numpy.int_t, ndim=2] reactantIndices, productIndices, networkIndices
         cdef numpy.ndarray[numpy.float64_t, ndim=1] forwardRateCoefficients, reverseRateCoefficients, networkLeakCoefficients
         
@@ -105,30 +124,53 @@ cdef class SimpleReactor(ReactionSystem):
             speciesIndex[spec] = index
         for index, spec in enumerate(edgeSpecies):
             speciesIndex[spec] = index + numCoreSpecies
-        # Assign an index to each reaction (core first, then edge)
-        reactionIndex = {}
-        for index, rxn in enumerate(coreReactions):
-            reactionIndex[rxn] = index
-        for index, rxn in enumerate(edgeReactions):
-            reactionIndex[rxn] = index + numCoreReactions
 
         # Generate reactant and product indices
         # Generate forward and reverse rate coefficients k(T,P)
+        # Reactions are indexed core first, then edge
+        # Only a few reactions change between successive calls (i.e. between
+        # enlarge iterations), so the rate coefficients of reactions whose
+        # kinetics are unchanged since the previous call are reused
         reactantIndices = -numpy.ones((numCoreReactions + numEdgeReactions, 3), numpy.int )
         productIndices = -numpy.ones_like(reactantIndices)
         forwardRateCoefficients = numpy.zeros((numCoreReactions + numEdgeReactions), numpy.float64)
         reverseRateCoefficients = numpy.zeros_like(forwardRateCoefficients)
-        for rxnList in [coreReactions, edgeReactions]:
-            for rxn in rxnList:
-                j = reactionIndex[rxn]
-                forwardRateCoefficients[j] = rxn.getRateCoefficient(self.T.value_si, self.P.value_si)
-                reverseRateCoefficients[j] = forwardRateCoefficients[j] / rxn.getEquilibriumConstant(self.T.value_si)
-                for l, spec in enumerate(rxn.reactants):
-                    i = speciesIndex[spec]
-                    reactantIndices[j,l] = i
-                for l, spec in enumerate(rxn.products):
-                    i = speciesIndex[spec]
-                    productIndices[j,l] = i
+        rateCoefficientCache = {}
+        newReactions = []
+        for j, rxn in enumerate(itertools.chain(coreReactions, edgeReactions)):
+            try:
+                kinetics, kf, kr = self.rateCoefficientCache[rxn]
+            except KeyError:
+                kinetics = None
+            if kinetics is None or kinetics is not rxn.kinetics:
+                newReactions.append((j, rxn))
+            else:
+                rateCoefficientCache[rxn] = (kinetics, kf, kr)
+                forwardRateCoefficients[j] = kf
+                reverseRateCoefficients[j] = kr
+            for l, spec in enumerate(rxn.reactants):
+                i = speciesIndex[spec]
+                reactantIndices[j,l] = i
+            for l, spec in enumerate(rxn.products):
+                i = speciesIndex[spec]
+                productIndices[j,l] = i
+        # The forward rate coefficients and equilibrium constants of the
+        # remaining reactions are evaluated together using tables of their
+        # kinetics and of the thermo of the species they involve
+        if newReactions:
+            newSpecies = set()
+            for j, rxn in newReactions:
+                newSpecies.update(rxn.reactants)
+                newSpecies.update(rxn.products)
+            newRateCoefficients = KineticsTable([rxn.kinetics for j, rxn in newReactions]).getRateCoefficients(self.T.value_si, self.P.value_si)
+            newEquilibriumConstants = getEquilibriumConstants([rxn for j, rxn in newReactions], list(newSpecies), self.T.value_si)
+            for (j, rxn), kf, Keq in zip(newReactions, newRateCoefficients, newEquilibriumConstants):
+                kr = kf / Keq
+                rateCoefficientCache[rxn] = (rxn.kinetics, kf, kr)
+                forwardRateCoefficients[j] = kf
+                reverseRateCoefficients[j] = kr
+        # Replacing the cache also discards reactions no longer in the model
+        self.rateCoefficientCache = rateCoefficientCache
 
         networkIndices = -numpy.ones((numPdepNetworks, 3), numpy.int )
         networkLeakCoefficients = numpy.zeros((numPdepNetworks), numpy.float64)
@@ -145,6 +187,12 @@ cdef class SimpleReactor(ReactionSystem):
         self.networkIndices = networkIndices
         self.networkLeakCoefficients = networkLeakCoefficients
         
+        # Generate the stoichiometry matrices used to convert reaction rates
+        # to species rates; only core species are affected by core reactions,
+        # and we only monitor the edge species affected by edge reactions
+        self.coreStoichiometry = generateStoichiometryMatrix(reactantIndices[:numCoreReactions,:], productIndices[:numCoreReactions,:], 0, numCoreSpecies)
+        self.edgeStoichiometry = generateStoichiometryMatrix(reactantIndices[numCoreReactions:,:], productIndices[numCoreReactions:,:], numCoreSpecies, numEdgeSpecies)
+        
         # Set initial conditions
         t0 = 0.0
         y0 = numpy.zeros((numCoreSpecies), numpy.float64)
@@ -174,126 +222,43 @@ cdef class SimpleReactor(ReactionSystem):
 
         """
         Return the residual function for the governing DAE system for the
-        simple reaction system.
+        simple reaction system. The rates of all core and edge reactions are
+        evaluated at once from the reactant and product index arrays, then
+        converted to species rates using the precomputed stoichiometry
+        matrices.
         """
-        cdef numpy.ndarray[numpy.int_t, ndim=2] ir, ip, inet
-        cdef numpy.ndarray[numpy.float64_t, ndim=1] res, kf, kr, knet
-        cdef int numCoreSpecies, numCoreReactions, numEdgeSpecies, numEdgeReactions, numPdepNetworks
-        cdef int j, first, second, third
-        cdef double k, V, reactionRate
+        cdef numpy.ndarray[numpy.float64_t, ndim=1] res, C, reactionRates
+        cdef int numCoreSpecies, numCoreReactions, numEdgeSpecies
+        cdef double V
         cdef numpy.ndarray[numpy.float64_t, ndim=1] coreSpeciesConcentrations, coreSpeciesRates, coreReactionRates, edgeSpeciesRates, edgeReactionRates, networkLeakRates
-        cdef numpy.ndarray[numpy.float64_t, ndim=1] C
-
-        res = numpy.zeros(y.shape[0], numpy.float64)
-
-        ir = self.reactantIndices
-        ip = self.productIndices
-        kf = self.forwardRateCoefficients
-        kr = self.reverseRateCoefficients
-        inet = self.networkIndices
-        knet = self.networkLeakCoefficients
 
         numCoreSpecies = len(self.coreSpeciesRates)
         numCoreReactions = len(self.coreReactionRates)
         numEdgeSpecies = len(self.edgeSpeciesRates)
-        numEdgeReactions = len(self.edgeReactionRates)
-        numPdepNetworks = len(self.networkLeakRates)
-
-        coreSpeciesConcentrations = numpy.zeros_like(self.coreSpeciesConcentrations)
-        coreSpeciesRates = numpy.zeros_like(self.coreSpeciesRates)
-        coreReactionRates = numpy.zeros_like(self.coreReactionRates)
-        edgeSpeciesRates = numpy.zeros_like(self.edgeSpeciesRates)
-        edgeReactionRates = numpy.zeros_like(self.edgeReactionRates)
-        networkLeakRates = numpy.zeros_like(self.networkLeakRates)
 
-        C = numpy.zeros_like(self.coreSpeciesConcentrations)
-        
         # Use ideal gas law to compute volume
         V = constants.R * self.T.value_si * numpy.sum(y) / self.P.value_si
 
-        for j in range(y.shape[0]):
-            C[j] = y[j] / V
-            coreSpeciesConcentrations[j] = C[j]
-        
-        for j in range(ir.shape[0]):
-            k = kf[j]
-            if ir[j,0] >= numCoreSpecies or ir[j,1] >= numCoreSpecies or ir[j,2] >= numCoreSpecies:
-                reactionRate = 0.0
-            elif ir[j,1] == -1: # only one reactant
-                reactionRate = k * C[ir[j,0]]
-            elif ir[j,2] == -1: # only two reactants
-                reactionRate = k * C[ir[j,0]] * C[ir[j,1]]
-            else: # three reactants!! (really?)
-                reactionRate = k * C[ir[j,0]] * C[ir[j,1]] * C[ir[j,2]]
-            k = kr[j]
-            if ip[j,0] >= numCoreSpecies or ip[j,1] >= numCoreSpecies or ip[j,2] >= numCoreSpecies:
-                pass
-            elif ip[j,1] == -1: # only one reactant
-                reactionRate -= k * C[ip[j,0]]
-            elif ip[j,2] == -1: # only two reactants
-                reactionRate -= k * C[ip[j,0]] * C[ip[j,1]]
-            else: # three reactants!! (really?)
-                reactionRate -= k * C[ip[j,0]] * C[ip[j,1]] * C[ip[j,2]]
-
-            # Set the reaction and species rates
-            if j < numCoreReactions:
-                # The reaction is a core reaction
-                coreReactionRates[j] = reactionRate
-
-                # Add/substract the total reaction rate from each species rate
-                # Since it's a core reaction we know that all of its reactants
-                # and products are core species
-                first = ir[j,0]
-                coreSpeciesRates[first] -= reactionRate
-                second = ir[j,1]
-                if second != -1:
-                    coreSpeciesRates[second] -= reactionRate
-                    third = ir[j,2]
-                    if third != -1:
-                        coreSpeciesRates[third] -= reactionRate
-                first = ip[j,0]
-                coreSpeciesRates[first] += reactionRate
-                second = ip[j,1]
-                if second != -1:
-                    coreSpeciesRates[second] += reactionRate
-                    third = ip[j,2]
-                    if third != -1:
-                        coreSpeciesRates[third] += reactionRate
+        # Concentrations of all core and edge species (the latter are zero)
+        # The extra unit concentration at the end is picked up by the unused
+        # (-1) slots of the index arrays, so they drop out of the products
+        C = numpy.zeros(numCoreSpecies + numEdgeSpecies + 1, numpy.float64)
+        C[:numCoreSpecies] = y / V
+        C[-1] = 1.0
+        coreSpeciesConcentrations = C[:numCoreSpecies].copy()
 
-            else:
-                # The reaction is an edge reaction
-                edgeReactionRates[j-numCoreReactions] = reactionRate
-
-                # Add/substract the total reaction rate from each species rate
-                # Since it's an edge reaction its reactants and products could
-                # be either core or edge species
-                # We're only interested in the edge species
-                first = ir[j,0]
-                if first >= numCoreSpecies: edgeSpeciesRates[first-numCoreSpecies] -= reactionRate
-                second = ir[j,1]
-                if second != -1:
-                    if second >= numCoreSpecies: edgeSpeciesRates[second-numCoreSpecies] -= reactionRate
-                    third = ir[j,2]
-                    if third != -1:
-                        if third >= numCoreSpecies: edgeSpeciesRates[third-numCoreSpecies] -= reactionRate
-                first = ip[j,0]
-                if first >= numCoreSpecies: edgeSpeciesRates[first-numCoreSpecies] += reactionRate
-                second = ip[j,1]
-                if second != -1:
-                    if second >= numCoreSpecies: edgeSpeciesRates[second-numCoreSpecies] += reactionRate
-                    third = ip[j,2]
-                    if third != -1:
-                        if third >= numCoreSpecies: edgeSpeciesRates[third-numCoreSpecies] += reactionRate
-
-        for j in range(inet.shape[0]):
-            k = knet[j]
-            if inet[j,1] == -1: # only one reactant
-                reactionRate = k * C[inet[j,0]]
-            elif inet[j,2] == -1: # only two reactants
-                reactionRate = k * C[inet[j,0]] * C[inet[j,1]]
-            else: # three reactants!! (really?)
-                reactionRate = k * C[inet[j,0]] * C[inet[j,1]] * C[inet[j,2]]
-            networkLeakRates[j] = reactionRate
+        # Evaluate the net rates of all reactions at once
+        reactionRates = self.forwardRateCoefficients * numpy.prod(C[self.reactantIndices], axis=1) \
+            - self.reverseRateCoefficients * numpy.prod(C[self.productIndices], axis=1)
+        coreReactionRates = reactionRates[:numCoreReactions]
+        edgeReactionRates = reactionRates[numCoreReactions:]
+
+        # Core reactions contribute only to the core species rates, while edge
+        # reactions contribute only to the edge species rates
+        coreSpeciesRates = self.coreStoichiometry.dot(coreReactionRates)
+        edgeSpeciesRates = self.edgeStoichiometry.dot(edgeReactionRates)
+
+        networkLeakRates = self.networkLeakCoefficients * numpy.prod(C[self.networkIndices], axis=1)
 
         self.coreSpeciesConcentrations = coreSpeciesConcentrations
         self.coreSpeciesRates = coreSpeciesRates
@@ -316,6 +281,12 @@ cdef class SimpleReactor(ReactionSystem):
         cdef int numCoreReactions, j 
         cdef double k, deriv
         
+        if self.sparse:
+            # DASSL itself requires a dense matrix, but we keep the sparse
+            # version around for use in the sensitivity analysis
+            self.jacobianMatrix = self.computeSparseJacobian(y)
+            return self.jacobianMatrix.toarray() - cj * numpy.identity(y.shape[0], numpy.float64)
+
         pd = -cj * numpy.identity(y.shape[0], numpy.float64)
         ir = self.reactantIndices
         ip = self.productIndices
@@ -620,6 +591,53 @@ cdef class SimpleReactor(ReactionSystem):
 
         self.jacobianMatrix = pd + cj * numpy.identity(y.shape[0], numpy.float64)
         return pd
+
+    def computeSparseJacobian(self, numpy.ndarray[numpy.float64_t, ndim=1] y):
+        """
+        Return the analytical Jacobian of the core species rates with respect
+        to the core species amounts `y` as a :class:`scipy.sparse.csc_matrix`.
+        The nonzero entries are generated from the reactant and product index
+        arrays of the core reactions without ever forming a dense matrix;
+        contributions to the same entry are summed on conversion.
+        """
+        import scipy.sparse
+        
+        cdef int numCoreSpecies, numCoreReactions, a, b
+        cdef double V
+        
+        numCoreSpecies = y.shape[0]
+        numCoreReactions = len(self.coreReactionRates)
+        
+        # Use ideal gas law to compute volume
+        V = constants.R * self.T.value_si * numpy.sum(y) / self.P.value_si
+        
+        # Append a unit concentration so that the unused (-1) slots of the
+        # index arrays drop out of the concentration products
+        C = numpy.append(y / V, 1.0)
+        
+        rows = []; cols = []; data = []
+        for ir, ip, k in [
+            (self.reactantIndices[:numCoreReactions,:], self.productIndices[:numCoreReactions,:], self.forwardRateCoefficients[:numCoreReactions]),
+            (self.productIndices[:numCoreReactions,:], self.reactantIndices[:numCoreReactions,:], self.reverseRateCoefficients[:numCoreReactions]),
+        ]:
+            Cr = C[ir]
+            for a in range(3):
+                # Derivative of the rate with respect to the species in slot a
+                mask = ir[:,a] != -1
+                deriv = (k * numpy.prod(numpy.delete(Cr, a, axis=1), axis=1))[mask]
+                col = ir[mask,a]
+                for b in range(3):
+                    row = ir[mask,b]
+                    valid = row != -1
+                    rows.append(row[valid]); cols.append(col[valid]); data.append(-deriv[valid])
+                    row = ip[mask,b]
+                    valid = row != -1
+                    rows.append(row[valid]); cols.append(col[valid]); data.append(deriv[valid])
+        
+        return scipy.sparse.coo_matrix(
+            (numpy.concatenate(data), (numpy.concatenate(rows), numpy.concatenate(cols))),
+            shape=(numCoreSpecies, numCoreSpecies),
+        ).tocsc()
     
     @cython.boundscheck(False)
     def computeRateDerivative(self):
@@ -682,4 +700,35 @@ cdef class SimpleReactor(ReactionSystem):
                 rateDeriv[ip[j,1], j] += flux  
                 rateDeriv[ip[j,2], j] += flux          
                 
-        return rateDeriv
\ No newline at end of file
+        return rateDeriv
+
+################################################################################
+
+def generateStoichiometryMatrix(numpy.ndarray reactantIndices, numpy.ndarray productIndices, int start, int numSpecies):
+    """
+    Return the stoichiometry matrix, as a :class:`scipy.sparse.csr_matrix`, for
+    the reactions described by the given `reactantIndices` and `productIndices`
+    arrays. The rows correspond to the `numSpecies` species with indices
+    beginning at `start`, and the columns to the rows of the index arrays.
+    Contributions from species outside this range, as well as from the unused
+    (-1) slots of the index arrays, are omitted.
+    """
+    import scipy.sparse
+    
+    cdef int l
+    
+    reactionIndices = numpy.arange(reactantIndices.shape[0])
+    rows = []; cols = []; data = []
+    for indices, nu in [(reactantIndices, -1.0), (productIndices, 1.0)]:
+        for l in range(indices.shape[1]):
+            row = indices[:,l] - start
+            valid = (indices[:,l] != -1) & (row >= 0) & (row < numSpecies)
+            rows.append(row[valid])
+            cols.append(reactionIndices[valid])
+            data.append(nu * numpy.ones(numpy.count_nonzero(valid), numpy.float64))
+    
+    # Repeated entries (e.g. A + A) are summed on conversion
+    return scipy.sparse.coo_matrix(
+        (numpy.concatenate(data), (numpy.concatenate(rows), numpy.concatenate(cols))),
+        shape=(numSpecies, reactantIndices.shape[0]),
+    ).tocsr()
@@ -17,6 +17,31 @@ from rmgpy.solver.simple import SimpleReactor
 
 class SimpleReactorCheck(unittest.TestCase):
 
+    def setUp(self):
+        """
+        A function run before each unit test in this class. Sets up the
+        species and the reaction of the hydrogen abstraction
+        CH4 + C2H5 <=> CH3 + C2H6.
+        """
+        self.CH4 = Species(
+            molecule=[Molecule().fromSMILES("C")],
+            thermo=ThermoData(Tdata=([300,400,500,600,800,1000,1500],"K"), Cpdata=([ 8.615, 9.687,10.963,12.301,14.841,16.976,20.528],"cal/(mol*K)"), H298=(-17.714,"kcal/mol"), S298=(44.472,"cal/(mol*K)"))
+            )
+        self.CH3 = Species(
+            molecule=[Molecule().fromSMILES("[CH3]")],
+            thermo=ThermoData(Tdata=([300,400,500,600,800,1000,1500],"K"), Cpdata=([ 9.397,10.123,10.856,11.571,12.899,14.055,16.195],"cal/(mol*K)"), H298=(  9.357,"kcal/mol"), S298=(45.174,"cal/(mol*K)"))
+            )
+        self.C2H6 = Species(
+            molecule=[Molecule().fromSMILES("CC")],
+            thermo=ThermoData(Tdata=([300,400,500,600,800,1000,1500],"K"), Cpdata=([12.684,15.506,18.326,20.971,25.500,29.016,34.595],"cal/(mol*K)"), H298=(-19.521,"kcal/mol"), S298=(54.799,"cal/(mol*K)"))
+            )
+        self.C2H5 = Species(
+            molecule=[Molecule().fromSMILES("C[CH2]")],
+            thermo=ThermoData(Tdata=([300,400,500,600,800,1000,1500],"K"), Cpdata=([11.635,13.744,16.085,18.246,21.885,24.676,29.107],"cal/(mol*K)"), H298=( 29.496,"kcal/mol"), S298=(56.687,"cal/(mol*K)"))
+            )
+
+        self.rxn1 = Reaction(reactants=[self.C2H6,self.CH3], products=[self.C2H5,self.CH4], kinetics=Arrhenius(A=(686.375*6,'m^3/(mol*s)'), n=4.40721, Ea=(7.82799,'kcal/mol'), T0=(298.15,'K')))
+
     def testSolve(self):
         """
         Test the simple batch reactor with a simple kinetic model. Here we
@@ -94,3 +119,55 @@ class SimpleReactorCheck(unittest.TestCase):
 #        pylab.ylabel('Rate (mol/m$^\\mathdefault{3}$*s)')
 #        fig.subplots_adjust(left=0.12, bottom=0.10, right=0.95, top=0.95, wspace=0.20, hspace=0.35)
 #        pylab.show()
+
+    def testSparseJacobian(self):
+        """
+        Test that the sparse Jacobian assembled by the simple batch reactor
+        matches the dense Jacobian for the hydrogen abstraction reaction
+        CH4 + C2H5 <=> CH3 + C2H6.
+        """
+        CH4, CH3, C2H6, C2H5 = self.CH4, self.CH3, self.C2H6, self.C2H5
+        rxn1 = self.rxn1
+
+        coreSpecies = [CH4,CH3,C2H6,C2H5]
+        coreReactions = [rxn1]
+
+        T = 1000; P = 1.0e5
+        y = numpy.array([0.4, 0.1, 0.4, 0.1], numpy.float64)
+        dydt = numpy.zeros_like(y)
+        
+        denseSystem = SimpleReactor(T, P, initialMoleFractions={C2H5: 0.1, CH3: 0.1, CH4: 0.4, C2H6: 0.4}, termination=[])
+        denseSystem.initializeModel(coreSpecies, coreReactions, [], [])
+        sparseSystem = SimpleReactor(T, P, initialMoleFractions={C2H5: 0.1, CH3: 0.1, CH4: 0.4, C2H6: 0.4}, termination=[], sparse=True)
+        sparseSystem.initializeModel(coreSpecies, coreReactions, [], [])
+        
+        pd0 = denseSystem.jacobian(0.0, y, dydt, 1.0)
+        pd = sparseSystem.jacobian(0.0, y, dydt, 1.0)
+        self.assertTrue(sparseSystem.jacobianMatrix.shape == (4,4))
+        for i in range(4):
+            for j in range(4):
+                self.assertAlmostEqual(pd[i,j], pd0[i,j], delta=1e-6*abs(pd0[i,j]))
+
+    def testReinitializeModel(self):
+        """
+        Test that reinitializing the simple batch reactor with a larger model
+        reuses the cached rate coefficients of the existing reactions.
+        """
+        CH4, CH3, C2H6, C2H5 = self.CH4, self.CH3, self.C2H6, self.C2H5
+        rxn1 = self.rxn1
+        rxn2 = Reaction(reactants=[C2H6], products=[CH3,CH3], kinetics=Arrhenius(A=(8.0e16,'s^-1'), n=0.0, Ea=(88.0,'kcal/mol'), T0=(1,'K')))
+
+        T = 1000; P = 1.0e5
+        rxnSystem = SimpleReactor(T, P, initialMoleFractions={C2H5: 0.1, CH3: 0.1, CH4: 0.4, C2H6: 0.4}, termination=[])
+        rxnSystem.initializeModel([CH4,CH3,C2H6,C2H5], [rxn1], [], [])
+        kf1 = rxnSystem.forwardRateCoefficients[0]
+        kr1 = rxnSystem.reverseRateCoefficients[0]
+        self.assertTrue(rxnSystem.rateCoefficientCache[rxn1][0] is rxn1.kinetics)
+
+        rxnSystem.initializeModel([CH4,CH3,C2H6,C2H5], [rxn2, rxn1], [], [])
+        self.assertEqual(len(rxnSystem.rateCoefficientCache), 2)
+        self.assertEqual(rxnSystem.forwardRateCoefficients[1], kf1)
+        self.assertEqual(rxnSystem.reverseRateCoefficients[1], kr1)
+        self.assertAlmostEqual(rxnSystem.forwardRateCoefficients[0], rxn2.getRateCoefficient(T, P), delta=1e-6*rxnSystem.forwardRateCoefficients[0])
+        self.assertEqual(list(rxnSystem.reactantIndices[0,:]), [2,-1,-1])
+        self.assertEqual(list(rxnSystem.productIndices[1,:]), [3,0,-1])
@@ -40,6 +40,8 @@ from libc.math cimport log, exp, sqrt
 
 cimport rmgpy.constants as constants
 import rmgpy.quantity as quantity
+import rmgpy.statmech.schrodinger as schrodinger
+cimport rmgpy.statmech.schrodinger as schrodinger
 
 from rmgpy.statmech.translation cimport *
 from rmgpy.statmech.rotation cimport *
@@ -183,8 +185,20 @@ cdef class Conformer:
         """
         cdef numpy.ndarray sumStates = None
         cdef Mode mode
+        cdef list statesList = []
+        # Convolve the classical modes together in one pass, then count the
+        # quantum modes into the result directly
         for mode in self.modes:
-            sumStates = mode.getSumOfStates(Elist, sumStates)        
+            if not mode.quantum:
+                if len(statesList) == 0:
+                    statesList.append(mode.getSumOfStates(Elist))
+                else:
+                    statesList.append(mode.getDensityOfStates(Elist))
+        if len(statesList) > 0:
+            sumStates = schrodinger.convolveMany(statesList)
+        for mode in self.modes:
+            if mode.quantum:
+                sumStates = mode.getSumOfStates(Elist, sumStates)        
         return sumStates * self.spinMultiplicity * self.opticalIsomers
         
     cpdef numpy.ndarray getDensityOfStates(self, numpy.ndarray Elist):
@@ -194,8 +208,17 @@ cdef class Conformer:
         """
         cdef numpy.ndarray densStates = None
         cdef Mode mode
+        cdef list statesList = []
+        # Convolve the classical modes together in one pass, then count the
+        # quantum modes into the result directly
+        for mode in self.modes:
+            if not mode.quantum:
+                statesList.append(mode.getDensityOfStates(Elist))
+        if len(statesList) > 0:
+            densStates = schrodinger.convolveMany(statesList)
         for mode in self.modes:
-            densStates = mode.getDensityOfStates(Elist, densStates)
+            if mode.quantum:
+                densStates = mode.getDensityOfStates(Elist, densStates)
         return densStates * self.spinMultiplicity * self.opticalIsomers
 
     cpdef double getTotalMass(self, atoms=None) except -1:
@@ -163,6 +163,30 @@ class TestConformer(unittest.TestCase):
         Qexp = self.ethylene.getPartitionFunction(T)
         self.assertAlmostEqual(Qexp, Qact, delta=1e-1*Qexp)
 
+    def test_getDensityOfStates_batched(self):
+        """
+        Test that the StatMech.getDensityOfStates() and getSumOfStates()
+        methods, which convolve the classical modes in a single pass, give the
+        same result as convolving each mode in turn.
+        """
+        Elist = numpy.arange(0, 1500*50., 50.)
+        densStates0 = None
+        sumStates0 = None
+        for mode in self.conformer.modes:
+            densStates0 = mode.getDensityOfStates(Elist, densStates0)
+            sumStates0 = mode.getSumOfStates(Elist, sumStates0)
+        densStates = self.conformer.getDensityOfStates(Elist)
+        sumStates = self.conformer.getSumOfStates(Elist)
+        for r in range(len(Elist)):
+            if densStates0[r] == 0:
+                self.assertAlmostEqual(densStates[r], 0.0)
+            else:
+                self.assertAlmostEqual(densStates[r] / densStates0[r], 1.0, 4)
+            if sumStates0[r] == 0:
+                self.assertAlmostEqual(sumStates[r], 0.0)
+            else:
+                self.assertAlmostEqual(sumStates[r] / sumStates0[r], 1.0, 4)
+
     def test_getPartitionFunction_oxygen(self):
         """
         Test the StatMech.getPartitionFunction() method for oxygen.
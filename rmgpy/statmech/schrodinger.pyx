@@ -196,18 +196,74 @@ cpdef numpy.ndarray getDensityOfStates(numpy.ndarray Elist, energy, degeneracy=u
 
 ################################################################################
 
+# The number of energy grains at and above which convolutions are evaluated
+# using fast Fourier transforms rather than by direct summation
+FFT_CONVOLUTION_THRESHOLD = 1000
+
+def selectConvolutionMethod(int nE, method='auto'):
+    """
+    Return the method to use to convolve arrays of length `nE`, either
+    ``'direct'`` or ``'fft'``. If `method` is ``'auto'``, direct summation is
+    used for arrays with fewer than :data:`FFT_CONVOLUTION_THRESHOLD` grains,
+    as it has less overhead, and fast Fourier transforms for longer arrays.
+    """
+    if method == 'auto':
+        return 'fft' if nE >= FFT_CONVOLUTION_THRESHOLD else 'direct'
+    elif method == 'direct' or method == 'fft':
+        return method
+    else:
+        raise ValueError('Invalid convolution method {0!r}; valid values are "auto", "direct", or "fft".'.format(method))
+
+def convolve(numpy.ndarray[numpy.float64_t,ndim=1] rho1, numpy.ndarray[numpy.float64_t,ndim=1] rho2, method='auto'):
+    """
+    Return the convolution of two arrays `rho1` and `rho2`. The `method` may
+    be ``'direct'`` for direct summation, ``'fft'`` for fast Fourier
+    transforms, or ``'auto'`` to choose based on the length of the arrays.
+    """
+    if rho1.shape[0] != rho2.shape[0]:
+        raise ValueError('Attempted to convolve an array of length {0:d} with an array of length {1:d}.'.format(len(rho1), len(rho2)))
+    
+    if selectConvolutionMethod(rho1.shape[0], method) == 'fft':
+        return convolveFFT([rho1, rho2])
+    else:
+        return convolveDirect(rho1, rho2)
+
+def convolveMany(rhoList, method='auto'):
+    """
+    Return the convolution of all of the arrays in `rhoList`, e.g. the
+    densities of states of several molecular degrees of freedom. When using
+    fast Fourier transforms, all of the arrays are convolved in a single pass
+    rather than pairwise. The `method` is as for :func:`convolve()`.
+    """
+    cdef int nE
+    
+    if len(rhoList) == 0:
+        raise ValueError('Attempted to convolve an empty list of arrays.')
+    nE = rhoList[0].shape[0]
+    for rho in rhoList:
+        if rho.shape[0] != nE:
+            raise ValueError('Attempted to convolve an array of length {0:d} with an array of length {1:d}.'.format(nE, rho.shape[0]))
+    
+    if len(rhoList) == 1:
+        return numpy.array(rhoList[0], numpy.float64)
+    elif selectConvolutionMethod(nE, method) == 'fft':
+        return convolveFFT(rhoList)
+    else:
+        rho = rhoList[0]
+        for rho2 in rhoList[1:]:
+            rho = convolveDirect(rho, rho2)
+        return rho
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
-def convolve(numpy.ndarray[numpy.float64_t,ndim=1] rho1, numpy.ndarray[numpy.float64_t,ndim=1] rho2):
+def convolveDirect(numpy.ndarray[numpy.float64_t,ndim=1] rho1, numpy.ndarray[numpy.float64_t,ndim=1] rho2):
     """
-    Return the convolution of two arrays `rho1` and `rho2`.
+    Return the convolution of two arrays `rho1` and `rho2` of the same length
+    by direct summation, which requires :math:`\mathcal{O}(N^2)` time.
     """
     cdef numpy.ndarray[numpy.float64_t,ndim=1] rho
     cdef int i, j, nE
     
-    if rho1.shape[0] != rho2.shape[0]:
-        raise ValueError('Attempted to convolve an array of length {0:d} with an array of length {1:d}.'.format(len(rho1), len(rho2)))
-    
     nE = rho1.shape[0]
     rho = numpy.zeros_like(rho1)
     
@@ -217,6 +273,62 @@ def convolve(numpy.ndarray[numpy.float64_t,ndim=1] rho1, numpy.ndarray[numpy.flo
 
     return rho
 
+def convolveFFT(rhoList):
+    """
+    Return the convolution of all of the arrays in `rhoList`, which must have
+    the same length, using fast Fourier transforms, which requires
+    :math:`\mathcal{O}(N \log N)` time. Leading zeros are removed before the
+    transforms, so that grains that are exactly zero in the direct sum are
+    also exactly zero here. Densities and sums of states typically grow by
+    many orders of magnitude across the array, so each array is weighted by a
+    decaying exponential that flattens the product before the transforms
+    (convolution commutes with such a weighting) to preserve the relative
+    accuracy of the smallest values.
+    """
+    cdef int nE, m, shift, L
+    cdef double a
+    
+    nE = rhoList[0].shape[0]
+    rho = numpy.zeros(nE, numpy.float64)
+    
+    # Remove the leading zeros of each array, which shift the result
+    first = []
+    for rho0 in rhoList:
+        nonzero = numpy.flatnonzero(rho0)
+        if nonzero.shape[0] == 0:
+            return rho
+        first.append(nonzero[0])
+    shift = sum(first)
+    if shift >= nE:
+        return rho
+    m = nE - shift
+    arrays = [numpy.asarray(rho0[i:i+m], numpy.float64) for i, rho0 in zip(first, rhoList)]
+    
+    # Determine the exponential weighting from the overall growth of each array
+    a = 0.0
+    for rho0 in arrays:
+        if m > 1:
+            a += max(0.0, log(numpy.max(numpy.abs(rho0)) / abs(rho0[0])) / (m - 1))
+    a = min(a, 700.0 / m)
+    weights = numpy.exp(-a * numpy.arange(m))
+    
+    # Zero-pad to avoid wraparound of the circular convolution
+    L = 1
+    while L < len(arrays) * (m - 1) + 1:
+        L *= 2
+    
+    product = numpy.fft.rfft(arrays[0] * weights, L)
+    for rho0 in arrays[1:]:
+        product *= numpy.fft.rfft(rho0 * weights, L)
+    rho[shift:] = numpy.fft.irfft(product, L)[:m] / weights
+    
+    # Remove any round-off that makes the convolution of nonnegative arrays
+    # negative
+    if all([numpy.all(rho0 >= 0) for rho0 in arrays]):
+        numpy.maximum(rho, 0.0, rho)
+    
+    return rho
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 def convolveBS(numpy.ndarray[numpy.float64_t,ndim=1] Elist,
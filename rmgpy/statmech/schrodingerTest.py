@@ -36,7 +36,7 @@ module.
 import unittest
 
 import numpy
-from rmgpy.statmech.schrodinger import getPartitionFunction, getHeatCapacity, getEnthalpy, getEntropy, getDensityOfStates
+from rmgpy.statmech.schrodinger import getPartitionFunction, getHeatCapacity, getEnthalpy, getEntropy, getDensityOfStates, convolve, convolveMany
 import rmgpy.constants as constants
 
 ################################################################################
@@ -118,6 +118,36 @@ class TestSchrodinger(unittest.TestCase):
             Qact = numpy.sum(densStates * numpy.exp(-Elist / constants.R / T))
             Qexp = getPartitionFunction(T, self.energy, self.degeneracy, self.n0)
             self.assertAlmostEqual(Qexp / Qact, 1.0, 2, '{0} != {1} within 2 figures'.format(Qexp, Qact))
+
+    def test_convolve(self):
+        """
+        Test that the convolve() method gives the same result using direct
+        summation and fast Fourier transforms.
+        """
+        Elist = numpy.arange(0, 40000., 20.)
+        rho1 = getDensityOfStates(Elist, self.energy, self.degeneracy, self.n0)
+        rho2 = Elist**1.5
+        direct = convolve(rho1, rho2, method='direct')
+        fft = convolve(rho1, rho2, method='fft')
+        self.assertEqual(direct[0], 0.0)
+        self.assertEqual(fft[0], 0.0)
+        for r in range(1, Elist.shape[0]):
+            self.assertAlmostEqual(fft[r] / direct[r], 1.0, 6)
+        self.assertRaises(ValueError, convolve, rho1, rho2[:-1])
+        
+    def test_convolveMany(self):
+        """
+        Test that the convolveMany() method gives the same result as repeated
+        calls to convolve().
+        """
+        Elist = numpy.arange(0, 40000., 20.)
+        rhoList = [Elist**0.5, Elist**1.5, getDensityOfStates(Elist, self.energy, self.degeneracy, self.n0)]
+        expected = convolve(convolve(rhoList[0], rhoList[1], method='direct'), rhoList[2], method='direct')
+        for method in ['direct', 'fft', 'auto']:
+            rho = convolveMany(rhoList, method=method)
+            self.assertTrue(numpy.all(rho[0:2] == 0.0))
+            for r in range(2, Elist.shape[0]):
+                self.assertAlmostEqual(rho[r] / expected[r], 1.0, 6)
             
 ################################################################################
 
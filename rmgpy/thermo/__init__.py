@@ -31,3 +31,4 @@
 from .thermodata import ThermoData
 from .nasa import NASAPolynomial, NASA
 from .wilhoit import Wilhoit
+from .table import ThermoTable
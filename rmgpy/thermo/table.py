@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+################################################################################
+#
+#   RMG - Reaction Mechanism Generator
+#
+#   Copyright (c) 2002-2009 Prof. William H. Green (whgreen@mit.edu) and the
+#   RMG Team (rmg_dev@mit.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the "Software"),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+#   THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+This module contains a table of the thermodynamics of many species, which
+packs the coefficients of the NASA polynomials into arrays so that the
+thermodynamic properties of all of the species can be evaluated at once.
+"""
+
+import numpy
+
+import rmgpy.constants as constants
+from rmgpy.thermo.nasa import NASA
+
+################################################################################
+
+class ThermoTable(object):
+    """
+    A table of the thermodynamics models of a list of species. The attributes
+    are:
+
+    =============== ============================================================
+    Attribute       Description
+    =============== ============================================================
+    `thermo`        The list of thermodynamics models in the table
+    `coeffs`        An array of the nine coefficients of each of the (up to three) polynomials of the packed NASA models
+    `Tmin`          An array of the minimum temperature in K of each polynomial of the packed NASA models
+    `Tmax`          An array of the maximum temperature in K of each polynomial of the packed NASA models
+    `indices`       An array of the index in `thermo` of each packed NASA model
+    `otherIndices`  A list of the indices in `thermo` of the models that are not packed
+    =============== ============================================================
+
+    :class:`NASA` models are packed, with unused polynomial slots given an
+    empty temperature range. All other entries are evaluated individually
+    using their own methods, so any object providing the thermodynamics
+    methods of a model (such as a :class:`Species`) may be given in place of
+    a model.
+    """
+
+    def __init__(self, thermo):
+        self.thermo = thermo
+        self.otherIndices = []
+        indices = []
+        coeffs = []
+        Tmin = []
+        Tmax = []
+        for index, model in enumerate(thermo):
+            if isinstance(model, NASA) and len(model.polynomials) > 0:
+                indices.append(index)
+                coeffs.append(numpy.zeros((3,9), numpy.float64))
+                Tmin.append(numpy.ones(3, numpy.float64) * numpy.inf)
+                Tmax.append(-numpy.ones(3, numpy.float64) * numpy.inf)
+                for i, poly in enumerate(model.polynomials):
+                    coeffs[-1][i,:] = [poly.cm2, poly.cm1, poly.c0, poly.c1, poly.c2, poly.c3, poly.c4, poly.c5, poly.c6]
+                    Tmin[-1][i] = poly.Tmin.value_si if poly.Tmin is not None else -numpy.inf
+                    Tmax[-1][i] = poly.Tmax.value_si if poly.Tmax is not None else numpy.inf
+            else:
+                self.otherIndices.append(index)
+        self.indices = numpy.array(indices, numpy.int)
+        self.coeffs = numpy.array(coeffs, numpy.float64).reshape((len(indices),3,9))
+        self.Tmin = numpy.array(Tmin, numpy.float64).reshape((len(indices),3))
+        self.Tmax = numpy.array(Tmax, numpy.float64).reshape((len(indices),3))
+
+    def selectCoefficients(self, T):
+        """
+        Return an array of the coefficients of the NASA polynomial of each
+        packed model that is valid at temperature `T` in K. As for
+        :meth:`NASA.selectPolynomial()`, the first valid polynomial is used.
+        """
+        valid = (self.Tmin <= T) & (T <= self.Tmax)
+        if not numpy.all(numpy.any(valid, axis=1)):
+            raise ValueError('No valid NASA polynomial at temperature {0:g} K.'.format(T))
+        select = numpy.argmax(valid, axis=1)
+        return self.coeffs[numpy.arange(select.shape[0]),select,:]
+
+    def getHeatCapacities(self, T):
+        """
+        Return an array of the constant-pressure heat capacities in J/mol*K
+        of each of the species in the table at temperature `T` in K.
+        """
+        Cplist = numpy.zeros(len(self.thermo), numpy.float64)
+        if self.indices.shape[0] > 0:
+            cm2, cm1, c0, c1, c2, c3, c4, c5, c6 = self.selectCoefficients(T).T
+            Cplist[self.indices] = ((cm2 / T + cm1) / T + c0 + T*(c1 + T*(c2 + T*(c3 + c4*T)))) * constants.R
+        for index in self.otherIndices:
+            Cplist[index] = self.thermo[index].getHeatCapacity(T)
+        return Cplist
+
+    def getEnthalpies(self, T):
+        """
+        Return an array of the enthalpies in J/mol of each of the species in
+        the table at temperature `T` in K.
+        """
+        Hlist = numpy.zeros(len(self.thermo), numpy.float64)
+        if self.indices.shape[0] > 0:
+            cm2, cm1, c0, c1, c2, c3, c4, c5, c6 = self.selectCoefficients(T).T
+            Hlist[self.indices] = self.__getEnthalpies(T, cm2, cm1, c0, c1, c2, c3, c4, c5)
+        for index in self.otherIndices:
+            Hlist[index] = self.thermo[index].getEnthalpy(T)
+        return Hlist
+
+    def getEntropies(self, T):
+        """
+        Return an array of the entropies in J/mol*K of each of the species in
+        the table at temperature `T` in K.
+        """
+        Slist = numpy.zeros(len(self.thermo), numpy.float64)
+        if self.indices.shape[0] > 0:
+            cm2, cm1, c0, c1, c2, c3, c4, c5, c6 = self.selectCoefficients(T).T
+            Slist[self.indices] = self.__getEntropies(T, cm2, cm1, c0, c1, c2, c3, c4, c6)
+        for index in self.otherIndices:
+            Slist[index] = self.thermo[index].getEntropy(T)
+        return Slist
+
+    def getFreeEnergies(self, T):
+        """
+        Return an array of the Gibbs free energies in J/mol of each of the
+        species in the table at temperature `T` in K.
+        """
+        Glist = numpy.zeros(len(self.thermo), numpy.float64)
+        if self.indices.shape[0] > 0:
+            cm2, cm1, c0, c1, c2, c3, c4, c5, c6 = self.selectCoefficients(T).T
+            Glist[self.indices] = self.__getEnthalpies(T, cm2, cm1, c0, c1, c2, c3, c4, c5) - T * self.__getEntropies(T, cm2, cm1, c0, c1, c2, c3, c4, c6)
+        for index in self.otherIndices:
+            Glist[index] = self.thermo[index].getFreeEnergy(T)
+        return Glist
+
+    def __getEnthalpies(self, T, cm2, cm1, c0, c1, c2, c3, c4, c5):
+        T2 = T * T
+        T4 = T2 * T2
+        return ((-cm2 / T + cm1 * numpy.log(T)) / T + c0 + c1*T/2. + c2*T2/3. + c3*T2*T/4. + c4*T4/5. + c5/T) * constants.R * T
+
+    def __getEntropies(self, T, cm2, cm1, c0, c1, c2, c3, c4, c6):
+        T2 = T * T
+        T4 = T2 * T2
+        return ((-cm2 / T / 2. - cm1) / T + c0*numpy.log(T) + c1*T + c2*T2/2. + c3*T2*T/3. + c4*T4/4. + c6) * constants.R
+
+################################################################################
+
+def getEquilibriumConstants(reactions, species, T):
+    """
+    Return an array of the equilibrium constants :math:`K_\\mathrm{c}` of
+    each of the given `reactions` at temperature `T` in K. The free energies
+    of all of the given `species`, which must include every reactant and
+    product, are evaluated once using a :class:`ThermoTable`, and the free
+    energies of reaction are then formed by a product with the (sparse)
+    stoichiometry matrix of the reactions.
+    """
+    import scipy.sparse
+
+    speciesIndex = dict([(spec, index) for index, spec in enumerate(species)])
+    rows = []; cols = []; data = []
+    for j, rxn in enumerate(reactions):
+        for spec in rxn.reactants:
+            rows.append(j); cols.append(speciesIndex[spec]); data.append(-1.0)
+        for spec in rxn.products:
+            rows.append(j); cols.append(speciesIndex[spec]); data.append(1.0)
+    # Repeated entries (e.g. A + A) are summed on conversion
+    stoichiometry = scipy.sparse.coo_matrix((data, (rows, cols)), shape=(len(reactions), len(species))).tocsr()
+
+    # Species without a NASA model are evaluated by the species itself, which
+    # falls back to the statmech model if there is no thermo model
+    Glist = ThermoTable([spec.thermo if isinstance(spec.thermo, NASA) else spec for spec in species]).getFreeEnergies(T)
+    dGrxn = stoichiometry * Glist
+    dn = numpy.array([len(rxn.products) - len(rxn.reactants) for rxn in reactions], numpy.float64)
+    # Convert from Ka to Kc; C0 is the reference concentration
+    C0 = 1e5 / constants.R / T
+    return numpy.exp(-dGrxn / constants.R / T) * C0 ** dn
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+################################################################################
+#
+#   RMG - Reaction Mechanism Generator
+#
+#   Copyright (c) 2002-2009 Prof. William H. Green (whgreen@mit.edu) and the
+#   RMG Team (rmg_dev@mit.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the "Software"),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+#   THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+This script contains unit tests of the :mod:`rmgpy.thermo.table` module.
+"""
+
+import unittest
+import numpy
+
+from rmgpy.thermo.nasa import NASA, NASAPolynomial
+from rmgpy.thermo.wilhoit import Wilhoit
+from rmgpy.thermo.table import ThermoTable, getEquilibriumConstants
+from rmgpy.species import Species
+from rmgpy.reaction import Reaction
+from rmgpy.statmech import Conformer, IdealGasTranslation
+import rmgpy.constants as constants
+
+################################################################################
+
+class TestThermoTable(unittest.TestCase):
+    """
+    Contains unit tests of the :class:`ThermoTable` class.
+    """
+
+    def setUp(self):
+        """
+        A function run before each unit test in this class.
+        """
+        self.nasa = NASA(
+            polynomials = [
+                NASAPolynomial(coeffs=[4.03055,-0.00214171,4.90611e-05,-5.99027e-08,2.38945e-11,-11257.6,3.5613], Tmin=(300.,"K"), Tmax=(650.73,"K")),
+                NASAPolynomial(coeffs=[-0.307954,0.0245269,-1.2413e-05,3.07724e-09,-3.01467e-13,-10693,22.628], Tmin=(650.73,"K"), Tmax=(3000.,"K")),
+            ],
+            Tmin = (300.,"K"),
+            Tmax = (3000.,"K"),
+        )
+        self.wilhoit = Wilhoit(
+            Cp0 = (4.0*constants.R,"J/(mol*K)"),
+            CpInf = (21.5*constants.R,"J/(mol*K)"),
+            a0 = 0.0977518,
+            a1 = -16.3067,
+            a2 = 26.2524,
+            a3 = -12.6785,
+            B = (1068.68,"K"),
+            H0 = (-94088.*0.001*constants.R,"kJ/mol"),
+            S0 = (-118.46*constants.R,"J/(mol*K)"),
+        )
+        self.thermo = [self.nasa, self.wilhoit, self.nasa]
+        self.table = ThermoTable(self.thermo)
+        self.Tlist = [300, 500, 650.73, 1000, 1500, 2000, 3000]
+
+    def test_packing(self):
+        """
+        Test that the NASA models were packed into the table.
+        """
+        self.assertEqual(list(self.table.indices), [0, 2])
+        self.assertEqual(self.table.otherIndices, [1])
+
+    def test_getHeatCapacities(self):
+        """
+        Test the ThermoTable.getHeatCapacities() method.
+        """
+        for T in self.Tlist:
+            for thermo, Cpact in zip(self.thermo, self.table.getHeatCapacities(T)):
+                self.assertAlmostEqual(thermo.getHeatCapacity(T) / Cpact, 1.0, 6)
+
+    def test_getEnthalpies(self):
+        """
+        Test the ThermoTable.getEnthalpies() method.
+        """
+        for T in self.Tlist:
+            for thermo, Hact in zip(self.thermo, self.table.getEnthalpies(T)):
+                self.assertAlmostEqual(thermo.getEnthalpy(T) / Hact, 1.0, 6)
+
+    def test_getEntropies(self):
+        """
+        Test the ThermoTable.getEntropies() method.
+        """
+        for T in self.Tlist:
+            for thermo, Sact in zip(self.thermo, self.table.getEntropies(T)):
+                self.assertAlmostEqual(thermo.getEntropy(T) / Sact, 1.0, 6)
+
+    def test_getFreeEnergies(self):
+        """
+        Test the ThermoTable.getFreeEnergies() method.
+        """
+        for T in self.Tlist:
+            for thermo, Gact in zip(self.thermo, self.table.getFreeEnergies(T)):
+                self.assertAlmostEqual(thermo.getFreeEnergy(T) / Gact, 1.0, 6)
+
+    def test_invalidTemperature(self):
+        """
+        Test that evaluating the table outside the range of the NASA
+        polynomials raises a ValueError.
+        """
+        self.assertRaises(ValueError, self.table.getFreeEnergies, 4000.)
+
+    def test_getEquilibriumConstants(self):
+        """
+        Test the getEquilibriumConstants() function.
+        """
+        A = Species(label='A', thermo=self.nasa)
+        B = Species(label='B', thermo=self.wilhoit)
+        reactions = [
+            Reaction(reactants=[A], products=[B]),
+            Reaction(reactants=[A, A], products=[B]),
+            Reaction(reactants=[B], products=[A, A]),
+        ]
+        for T in self.Tlist:
+            Klist = getEquilibriumConstants(reactions, [A, B], T)
+            for rxn, Kact in zip(reactions, Klist):
+                self.assertAlmostEqual(rxn.getEquilibriumConstant(T) / Kact, 1.0, 6)
+
+    def test_getEquilibriumConstantsFromConformer(self):
+        """
+        Test that the getEquilibriumConstants() function uses the statmech
+        model of a species that has no thermo model.
+        """
+        A = Species(label='A', thermo=self.nasa)
+        H = Species(
+            label = 'H',
+            conformer = Conformer(
+                E0 = (211.794, 'kJ/mol'),
+                modes = [
+                    IdealGasTranslation(
+                        mass = (1.00783, 'amu'),
+                    ),
+                ],
+                spinMultiplicity = 2,
+                opticalIsomers = 1,
+            ),
+        )
+        self.assertIsNone(H.thermo)
+        reactions = [
+            Reaction(reactants=[A], products=[H]),
+            Reaction(reactants=[H, H], products=[A]),
+        ]
+        for T in self.Tlist:
+            Klist = getEquilibriumConstants(reactions, [A, H], T)
+            for rxn, Kact in zip(reactions, Klist):
+                self.assertAlmostEqual(rxn.getEquilibriumConstant(T) / Kact, 1.0, 6)